@@ -0,0 +1,206 @@
+######################################################################
+#               TP de Python - Alignement de Séquence                #
+#                                                                    #
+#                                 ~                                  #
+#                                                                    #
+#                Implémentation de l'algorithme de                   #
+#                      Needleman et Wunsh                            #
+#                                                                    #
+#                  Avec et sans pénalité de gap                      #
+#                                                                    #
+# Version: 2016.04.03                                                #
+# Version Python: 3.4.3                                              #
+#                                          Auteur: Quentin BONENFANT #
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Description:                                                       #
+#                                                                    #
+# Ce programme contient les fonctions nécessaires pour aligner deux  #
+# séquences d'ADN et afficher le résultat.                           #
+# Elle est basée sur l'algorithme de Needleman et Wunsch.            #
+# Le calcule des scores est fait à partr d'une matrice de score      #
+# déclarée en variable globale, et indexé par les nucléotides.       #
+# A coté de cette  matrice est déclaré le score de gap par défaut    #
+# ainsi que le score de gap ajusté pour les prolongation de gap.     #
+# Le but est d'avoir un alignement optimal plus proche de la réalité.#
+#                                                                    #
+######################################################################
+
+#       Sommaire
+#
+# 1/ Déclaration et initialisation               (initialisation.py)
+# 2/ Implémentation de l'algorithme simple       (simple.py)
+# 3/ Implémentation de l'algorithme avec gap     (affine.py)
+#    Affine
+# 4/ Outils d'affichage et de manipulation       (affichage.py)
+# 5/ Procédure de test                           (navigation.py)
+# 6/ Menu de navigation                          (navigation.py,
+#                                                 python -m NeedlemanWunsch)
+#
+# Lecture FASTA / FASTQ                          (fasta.py)
+# Ligne de commande                              (commande.py,
+#                                    python -m NeedlemanWunsch fichiers...)
+# Mesures des phases (désactivées par défaut)    (instrumentation.py)
+# Résultats compacts (CIGAR, sérialisation)      (resultat.py)
+#
+# Moteurs optionnels (nécessitent NumPy)
+#
+#  - Alphabets et matrices de substitution       (alphabets.py,
+#                                                 matrices/)
+#  - Moteur vectorisé (simple et affine)         (vectoriel.py)
+#  - Noyaux compilés par Numba (optionnel)       (jit.py)
+#  - Modes en espace linéaire                    (lineaire.py)
+#  - Calcul du score seul                        (score.py)
+#  - Balayage d'une base par une requête         (balayage.py)
+#  - Alignement en bande                         (bande.py)
+#  - Alignement local et semi-global             (modes.py)
+#  - Arrêt anticipé (X-drop, score seuil)        (arret.py)
+#  - Préfiltre par k-mers (graines et extension) (prefiltre.py)
+#  - Alignement sur disque, par tuiles           (disque.py)
+#  - Remplissage parallèle en front d'onde       (parallele.py)
+#  - Grille de réglages de gap (d, k)            (grille.py)
+#  - Réalignement incrémental d'une requête      (incremental.py)
+#  - Alignement multiple progressif              (multiple.py)
+#  - Alignement par lots sur plusieurs processus (lot.py)
+#  - Cache des résultats (mémoire et disque)     (cache.py)
+#  - Service HTTP d'alignement (asyncio)         (serveur.py,
+#                          python -m NeedlemanWunsch.serveur)
+
+######################################################################
+#                                                                    #
+#                         Interface publique                         #
+#                                                                    #
+# L'import du paquet n'a aucun effet de bord et ne charge aucun      #
+# module: chaque nom est importé depuis son module à sa première     #
+# utilisation. NumPy n'est donc chargé que si un moteur vectorisé    #
+# est utilisé.                                                       #
+#                                                                    #
+######################################################################
+
+from importlib import import_module
+
+# Module de chaque nom de l'interface publique
+_emplacements = {
+    # Déclaration et initialisation
+    "node": "initialisation",
+    "parent": "initialisation",
+    "d": "initialisation",
+    "k": "initialisation",
+    "costmat": "initialisation",
+    "DNA": "initialisation",
+    "isDNA": "initialisation",
+    # Algorithmes
+    "alignementSimple": "simple",
+    "alignementAffine": "affine",
+    # Retour sur trace et affichage
+    "iterRecallback": "affichage",
+    "recallback": "affichage",
+    "compterAlignements": "affichage",
+    "printMatrices": "affichage",
+    "printSequence": "affichage",
+    "cigarAlignement": "affichage",
+    # Résultats compacts
+    "resultatAlignement": "resultat",
+    "resultatDepuisAlignement": "resultat",
+    "ecrireResultats": "resultat",
+    "lireResultats": "resultat",
+    # Lecture de fichiers
+    "lireSequences": "fasta",
+    "lirePaires": "fasta",
+    # Alphabets et matrices de substitution
+    "alphabet": "alphabets",
+    "ADN": "alphabets",
+    "IUPAC": "alphabets",
+    "PROTEINE": "alphabets",
+    "matriceSubstitution": "alphabets",
+    "lireMatrice": "alphabets",
+    "chargerMatrice": "alphabets",
+    # Moteur vectorisé
+    "DIAGONALE": "vectoriel",
+    "HAUT": "vectoriel",
+    "GAUCHE": "vectoriel",
+    "compilerCostmat": "vectoriel",
+    "encoderSequence": "vectoriel",
+    "alignementSimpleNumpy": "vectoriel",
+    "iterRecallbackNumpy": "vectoriel",
+    "recallbackNumpy": "vectoriel",
+    "compterAlignementsNumpy": "vectoriel",
+    "ETAT_A": "vectoriel",
+    "ETAT_B": "vectoriel",
+    "ETAT_C": "vectoriel",
+    "alignementAffineNumpy": "vectoriel",
+    "iterRecallbackAffineNumpy": "vectoriel",
+    "recallbackAffineNumpy": "vectoriel",
+    "compterAlignementsAffineNumpy": "vectoriel",
+    # Noyaux compilés
+    "JIT": "jit",
+    "alignementSimpleJit": "jit",
+    "alignementAffineJit": "jit",
+    "retourSimpleJit": "jit",
+    "retourAffineJit": "jit",
+    "alignementSimpleAuto": "jit",
+    "alignementAffineAuto": "jit",
+    # Espace linéaire
+    "scoreAlignement": "lineaire",
+    "alignementHirschberg": "lineaire",
+    "alignementMyersMiller": "lineaire",
+    # Bande
+    "alignementSimpleBande": "bande",
+    "alignementAffineBande": "bande",
+    # Local et semi-global
+    "scoreLocal": "modes",
+    "alignementLocal": "modes",
+    "scoreSemiGlobal": "modes",
+    "alignementSemiGlobal": "modes",
+    # Score seul
+    "scoreSimple": "score",
+    "scoresSimpleLot": "score",
+    "scoreAffine": "score",
+    "scoresAffineLot": "score",
+    "profilRequete": "balayage",
+    "scoreSimpleArret": "arret",
+    "scoreAffineArret": "arret",
+    "alignementSimpleBandeArret": "arret",
+    "alignementAffineBandeArret": "arret",
+    "construireIndex": "prefiltre",
+    "chargerIndex": "prefiltre",
+    "alignerCandidats": "prefiltre",
+    # Sur disque
+    "alignementSimpleDisque": "disque",
+    "alignementAffineDisque": "disque",
+    "matriceTuiles": "disque",
+    "alignementSimpleParallele": "parallele",
+    "alignementAffineParallele": "parallele",
+    "grilleGaps": "grille",
+    "alignementIncremental": "incremental",
+    # Alignement multiple
+    "matriceDistances": "multiple",
+    "arbreGuide": "multiple",
+    "alignerProfils": "multiple",
+    "alignementMultiple": "multiple",
+    # Lots
+    "alignerLot": "lot",
+    "cacheAlignement": "cache",
+    "serveurAlignement": "serveur",
+    # Mesures
+    "activerMesures": "instrumentation",
+    "desactiverMesures": "instrumentation",
+    "reinitialiserMesures": "instrumentation",
+    "exporterMesures": "instrumentation",
+    # Menu
+    "lancerAlignementSimple": "navigation",
+    "lancerAlignementAffine": "navigation",
+    "lancerTest": "navigation",
+    "menu": "navigation",
+}
+
+__all__ = list(_emplacements)
+
+def __getattr__(nom):
+    if nom not in _emplacements:
+        raise AttributeError("module "+repr(__name__)+" has no attribute "+repr(nom))
+    valeur = getattr(import_module("."+_emplacements[nom], __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,11 @@
+# Lancement du menu de navigation: python -m NeedlemanWunsch
+# Avec des arguments, les alignements sont faits en ligne de commande
+# (python -m NeedlemanWunsch --help).
+import sys
+
+if (len(sys.argv)>1):
+    from .commande import main
+    main()
+else:
+    from .navigation import menu
+    menu()
@@ -0,0 +1,149 @@
+from .instrumentation import mesures
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+   #        #
+  #        #       Outils d'affichage 
+ #  #     #                     et 
+ #####   #                   de manipulation
+    #   #
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+######################################################################
+#  Méthode itérative de callback, permettant de récupérer            #
+#  tout les meileurs alignements de deux séquences. Cette méthode    #
+#  s'appuie sur les algorithmes de récupération de la liste des mots #
+#  d'un arbre, parcouru en profondeur à l'aide d'une pile (pas de    #
+#  limite de récursion). Les alignements sont produits un par un:    #
+#  on peut les afficher au fur et à mesure sans tous les garder.     #
+######################################################################
+
+def iterRecallback(node,seq=[],max_alignements=None):
+    ''' Générateur des alignements optimaux finissant au node donné,
+        sous la forme [(X,X),(Y,Y),...] de la fin vers le début.
+        max_alignements limite le nombre d'alignements produits.'''
+    if (max_alignements is not None and max_alignements<=0):
+        return
+    nombre=0
+    # Seul le temps passé dans le générateur est mesuré
+    chrono=mesures.chrono("retour")
+    # Le chemin courant est partagé: on y ajoute un alignement en
+    # descendant vers un parent et on le retire en remontant.
+    chemin=list(seq)
+    pile=[[node,0]]
+    while pile:
+        sommet=pile[-1]
+        courant,rang=sommet
+        parents=courant.parent
+        
+        # Descente vers le parent suivant
+        if (rang<len(parents.nodes)):
+            sommet[1]+=1
+            chemin.append(parents.alignements[rang])
+            pile.append([parents.nodes[rang],0])
+            continue
+        
+        # Condition d'arret: si on a plus de nodes (arrive en 0,0)
+        if (parents.nodes==[]):
+            chrono.etape("enumeration")
+            mesures.compter("retour.chemins")
+            yield(list(chemin))
+            chrono.reprendre()
+            nombre+=1
+            if (nombre==max_alignements):
+                return
+        
+        # Tous les parents ont été visités, on remonte
+        pile.pop()
+        if (len(chemin)>len(seq)):
+            chemin.pop()
+
+def recallback(node,seq):
+    # Liste de tous les alignements possibles
+    # sous la forme [ [(X,X),(Y,Y)] , [(X,X),(Y,Y)] ]
+    return(list(iterRecallback(node,seq)))
+
+def compterAlignements(node):
+    ''' Nombre d'alignements optimaux finissant au node donné, calculé
+        par programmation dynamique sans les énumérer.'''
+    chrono=mesures.chrono("retour")
+    nombres={}
+    pile=[node]
+    while pile:
+        courant=pile[-1]
+        if (id(courant) in nombres):
+            pile.pop()
+            continue
+        attente=[n for n in courant.parent.nodes if id(n) not in nombres]
+        if attente:
+            pile.extend(attente)
+            continue
+        pile.pop()
+        if (courant.parent.nodes==[]):
+            nombres[id(courant)]=1
+        else:
+            nombres[id(courant)]=sum(nombres[id(n)] for n in courant.parent.nodes)
+    chrono.etape("comptage")
+    return(nombres[id(node)])
+
+######################################################################
+#                                                                    #
+#             Affichage des matrices et des alignements              #
+#                                                                    #
+######################################################################
+
+# Fonction d'affichage des matrices
+# Prend en paramètre un tableau (longueur max=3)
+# de matrices contenant des objets de type "node"
+# L'affichage se fait sur des colonnes de 10 caractères de largeur.
+
+def printMatrices(mat):
+    for n,m in enumerate (mat):
+        print("Matrice "+ "ABC"[n])
+        for line in m:
+            l=""
+            for objects in line:
+                l+="% 10d" % objects.score
+                
+            print(l)
+        print("\n")
+        
+# Fonction d'affichage "propre" des différents alignements de séquences.
+# couples peut être une liste ou un générateur (iterRecallback): dans ce
+# cas les alignements sont affichés au fur et à mesure.
+
+def printSequence (couples):
+    for al in couples:
+        al.reverse()
+        sequences=list(zip(*al))
+        print("".join(sequences[0]))
+        print("".join(sequences[1]))
+        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~")
+        
+        
+
+# Conversion d'un alignement (au format de recallback) en chaîne CIGAR,
+# la séquence 1 étant la requête et la séquence 2 la référence:
+# M pour un match / mismatch, I pour un résidu de la séquence 1 face à
+# un gap, D pour un résidu de la séquence 2 face à un gap.
+
+def cigarAlignement(alignement):
+    cigar=[]
+    precedent=None
+    nombre=0
+    for a,b in reversed(alignement):
+        if (a=="-"):
+            op="D"
+        elif (b=="-"):
+            op="I"
+        else:
+            op="M"
+        if (op==precedent):
+            nombre+=1
+            continue
+        if precedent:
+            cigar.append(str(nombre)+precedent)
+        precedent=op
+        nombre=1
+    if precedent:
+        cigar.append(str(nombre)+precedent)
+    return("".join(cigar))
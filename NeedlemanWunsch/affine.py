@@ -0,0 +1,204 @@
+from .initialisation import costmat, node, parent
+from .instrumentation import mesures, mesurerNodes
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+ ###      #
+    #    #            Implémentation
+  ##    #                     de 
+    #  #                   l'algorithme affine
+ ###  #
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+######################################################################
+# Implementation de l'algorithme de Needleman-Wunsch + gap affine    #
+######################################################################
+
+def alignementAffine(seq1,seq2,d,k,cost=costmat):
+    
+    # Implementation de l'aglgorithme de Needleman Wunsch utilisant
+    # une valeur ajustée du score de gap d avec un nombre k tel que d<k<0.
+    # Cette méthode utilise la même matrice de score.
+    
+    
+    # INITIALISATION
+    
+    # Pré traitement des séquences ( passage en majuscule )
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    
+    # Récupération de la taille de la séquence
+    l1= len(seq1)
+    l2= len(seq2)
+    
+    # On défini un "infini" suffisamment grand
+    infini= 42*(-10**6)
+    
+    # Mesure des phases (sans effet si les mesures sont désactivées)
+    chrono= mesures.chrono("affine")
+    
+    # Création de trois matrices vide contenant des noeuds "vides".
+    # Le zerotage des matrices en  0,0 est alors déjà effectué.
+    # Cela peut se faire en une seule ligne.
+    
+    matriceA, matriceB, matriceC = [[[node(0,parent(None,None)) for i in range(l1+1)] for j in range(l2+1)] for nombre_matrice in range(3)]
+    chrono.etape("allocation")
+    
+    # On ajoute le score d'ouverture de gap au en position [1][0] de la matrice  B
+    matriceB[1][0].setScore(d+k)
+    matriceB[1][0].setParent(parent(matriceB[0][0],("-" , seq2[0])))
+    
+    
+    # On ajoute le score d'ouverture de gap au en position [0][1] de la matrice C
+    matriceC[0][1].setScore(d+k)
+    matriceC[0][1].setParent(parent(matriceC[0][0] , (seq1[0],"-")))
+    
+
+
+    # REMPLISSAGE DES LIGNES
+
+    # remplissage de la première ligne des matrices A et B
+    for i in range(1,l1+1):
+        matriceA[0][i].setScore(infini)
+        matriceB[0][i].setScore(infini)
+    
+    # remplissage de la première ligne de C
+    for i in range(2,l1+1):
+        matriceC[0][i].setScore(matriceC[0][i-1].score+k)
+        matriceC[0][i].setParent(parent(matriceC[0][i-1],(seq1[i-1],"-")))
+    
+    # REMPLISSAGE DES COLONES 
+    
+    # remplissage de la première colone de A et C
+    for i in range(1,l2+1):
+        matriceA[i][0].setScore(infini)
+        matriceC[i][0].setScore(infini)
+        
+    # Remplissage de la première colonne de B
+    for i in range(2,l2+1):
+        matriceB[i][0].setScore(matriceB[i-1][0].score+k)
+        matriceB[i][0].setParent(parent(matriceB[i-1][0],("-",seq2[i-1])))
+    
+
+    # Affichage des matrices initialisée
+    # Décommenter la ligne suivante pour afficher.
+
+    #printMatrices(matriceAlignement)                                           
+
+
+
+    # REMPLISSAGE DES MATRICES                                 
+
+    for j in range(1,l2+1):
+        for i in range(1, l1+1):
+            
+            # MATRICE A
+            # Pour remplire la case "A" du node, il faut
+            # tester quel est le(s) meilleur(s) score(s) venant de
+            # (i-1, j-1)
+            
+            # Récupération des objets node d'intérêt.
+            
+            antA= matriceA[j-1][i-1]
+            antB= matriceB[j-1][i-1]
+            antC= matriceC[j-1][i-1]
+            
+            # Recherche du meilleurs score
+            maximum= max(antA.score, antB.score, antC.score)
+            
+            # calcul de la valeur de match / mismatch
+            sub=cost[seq1[i-1]][seq2[j-1]]
+            
+            # Determination des noeuds parents
+            # Ces noeuds sont liés à l'alignement correspondant.
+            if(j!=1 or i!=1):
+                parents= parent(None,None)            
+                if (antA.score == maximum):
+                    parents.addNode(antA)
+                parents.addAlign( (seq1[i-1],seq2[j-1]) )
+        
+                if(antB.score == maximum):
+                    parents.addNode(antB)
+                    parents.addAlign( (seq1[i-1],seq2[j-1]) )
+                    
+                if(antC.score == maximum):
+                    parents.addNode(antC)
+                    parents.addAlign( (seq1[i-1],seq2[j-1]) )
+                    
+                # création du nouveau noeud)
+                matriceA[j][i].setScore(maximum + sub)
+                matriceA[j][i].setParent(parents) 
+            
+            
+            # Cas spéciale de la "première" (1,1) case de A, où les origines 
+            # des trois matrices  serais considérée comme parents.
+            # Cela triplerais les résultats lors de l'affichage des alignements.
+            elif(i==1 and j==1):
+                matriceA[1][1]= node(sub, parent(matriceA[0][0],(seq1[0],seq2[0])))
+            
+            
+            # MATRICE B
+            
+            # Récupération des objets node d'intérêt.
+            antA= matriceA[j-1][i]       
+            antB= matriceB[j-1][i]       
+            antC= matriceC[j-1][i]
+            
+            # Recherche du meilleurs score
+            maximum= max(antA.score + d + k , antB.score + k , antC.score + d + k)
+            
+            # Determination des noeuds parents
+            # Ces noeuds sont liés à l'alignement correspondant.
+            parents= parent(None,None)
+            
+            if (antA.score + d + k == maximum):
+                parents.addNode(antA)
+                parents.addAlign( ("-",seq2[j-1]) )
+            
+            if(antB.score + k == maximum):
+                parents.addNode(antB)
+                parents.addAlign( ("-",seq2[j-1]) )
+                
+            if(antC.score + d + k== maximum):
+                parents.addNode(antC)
+                parents.addAlign( ("-",seq2[j-1]) )
+
+            # création du nouveau noeud
+            matriceB[j][i].setScore(maximum)
+            matriceB[j][i].setParent(parents) 
+            
+            
+            # MATRICE C
+            
+            # Récupération des objets node d'intérêt.
+            antA= matriceA[j][i-1]      
+            antB= matriceB[j][i-1]
+            antC= matriceC[j][i-1]
+            
+            # Recherche du meilleurs score
+            maximum= max(antA.score + d + k , antB.score + d + k , antC.score + k)
+            
+            # Determination des noeuds parents
+            # Ces noeuds sont liés à l'alignement correspondant.
+            parents= parent(None,None)
+            
+            if (antA.score + d + k == maximum):
+                parents.addNode(antA)
+                parents.addAlign( (seq1[i-1],"-") )
+            
+            if(antB.score + d + k == maximum):
+                parents.addNode(antB)
+                parents.addAlign( (seq1[i-1],"-") )
+
+            if(antC.score + k== maximum):
+                parents.addNode(antC)
+                parents.addAlign( (seq1[i-1],"-") )
+
+            # création du nouveau noeud
+            matriceC[j][i].setScore(maximum)
+            matriceC[j][i].setParent(parents) 
+    chrono.etape("remplissage")
+    if (mesures.actif):
+        mesurerNodes("affine",[matriceA,matriceB,matriceC])
+            
+    # On retourne les trois matrices remplies
+    return(matriceA,matriceB,matriceC)
@@ -0,0 +1,132 @@
+import os
+
+# Comme pour vectoriel.py, NumPy n'est chargé qu'à la première
+# utilisation d'un alphabet ou d'une matrice de substitution.
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("Les alphabets et matrices de substitution nécessitent NumPy "
+                      "(pip install numpy)") from None
+
+######################################################################
+#                                                                    #
+#              Alphabets et matrices de substitution                 #
+#                                                                    #
+# Un alphabet associe à chaque octet (lettre majuscule ou minuscule) #
+# le code de sa lettre, 255 pour les lettres absentes: le codage et  #
+# la validation d'une séquence se font d'un bloc, sans regex.        #
+#                                                                    #
+# Une matrice de substitution reste un dictionnaire de               #
+# dictionnaires (utilisable partout où costmat l'est), compilé une   #
+# seule fois en une table dense indexée par ces codes: les moteurs   #
+# la partagent au lieu de la recalculer à chaque appel.              #
+#                                                                    #
+# Les matrices standard (BLOSUM62, PAM250, NUC.4.4) sont livrées     #
+# dans le dossier matrices, au format des fichiers du NCBI.          #
+#                                                                    #
+######################################################################
+
+# Dossier des matrices livrées avec le paquet
+dossierMatrices = os.path.join(os.path.dirname(os.path.abspath(__file__)), "matrices")
+
+class alphabet:
+    ''' Ensemble de lettres, avec la table de codage octet -> code
+        (uint8, 255 pour les lettres inconnues).'''
+
+    def __init__(self,nom,lettres):
+        self.nom = nom
+        self.lettres = "".join(lettres).upper()
+        if (len(self.lettres)>=255 or len(set(self.lettres))!=len(self.lettres)):
+            raise ValueError("Alphabet invalide: "+repr(lettres))
+        self.table = np.full(256, 255, dtype=np.uint8)
+        for code,lettre in enumerate(self.lettres):
+            self.table[ord(lettre)] = code
+            self.table[ord(lettre.lower())] = code
+
+    def __len__(self):
+        return(len(self.lettres))
+
+    def __repr__(self):
+        return("alphabet("+repr(self.nom)+", "+repr(self.lettres)+")")
+
+    def codes(self,seq):
+        # Codes des lettres d'une séquence (255 pour les lettres inconnues)
+        return(self.table[np.frombuffer(seq.encode("latin-1"), dtype=np.uint8)])
+
+    def valide(self,seq):
+        ''' Vrai si la séquence (non vide) ne contient que des lettres
+            de l'alphabet.'''
+        try:
+            return(len(seq)>0 and not (self.codes(seq)==255).any())
+        except UnicodeEncodeError:
+            return(False)
+
+    def encoder(self,seq):
+        ''' Séquence codée en uint8, ValueError pour une lettre inconnue.'''
+        codes = self.codes(seq)
+        if (codes==255).any():
+            raise ValueError("La séquence contient des lettres absentes de l'alphabet "+self.nom)
+        return(codes)
+
+# Alphabets usuels
+ADN = alphabet("ADN", "ACGT")
+IUPAC = alphabet("IUPAC", "ACGTURYSWKMBDHVN")
+PROTEINE = alphabet("proteine", "ARNDCQEGHILKMFPSTWYVBZX*")
+
+class matriceSubstitution(dict):
+    ''' Matrice de substitution: dictionnaire de dictionnaires comme
+        costmat, accompagné de son alphabet et de sa table dense
+        (int32, indexée par les codes de l'alphabet).'''
+
+    def __init__(self,cost,nom=None):
+        dict.__init__(self, ((a.upper(), {b.upper(): int(score) for b,score in ligne.items()})
+                             for a,ligne in cost.items()))
+        self.nom = nom
+        self.alphabet = alphabet(nom or "matrice", list(self))
+        lettres = self.alphabet.lettres
+        try:
+            self.dense = np.array([[self[a][b] for b in lettres] for a in lettres], dtype=np.int32)
+        except KeyError as erreur:
+            raise ValueError("Matrice incomplète: "+str(erreur)) from None
+
+    def compiler(self):
+        ''' Couple (table, dense) de compilerCostmat.'''
+        return(self.alphabet.table, self.dense)
+
+def lireMatrice(source,nom=None):
+    ''' Lit une matrice de substitution au format du NCBI (lignes de
+        commentaires commençant par #, une ligne d'en-tête avec les
+        lettres, puis une ligne par lettre). source est un chemin ou un
+        fichier ouvert.'''
+    if (isinstance(source,str)):
+        with open(source) as fichier:
+            return(lireMatrice(fichier, nom or os.path.basename(source)))
+    entete = None
+    cost = {}
+    for ligne in source:
+        ligne = ligne.split("#",1)[0].split()
+        if (not ligne):
+            continue
+        if (entete is None):
+            entete = ligne
+            continue
+        lettre, scores = ligne[0], ligne[1:]
+        if (len(scores)!=len(entete)):
+            raise ValueError("Ligne "+lettre+": "+str(len(scores))+" scores au lieu de "+str(len(entete)))
+        cost[lettre] = dict(zip(entete, (int(score) for score in scores)))
+    if (entete is None or set(cost)!=set(entete)):
+        raise ValueError("Les lignes de la matrice ne correspondent pas à son en-tête")
+    return(matriceSubstitution(cost, nom))
+
+# Matrices déjà lues par chargerMatrice
+matricesChargees = {}
+
+def chargerMatrice(nom):
+    ''' Matrice livrée avec le paquet ("BLOSUM62", "PAM250", "NUC.4.4")
+        ou, à défaut, lue dans le fichier nom.'''
+    if (nom not in matricesChargees):
+        chemin = os.path.join(dossierMatrices, nom.upper())
+        if (not os.path.isfile(chemin)):
+            chemin = nom
+        matricesChargees[nom] = lireMatrice(chemin, os.path.basename(chemin))
+    return(matricesChargees[nom])
@@ -0,0 +1,210 @@
+import numpy as np
+
+from .bande import (infini, largeurNecessaire, preparerBande, remplirBandeAffine,
+                    remplirBandeSimple, retourBandeAffine, retourBandeSimple)
+from .initialisation import costmat
+from .lineaire import ligneScoresAffine, ligneScoresSimple, preparerLineaire
+from .vectoriel import compilerCostmat
+
+######################################################################
+#                                                                    #
+#                Arrêt anticipé (X-drop et score seuil)              #
+#                                                                    #
+# Pour un criblage, on veut seulement savoir si une paire dépasse un #
+# seuil. Les remplissages ligne par ligne (score seul et bande)      #
+# sont donc contrôlés après chaque ligne:                            #
+#                                                                    #
+#  - X-drop: les cases dont le score est inférieur de plus de xdrop  #
+#    au meilleur score vu jusque là sont abandonnées (mises à        #
+#    infini). Quand toute une ligne est abandonnée, on s'arrête.     #
+#    C'est une heuristique: le score obtenu est celui d'un           #
+#    alignement, mais pas forcément le meilleur.                     #
+#                                                                    #
+#  - Score seuil: le score d'une case (j,i) plus le meilleur score   #
+#    possible du reste du chemin (tous les résidus restants alignés  #
+#    avec le meilleur score de substitution, et les gaps au moindre  #
+#    coût) borne le score de tous les chemins qui passent par elle.  #
+#    Tout chemin traverse chaque ligne: si la borne de chaque case   #
+#    de la ligne est sous le seuil, le score final l'est aussi et    #
+#    l'on s'arrête. Ce test est exact.                               #
+#                                                                    #
+# Les résultats portent l'état du calcul: TERMINE (score exact),     #
+# ELAGUE (des cases ont été abandonnées par le X-drop, le score est  #
+# None si la fin n'est plus atteignable) ou ABANDONNE (score final   #
+# prouvé sous le seuil, score None).                                 #
+#                                                                    #
+######################################################################
+
+# Le seuil n'est testé que toutes les INTERVALLE lignes (et sur la
+# dernière): la borne coûte plus cher que le calcul d'une ligne.
+INTERVALLE = 8
+
+TERMINE = "termine"
+ELAGUE = "elague"
+ABANDONNE = "abandonne"
+
+def coutGaps(g,d,k=None):
+    # Coût minimum de g positions de gap: g*d en gap simple. En gap
+    # affine, entre un seul gap prolongé (k*g, si un gap est déjà ouvert)
+    # et g gaps d'une position ((d+k)*g), selon le signe de d.
+    if (k is None):
+        return(g*d)
+    return(np.maximum(k*g,(d+k)*g))
+
+def resteMaximum(a,b,sub_max,d,k=None):
+    ''' Borne du score d'un chemin qui aligne encore a résidus
+        horizontaux et b résidus verticaux (tableaux NumPy acceptés).'''
+    # Avec m substitutions, il reste a+b-2m positions de gap: la borne
+    # est convexe en m, son maximum est atteint en m=0 ou m=min(a,b).
+    m = np.minimum(a,b)
+    return(np.maximum(m*sub_max+coutGaps(a+b-2*m,d,k),coutGaps(a+b,d,k)))
+
+def borneHorsBande(l1,l2,w,sub_max,gap,ouverture):
+    # Borne du score des chemins qui sortent de la bande de demi-largeur
+    # w (voir largeurNecessaire): ils ont au moins G0 gaps, et au plus
+    # l1+l2. None si aucun chemin ne sort de la bande.
+    total = l1+l2
+    g_min = abs(l1-l2)+2*(w+1)
+    if (g_min>total):
+        return(None)
+    return(max((total-g)*sub_max/2+g*gap+ouverture for g in (g_min,total)))
+
+class controleArret:
+    ''' Contrôle d'un remplissage ligne par ligne, appelé avec le numéro
+        j de la ligne, la colonne i0 de sa première case et les segments
+        de la ligne (un par matrice). Renvoie True pour arrêter le calcul.
+        plafond borne les chemins qui ne passent pas par les segments.'''
+
+    def __init__(self,l1,l2,sub_max,d,k=None,seuil=None,xdrop=None,plafond=None):
+        self.l1 = l1
+        self.l2 = l2
+        self.sub_max = sub_max
+        self.d = d
+        self.k = k
+        self.seuil = seuil
+        self.xdrop = xdrop
+        self.plafond = plafond
+        self.meilleur = 0
+        self.etat = TERMINE
+        self.colonnes = np.arange(l1+1)
+
+    def __call__(self,j,i0,segments):
+        teste = self.seuil is not None and (j%INTERVALLE==0 or j==self.l2)
+        if (self.xdrop is None and not teste):
+            return(False)
+        ligne = segments[0] if len(segments)==1 else np.maximum.reduce(segments)
+        if (self.xdrop is not None):
+            maximum = int(ligne.max())
+            self.meilleur = max(self.meilleur,maximum)
+            limite = self.meilleur-self.xdrop
+            if (maximum<limite):
+                self.etat = ELAGUE
+                return(True)
+            if (ligne.min()<limite):
+                self.etat = ELAGUE
+                abandon = ligne<limite
+                for segment in segments:
+                    segment[abandon] = infini
+                ligne[abandon] = infini
+        if (teste):
+            restants = self.l1-i0-self.colonnes[:len(ligne)]
+            borne = int((ligne+resteMaximum(restants,self.l2-j,self.sub_max,self.d,self.k)).max())
+            if (self.plafond is not None):
+                borne = max(borne,self.plafond)
+            if (borne<self.seuil):
+                self.etat = ABANDONNE
+                return(True)
+        return(False)
+
+def resultatArret(score,controle):
+    # Score final (None s'il a été abandonné) et état du calcul
+    if (controle.etat==ABANDONNE or score is None or score<=infini//2):
+        return(None, controle.etat)
+    return(int(score), controle.etat)
+
+def verifierSeuil(score,etat,seuil):
+    # Un score exact sous le seuil est aussi abandonné
+    if (etat==TERMINE and seuil is not None and score<seuil):
+        return(None, ABANDONNE)
+    return(score, etat)
+
+def plancher(score,seuil):
+    # Score que les chemins hors de la bande ne doivent pas dépasser. Si
+    # la bande est sous le seuil, il suffit de l'élargir jusqu'à ce
+    # qu'aucun chemin hors de la bande n'atteigne le seuil: la borne hors
+    # bande permet alors au contrôle d'abandonner.
+    if (seuil is None or score>=seuil):
+        return(score)
+    return(seuil-1)
+
+def scoreSimpleArret(seq1,seq2,d,cost=costmat,seuil=None,xdrop=None):
+    ''' scoreSimple avec arrêt anticipé. Renvoie le couple (score, etat),
+        etat valant TERMINE, ELAGUE ou ABANDONNE.'''
+    codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+    # Meilleur score de substitution pris dans la matrice (le profil est
+    # vide si une séquence est vide)
+    sub_max = int(compilerCostmat(cost)[1].max())
+    controle = controleArret(profil.shape[-1],len(codeV),sub_max,d,None,seuil,xdrop)
+    ligne = ligneScoresSimple(codeV,profil,d,controle)
+    score, etat = resultatArret(None if ligne is None else ligne[-1],controle)
+    return(verifierSeuil(score,etat,seuil))
+
+def scoreAffineArret(seq1,seq2,d,k,cost=costmat,seuil=None,xdrop=None):
+    ''' scoreAffine avec arrêt anticipé (voir scoreSimpleArret).'''
+    codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+    sub_max = int(compilerCostmat(cost)[1].max())
+    controle = controleArret(profil.shape[-1],len(codeV),sub_max,d,k,seuil,xdrop)
+    lignes = ligneScoresAffine(codeV,profil,d,k,d,controle)
+    score, etat = resultatArret(None if lignes is None else lignes[0][-1],controle)
+    return(verifierSeuil(score,etat,seuil))
+
+def alignementSimpleBandeArret(seq1,seq2,d,cost=costmat,largeur=16,seuil=None,xdrop=None):
+    ''' alignementSimpleBande avec arrêt anticipé. Renvoie le triplet
+        (score, alignement, etat), l'alignement valant None si le score
+        est None. Une bande élaguée n'est pas élargie.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    code1, code2, profil, sub_max = preparerBande(seq1,seq2,cost)
+    l1 = len(code1)
+    l2 = len(code2)
+    w = min(largeur,min(l1,l2))
+    while True:
+        controle = controleArret(l1,l2,sub_max,d,None,seuil,xdrop,
+                                 borneHorsBande(l1,l2,w,sub_max,d,0))
+        score, directions, delta_min = remplirBandeSimple(code1,code2,profil,d,w,controle)
+        score, etat = resultatArret(score,controle)
+        if (etat!=TERMINE):
+            break
+        necessaire = largeurNecessaire(plancher(score,seuil),l1,l2,sub_max,d,0)
+        if (necessaire<=w):
+            break
+        w = necessaire
+    score, etat = verifierSeuil(score,etat,seuil)
+    if (score is None):
+        return(None, None, etat)
+    return(score, retourBandeSimple(directions,delta_min,seq1,seq2), etat)
+
+def alignementAffineBandeArret(seq1,seq2,d,k,cost=costmat,largeur=16,seuil=None,xdrop=None):
+    ''' Equivalent de alignementSimpleBandeArret pour le gap affine.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    code1, code2, profil, sub_max = preparerBande(seq1,seq2,cost)
+    l1 = len(code1)
+    l2 = len(code2)
+    w = min(largeur,min(l1,l2))
+    while True:
+        controle = controleArret(l1,l2,sub_max,d,k,seuil,xdrop,
+                                 borneHorsBande(l1,l2,w,sub_max,k,d))
+        finaux, directions, delta_min = remplirBandeAffine(code1,code2,profil,d,k,w,controle)
+        score, etat = resultatArret(None if finaux is None else max(finaux),controle)
+        if (etat!=TERMINE):
+            break
+        necessaire = largeurNecessaire(plancher(score,seuil),l1,l2,sub_max,k,d)
+        if (necessaire<=w):
+            break
+        w = necessaire
+    score, etat = verifierSeuil(score,etat,seuil)
+    if (score is None):
+        return(None, None, etat)
+    etat_final = finaux.index(max(finaux))
+    return(score, retourBandeAffine(directions,delta_min,etat_final,seq1,seq2), etat)
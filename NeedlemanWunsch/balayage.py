@@ -0,0 +1,151 @@
+import time
+
+import numpy as np
+
+from .initialisation import costmat
+from .vectoriel import compilerCostmat, encoderSequence
+
+######################################################################
+#                                                                    #
+#          Balayage d'une base de séquences par une requête          #
+#                                                                    #
+# Le profil de la requête (profil[c][i] = cost[requete[i]][c]) est   #
+# calculé une seule fois, puis chaque résidu des cibles sélectionne  #
+# directement sa ligne de scores: il n'y a plus aucun dictionnaire   #
+# dans la boucle.                                                    #
+#                                                                    #
+# Les cibles sont vectorisées entre elles (disposition               #
+# inter-séquences): un lot de cibles de longueurs proches avance     #
+# d'un résidu à la fois, la colonne de chaque cible étant calculée   #
+# sur toute la requête comme dans ligneScoresSimple. Les cibles      #
+# terminées sont retirées du lot (elles sont triées par longueur).   #
+#                                                                    #
+# Les scores sont calculés en int16 quand une borne sur toutes les   #
+# valeurs intermédiaires prouve qu'il n'y a pas de dépassement, et   #
+# en int32 sinon. Avec des scores deux fois plus petits, deux fois   #
+# plus de cases passent par la mémoire et le cache.                  #
+#                                                                    #
+######################################################################
+
+def typeLot(n,longueur,d,k,dense):
+    # Plus petit type entier sûr pour une requête de longueur n et des
+    # cibles de longueur au plus longueur: chaque case varie d'au plus
+    # pas à chaque résidu, et le maximum cumulé ajoute au plus n*pas.
+    pas = max(abs(d)+abs(k or 0), int(np.abs(dense).max()))
+    if ((2*n+longueur+2)*pas < np.iinfo(np.int16).max):
+        return(np.int16)
+    return(np.int32)
+
+def remplirLotSimple(profil,codes,longueurs,d):
+    # Scores de la requête (profil (A, n)) contre un lot de cibles
+    # (codes (T, L)) triées par longueur croissante.
+    n = profil.shape[1]
+    type_lot = profil.dtype.type
+    colonnes = np.arange(n+1, dtype=type_lot)
+    gaps = colonnes*type_lot(d)
+    ligne = np.broadcast_to(gaps, (len(codes), n+1)).copy()
+    scores = np.empty(len(codes), dtype=np.int64)
+    actives = np.searchsorted(longueurs, 0, side="right")
+    scores[:actives] = ligne[:actives,n]
+    for j in range(1,codes.shape[1]+1):
+        # Les cibles terminées sont en tête du lot
+        ligne = ligne[len(ligne)-(len(scores)-actives):]
+        debut = len(scores)-len(ligne)
+        suivante = np.empty_like(ligne)
+        suivante[:,0] = j*d
+        np.maximum(ligne[:,:-1]+profil[codes[debut:,j-1]], ligne[:,1:]+type_lot(d),
+                   out=suivante[:,1:])
+        suivante -= gaps
+        ligne = np.maximum.accumulate(suivante, axis=1)
+        ligne += gaps
+        actives = np.searchsorted(longueurs, j, side="right")
+        scores[debut:actives] = ligne[:actives-debut,n]
+    return(scores)
+
+def remplirLotAffine(profil,codes,longueurs,d,k):
+    # Equivalent de remplirLotSimple avec les lignes CC / DD de
+    # ligneScoresAffine.
+    n = profil.shape[1]
+    type_lot = profil.dtype.type
+    colonnes = np.arange(n+1, dtype=type_lot)
+    premiere = type_lot(d)+type_lot(k)*colonnes
+    premiere[0] = 0
+    CC = np.broadcast_to(premiere, (len(codes), n+1)).copy()
+    DD = CC+type_lot(d)
+    decalage = type_lot(k)*colonnes
+    scores = np.empty(len(codes), dtype=np.int64)
+    actives = np.searchsorted(longueurs, 0, side="right")
+    scores[:actives] = CC[:actives,n]
+    for j in range(1,codes.shape[1]+1):
+        CC = CC[len(CC)-(len(scores)-actives):]
+        DD = DD[len(DD)-(len(scores)-actives):]
+        debut = len(scores)-len(CC)
+        DD = np.maximum(DD, CC+type_lot(d))
+        DD += type_lot(k)
+        suivante = np.empty_like(CC)
+        suivante[:,0] = d+k*j
+        DD[:,0] = suivante[:,0]
+        np.maximum(DD[:,1:], CC[:,:-1]+profil[codes[debut:,j-1]], out=suivante[:,1:])
+        gauche = np.maximum.accumulate(suivante[:,:-1]-decalage[:-1], axis=1)
+        gauche += decalage[1:]+type_lot(d)
+        np.maximum(suivante[:,1:], gauche, out=suivante[:,1:])
+        CC = suivante
+        actives = np.searchsorted(longueurs, j, side="right")
+        scores[debut:actives] = CC[:actives-debut,n]
+    return(scores)
+
+class profilRequete:
+    ''' Profil d'une requête pour le calcul des scores d'alignement
+        global (simple sans k, affine avec k) contre une base de
+        cibles. Les compteurs cellules et secondes donnent le débit
+        (voir gcups).'''
+
+    def __init__(self,requete,d,k=None,cost=costmat):
+        self.d = d
+        self.k = k
+        self.table, self.dense = compilerCostmat(cost)
+        self.codes = encoderSequence(requete.upper(), self.table)
+        profil = self.dense[self.codes].T
+        # Un profil par type, calculés une fois pour toutes
+        self.profils = {np.int16: np.ascontiguousarray(profil, dtype=np.int16),
+                        np.int32: np.ascontiguousarray(profil, dtype=np.int32)}
+        # Compteurs
+        self.cellules = 0
+        self.secondes = 0.0
+        self.lots = {np.int16: 0, np.int32: 0}
+
+    def __len__(self):
+        return(len(self.codes))
+
+    def scores(self,cibles,taille_lot=1024):
+        ''' Scores de la requête (seq1) contre chacune des cibles (seq2),
+            dans l'ordre des cibles.'''
+        debut = time.perf_counter()
+        codes = [encoderSequence(cible.upper(), self.table) for cible in cibles]
+        ordre = sorted(range(len(codes)), key=lambda t: len(codes[t]))
+        scores = [0]*len(codes)
+        n = len(self.codes)
+        for premier in range(0, len(ordre), taille_lot):
+            indices = ordre[premier:premier+taille_lot]
+            longueurs = np.array([len(codes[t]) for t in indices])
+            bloc = np.zeros((len(indices), longueurs[-1]), dtype=np.intp)
+            for ligne,t in enumerate(indices):
+                bloc[ligne,:longueurs[ligne]] = codes[t]
+            type_lot = typeLot(n,longueurs[-1],self.d,self.k,self.dense)
+            profil = self.profils[type_lot]
+            if (self.k is None):
+                resultats = remplirLotSimple(profil,bloc,longueurs,self.d)
+            else:
+                resultats = remplirLotAffine(profil,bloc,longueurs,self.d,self.k)
+            for ligne,t in enumerate(indices):
+                scores[t] = int(resultats[ligne])
+            self.lots[type_lot] += 1
+            self.cellules += n*int(longueurs.sum())
+        self.secondes += time.perf_counter()-debut
+        return(scores)
+
+    def gcups(self):
+        ''' Débit en milliards de cases calculées par seconde.'''
+        if (self.secondes==0):
+            return(0.0)
+        return(self.cellules/self.secondes/1e9)
@@ -0,0 +1,266 @@
+import numpy as np
+
+from .initialisation import costmat
+from .vectoriel import (DIAGONALE, ETAT_A, ETAT_B, ETAT_C, GAUCHE, HAUT,
+                        compilerCostmat, encoderSequence)
+
+######################################################################
+# Alignement en bande                                                #
+#                                                                    #
+# Pour des séquences presque identiques, le chemin optimal reste     #
+# près de la diagonale. On ne calcule alors que les cases (j,i)      #
+# telles que i-j soit compris entre min(0,l1-l2)-w et max(0,l1-l2)+w #
+# soit O(n*w) cases. Seules les directions de la bande sont gardées  #
+# (les scores sont calculés sur deux lignes).                        #
+#                                                                    #
+# Un chemin qui sort de la bande contient au moins |l1-l2|+2(w+1)    #
+# gaps, ce qui borne son score. Si le meilleur score de la bande     #
+# atteint cette borne, il est égal au score sans bande. Sinon, on    #
+# élargit la bande jusqu'à la largeur où la borne est atteinte (au   #
+# pire jusqu'à la matrice complète) et on recommence.                #
+# Le fait que le chemin touche le bord de la bande ne suffit pas:    #
+# un meilleur chemin peut sortir de la bande sans que le chemin      #
+# trouvé ne la touche.                                               #
+######################################################################
+
+# Score des cases hors de la bande (ou hors de la matrice)
+infini = -2**40
+
+def preparerBande(seq1,seq2,cost):
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    # profil[c][i] = cost[seq1[i-1]][c] (la colonne 0 n'est pas utilisée,
+    # elle évite de décaler les indices)
+    profil = np.zeros((len(dense), len(code1)+1), dtype=np.int64)
+    profil[:,1:] = dense[code1].T
+    return(code1, code2, profil, int(dense.max()))
+
+def largeurNecessaire(score,l1,l2,sub_max,gap,ouverture):
+    # Plus petite demi-largeur w telle qu'aucun chemin sortant de la
+    # bande ne puisse dépasser score. Un tel chemin a au moins
+    # G = |l1-l2|+2(w+1) gaps, donc (l1+l2-G)/2 matchs au plus: son
+    # score est au plus (l1+l2-G)/2*sub_max + G*gap + ouverture, avec
+    # G au plus l1+l2. Au pire, w = min(l1,l2) couvre toute la matrice.
+    total = l1+l2
+    pente = 2*gap-sub_max
+    reste = 2*score-total*sub_max-2*ouverture
+    w_max = min(l1,l2)
+    if (pente>=0 or total*pente>reste):
+        return(w_max)
+    # G*pente <= reste, soit G >= reste/pente (pente < 0)
+    g_min = -(reste//-pente)
+    w = -((g_min-abs(l1-l2))//-2)-1
+    return(min(max(w,0),w_max))
+
+def limitesBande(l1,l2,w):
+    # Diagonales extrêmes (i-j) de la bande et sa largeur
+    delta_min = min(0,l1-l2)-w
+    delta_max = max(0,l1-l2)+w
+    return(delta_min, delta_max-delta_min+1)
+
+def segmentBande(j,l1,delta_min,largeur):
+    # Indices b (bornes incluses) des cases de la ligne j de la bande
+    # qui sont dans la matrice, et colonne i de la première d'entre elles
+    debut = max(0,-j-delta_min)
+    fin = min(largeur-1,l1-j-delta_min)
+    return(debut, fin, j+delta_min+debut)
+
+def remplirBandeSimple(code1,code2,profil,d,w,controle=None):
+    # Remplissage de la bande pour l'algorithme simple. Renvoie le
+    # score final et les directions: directions[j][b] est la case
+    # (j, j+delta_min+b). Les lignes ont une case de plus, toujours à
+    # infini, pour le décalage du parent haut.
+    # controle(j, i0, [segment]), optionnel, est appelé après chaque
+    # ligne (voir arret.py): s'il renvoie True, le remplissage s'arrête
+    # et le score renvoyé est None.
+    l1 = len(code1)
+    l2 = len(code2)
+    delta_min, largeur = limitesBande(l1,l2,w)
+    b = np.arange(largeur, dtype=np.int64)
+    directions = np.zeros((l2+1, largeur), dtype=np.uint8)
+
+    # Première ligne
+    debut, fin, i0 = segmentBande(0,l1,delta_min,largeur)
+    ligne = np.full(largeur+1, infini, dtype=np.int64)
+    ligne[debut:fin+1] = d*np.arange(i0, i0+fin-debut+1)
+    directions[0,debut:fin+1] = GAUCHE
+    if (i0==0):
+        directions[0,debut] = 0
+
+    for j in range(1,l2+1):
+        debut, fin, i0 = segmentBande(j,l1,delta_min,largeur)
+        n = fin-debut+1
+        diag = ligne[debut:fin+1]+profil[code2[j-1]][i0:i0+n]
+        if (i0==0):
+            diag[0] = infini
+        haut = ligne[debut+1:fin+2]+d
+        # Parent gauche: même maximum cumulé que pour alignementSimpleNumpy
+        decalage = b[:n]*d
+        segment = np.maximum.accumulate(np.maximum(diag,haut)-decalage)+decalage
+        gauche = np.empty(n, dtype=np.int64)
+        gauche[0] = infini
+        gauche[1:] = segment[:-1]+d
+        directions[j,debut:fin+1] = ( (diag==segment)*DIAGONALE
+                                    | (haut==segment)*HAUT
+                                    | (gauche==segment)*GAUCHE )
+        ligne = np.full(largeur+1, infini, dtype=np.int64)
+        ligne[debut:fin+1] = np.maximum(segment,infini)
+        if (controle is not None and controle(j,i0,[ligne[debut:fin+1]])):
+            return(None, directions, delta_min)
+
+    return(int(ligne[l1-l2-delta_min]), directions, delta_min)
+
+def alignementSimpleBande(seq1,seq2,d,cost=costmat,largeur=16):
+    ''' Alignement simple en bande autour de la diagonale, élargie
+        jusqu'à ce que le score soit prouvé égal au score sans bande.
+        Renvoie le couple (score, alignement), l'alignement étant au
+        format de recallback.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    code1, code2, profil, sub_max = preparerBande(seq1,seq2,cost)
+    l1 = len(code1)
+    l2 = len(code2)
+    # Le score de la bande ne peut qu'augmenter avec w: la largeur
+    # nécessaire calculée après le premier passage suffit toujours.
+    w = min(largeur,min(l1,l2))
+    while True:
+        score, directions, delta_min = remplirBandeSimple(code1,code2,profil,d,w)
+        necessaire = largeurNecessaire(score,l1,l2,sub_max,d,0)
+        if (necessaire<=w):
+            break
+        w = necessaire
+
+    return(score, retourBandeSimple(directions,delta_min,seq1,seq2))
+
+def retourBandeSimple(directions,delta_min,seq1,seq2):
+    # Retour sur trace: premier parent dans l'ordre diagonale, haut, gauche
+    alignement=[]
+    j,i = len(seq2),len(seq1)
+    while (j>0 or i>0):
+        code = directions[j][i-j-delta_min]
+        if (code & DIAGONALE):
+            alignement.append((seq1[i-1],seq2[j-1]))
+            j,i = j-1,i-1
+        elif (code & HAUT):
+            alignement.append(("-",seq2[j-1]))
+            j -= 1
+        else:
+            alignement.append((seq1[i-1],"-"))
+            i -= 1
+    return(alignement)
+
+def etats(valeurs,maximum):
+    # Bits des états dont la valeur atteint le maximum
+    A,B,C = valeurs
+    return((A==maximum)*ETAT_A | (B==maximum)*ETAT_B | (C==maximum)*ETAT_C)
+
+def remplirBandeAffine(code1,code2,profil,d,k,w,controle=None):
+    # Remplissage de la bande pour l'algorithme affine. Les directions
+    # des trois matrices sont rangées dans un uint16: bits 0-2 pour A,
+    # 3-5 pour B et 6-8 pour C. controle reçoit les segments des trois
+    # matrices (voir remplirBandeSimple).
+    l1 = len(code1)
+    l2 = len(code2)
+    delta_min, largeur = limitesBande(l1,l2,w)
+    b = np.arange(largeur, dtype=np.int64)
+    directions = np.zeros((l2+1, largeur), dtype=np.uint16)
+
+    # Première ligne. B et C valent d en (0,0): l'ouverture du gap est
+    # ainsi comptée pour les gaps partant de l'origine.
+    debut, fin, i0 = segmentBande(0,l1,delta_min,largeur)
+    A = np.full(largeur+1, infini, dtype=np.int64)
+    B = A.copy()
+    C = A.copy()
+    C[debut:fin+1] = d+k*np.arange(i0, i0+fin-debut+1)
+    directions[0,debut:fin+1] = ETAT_C<<6
+    if (i0==0):
+        A[debut] = 0
+        B[debut] = d
+        C[debut] = d
+        directions[0,debut] = 0
+
+    for j in range(1,l2+1):
+        debut, fin, i0 = segmentBande(j,l1,delta_min,largeur)
+        n = fin-debut+1
+        segment = slice(debut,fin+1)
+        dessus = slice(debut+1,fin+2)
+
+        # Matrice A (diagonale)
+        maximum = np.maximum(np.maximum(A[segment],B[segment]),C[segment])
+        codeA = etats((A[segment],B[segment],C[segment]),maximum)
+        nouveauA = maximum+profil[code2[j-1]][i0:i0+n]
+        if (i0==0):
+            nouveauA[0] = infini
+
+        # Matrice B (haut)
+        hA = A[dessus]+d+k
+        hB = B[dessus]+k
+        hC = C[dessus]+d+k
+        nouveauB = np.maximum(np.maximum(hA,hB),hC)
+        codeB = etats((hA,hB,hC),nouveauB)
+
+        # Matrice C (gauche): C[b] = max_t<b( max(A,B)[t] + d + (b-t)*k )
+        Y = np.maximum(nouveauA,nouveauB)
+        nouveauC = np.empty(n, dtype=np.int64)
+        nouveauC[0] = infini
+        nouveauC[1:] = d+k*b[1:n]+np.maximum.accumulate(Y[:-1]-k*b[:n-1])
+        gA = np.empty(n, dtype=np.int64)
+        gB = np.empty(n, dtype=np.int64)
+        gC = np.empty(n, dtype=np.int64)
+        gA[0] = gB[0] = gC[0] = infini
+        gA[1:] = nouveauA[:-1]+d+k
+        gB[1:] = nouveauB[:-1]+d+k
+        gC[1:] = nouveauC[:-1]+k
+        codeC = etats((gA,gB,gC),nouveauC)
+
+        directions[j,segment] = codeA | (codeB<<3) | (codeC<<6)
+        A = np.full(largeur+1, infini, dtype=np.int64)
+        B = A.copy()
+        C = A.copy()
+        A[segment] = np.maximum(nouveauA,infini)
+        B[segment] = np.maximum(nouveauB,infini)
+        C[segment] = np.maximum(nouveauC,infini)
+        if (controle is not None and controle(j,i0,[A[segment],B[segment],C[segment]])):
+            return(None, directions, delta_min)
+
+    fin = l1-l2-delta_min
+    return((int(A[fin]),int(B[fin]),int(C[fin])), directions, delta_min)
+
+def alignementAffineBande(seq1,seq2,d,k,cost=costmat,largeur=16):
+    ''' Equivalent de alignementSimpleBande pour le gap affine.
+        Renvoie le couple (score, alignement).'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    code1, code2, profil, sub_max = preparerBande(seq1,seq2,cost)
+    l1 = len(code1)
+    l2 = len(code2)
+    w = min(largeur,min(l1,l2))
+    while True:
+        finaux, directions, delta_min = remplirBandeAffine(code1,code2,profil,d,k,w)
+        score = max(finaux)
+        necessaire = largeurNecessaire(score,l1,l2,sub_max,k,d)
+        if (necessaire<=w):
+            break
+        w = necessaire
+
+    return(score, retourBandeAffine(directions,delta_min,finaux.index(score),seq1,seq2))
+
+def retourBandeAffine(directions,delta_min,etat,seq1,seq2):
+    # Retour sur trace depuis l'état final etat (0, 1 ou 2 pour A, B ou
+    # C): le premier meilleur état, puis les premiers parents
+    alignement=[]
+    j,i = len(seq2),len(seq1)
+    while (j>0 or i>0):
+        code = int(directions[j][i-j-delta_min])>>(3*etat)
+        if (etat==0):
+            alignement.append((seq1[i-1],seq2[j-1]))
+            j,i = j-1,i-1
+        elif (etat==1):
+            alignement.append(("-",seq2[j-1]))
+            j -= 1
+        else:
+            alignement.append((seq1[i-1],"-"))
+            i -= 1
+        etat = 0 if code & ETAT_A else (1 if code & ETAT_B else 2)
+    return(alignement)
@@ -0,0 +1,174 @@
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from functools import wraps
+
+######################################################################
+#                                                                    #
+#                     Cache des alignements                          #
+#                                                                    #
+# Les mêmes paires (amorces, adaptateurs, fragments de référence)    #
+# sont souvent alignées plusieurs fois. Le cache garde les résultats #
+# des fonctions d'alignement, indexés par une empreinte de la        #
+# fonction et de tous ses paramètres (séquences, d, k, matrice de    #
+# score).                                                            #
+#                                                                    #
+# Deux niveaux:                                                      #
+#  - en mémoire, les derniers résultats utilisés (LRU), en nombre    #
+#    borné;                                                          #
+#  - sur disque (SQLite, optionnel), sans limite, conservé d'une     #
+#    exécution à l'autre.                                            #
+#                                                                    #
+# Seuls les résultats compacts sont mis en cache: un score ou un     #
+# couple (score, alignement), comme ceux de scoreSimple ou de        #
+# alignementSimpleAuto.                                              #
+#                                                                    #
+######################################################################
+
+def encoderResultat(resultat):
+    return(json.dumps(resultat))
+
+def decoderResultat(texte):
+    resultat = json.loads(texte)
+    if (isinstance(resultat,list)):
+        score, alignement = resultat
+        return((score, [tuple(colonne) for colonne in alignement]))
+    return(resultat)
+
+def copierResultat(resultat):
+    # Les alignements sont des listes modifiables (printSequence les
+    # retourne): le cache garde et rend des copies.
+    if (isinstance(resultat,tuple)):
+        score, alignement = resultat
+        return((score, list(alignement)))
+    return(resultat)
+
+class cacheAlignement:
+    ''' Cache à deux niveaux des résultats d'alignement. taille est le
+        nombre maximum de résultats gardés en mémoire, chemin le fichier
+        SQLite du niveau disque (None: pas de niveau disque).'''
+    
+    def __init__(self,taille=1024,chemin=None):
+        self.taille = taille
+        self.chemin = chemin
+        self.memoire = OrderedDict()
+        self.connexion = None
+        # Compteurs
+        self.succes = 0
+        self.succes_disque = 0
+        self.echecs = 0
+        self.evictions = 0
+        # Taille du niveau mémoire de chaque processus de calcul
+        self.tailles_processus = {}
+        if (chemin is not None):
+            self.connexion = sqlite3.connect(chemin)
+            self.connexion.execute("PRAGMA journal_mode=WAL")
+            self.connexion.execute("PRAGMA synchronous=NORMAL")
+            self.connexion.execute("CREATE TABLE IF NOT EXISTS resultats "
+                                   "(cle TEXT PRIMARY KEY, valeur TEXT)")
+            self.connexion.commit()
+    
+    # Seule la configuration est transmise aux autres processus: chacun
+    # a son propre niveau mémoire, sa connexion SQLite et ses compteurs
+    # (renvoyés par extraireCompteurs, voir alignerLot).
+    def __getstate__(self):
+        return({"taille":self.taille, "chemin":self.chemin})
+    
+    def __setstate__(self,etat):
+        self.__init__(etat["taille"],etat["chemin"])
+    
+    def __len__(self):
+        return(len(self.memoire))
+    
+    def cle(self,nom,arguments):
+        # Empreinte du nom de la fonction et de ses arguments. Les
+        # séquences sont mises en majuscules comme dans les fonctions.
+        arguments = dict(arguments)
+        for nom_sequence in ("seq1","seq2"):
+            if (nom_sequence in arguments):
+                arguments[nom_sequence] = arguments[nom_sequence].upper()
+        texte = json.dumps([nom,arguments],sort_keys=True)
+        return(hashlib.sha256(texte.encode()).hexdigest())
+    
+    def obtenir(self,cle):
+        # Résultat associé à la clé, ou None
+        if (cle in self.memoire):
+            self.memoire.move_to_end(cle)
+            self.succes += 1
+            return(copierResultat(self.memoire[cle]))
+        if (self.connexion is not None):
+            ligne = self.connexion.execute("SELECT valeur FROM resultats WHERE cle=?",
+                                           (cle,)).fetchone()
+            if (ligne is not None):
+                self.succes_disque += 1
+                resultat = decoderResultat(ligne[0])
+                self.ajouterMemoire(cle,copierResultat(resultat))
+                return(resultat)
+        self.echecs += 1
+        return(None)
+    
+    def enregistrer(self,cle,resultat):
+        self.ajouterMemoire(cle,copierResultat(resultat))
+        if (self.connexion is not None):
+            self.connexion.execute("INSERT OR REPLACE INTO resultats VALUES (?,?)",
+                                   (cle,encoderResultat(resultat)))
+            self.connexion.commit()
+    
+    def ajouterMemoire(self,cle,resultat):
+        self.memoire[cle] = resultat
+        self.memoire.move_to_end(cle)
+        while (len(self.memoire)>self.taille):
+            self.memoire.popitem(last=False)
+            self.evictions += 1
+    
+    def memoiser(self,fonction):
+        ''' Version de fonction dont les résultats passent par le cache.'''
+        signature = inspect.signature(fonction)
+        nom = fonction.__module__+"."+fonction.__qualname__
+        
+        @wraps(fonction)
+        def enveloppe(*args,**kwargs):
+            arguments = signature.bind(*args,**kwargs)
+            arguments.apply_defaults()
+            cle = self.cle(nom,arguments.arguments)
+            resultat = self.obtenir(cle)
+            if (resultat is None):
+                resultat = fonction(*args,**kwargs)
+                self.enregistrer(cle,resultat)
+            return(resultat)
+        return(enveloppe)
+    
+    def extraireCompteurs(self):
+        # Compteurs depuis le dernier appel et taille du niveau mémoire
+        # (pour les renvoyer d'un processus de calcul au processus
+        # principal)
+        compteurs = {"succes":self.succes, "succes_disque":self.succes_disque,
+                     "echecs":self.echecs, "evictions":self.evictions,
+                     "processus":os.getpid(), "taille":len(self.memoire)}
+        self.succes = self.succes_disque = self.echecs = self.evictions = 0
+        return(compteurs)
+    
+    def fusionnerCompteurs(self,compteurs):
+        # Ajout des compteurs renvoyés par extraireCompteurs
+        self.succes += compteurs["succes"]
+        self.succes_disque += compteurs["succes_disque"]
+        self.echecs += compteurs["echecs"]
+        self.evictions += compteurs["evictions"]
+        self.tailles_processus[compteurs["processus"]] = compteurs["taille"]
+    
+    def statistiques(self):
+        ''' Compteurs du cache, y compris ceux des processus de calcul
+            de alignerLot; taille est le nombre total de résultats en
+            mémoire, taille_max la limite par processus.'''
+        return({"succes":self.succes, "succes_disque":self.succes_disque,
+                "echecs":self.echecs, "evictions":self.evictions,
+                "taille":len(self.memoire)+sum(self.tailles_processus.values()),
+                "taille_max":self.taille})
+    
+    def fermer(self):
+        if (self.connexion is not None):
+            self.connexion.close()
+            self.connexion = None
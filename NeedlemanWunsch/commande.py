@@ -0,0 +1,146 @@
+import argparse
+import json
+import sys
+
+from .initialisation import costmat, d, k
+from .affichage import cigarAlignement
+from .alphabets import chargerMatrice, matriceSubstitution
+from .cache import cacheAlignement
+from .fasta import lirePaires
+from .instrumentation import activerMesures, exporterMesures, mesures
+from .lot import alignerLot
+
+######################################################################
+#                                                                    #
+#                  Alignement en ligne de commande                   #
+#                                                                    #
+# Sans menu ni input(): les paires sont lues au fur et à mesure dans #
+# des fichiers FASTA / FASTQ (ou l'entrée standard), alignées par    #
+# alignerLot et les résultats écrits au fil de l'eau, en TSV, en     #
+# lignes SAM (avec CIGAR) ou en lignes JSON.                         #
+#                                                                    #
+#   python -m NeedlemanWunsch paires.fa > resultats.tsv              #
+#   zcat reads.fq.gz | python -m NeedlemanWunsch -a affine -f sam -  #
+#                                                                    #
+######################################################################
+
+def formaterTSV(id1,seq1,id2,seq2,score,alignement):
+    colonnes=[id1,id2,str(score)]
+    if (alignement is not None):
+        colonnes.append(cigarAlignement(alignement))
+    return("\t".join(colonnes))
+
+def formaterSAM(id1,seq1,id2,seq2,score,alignement):
+    # La séquence 1 est la requête (QNAME), la séquence 2 la référence
+    # (RNAME). L'alignement global commence toujours en position 1.
+    cigar = cigarAlignement(alignement) if alignement is not None else "*"
+    return("\t".join([id1,"0",id2,"1","255",cigar,"*","0","0",seq1,"*","AS:i:"+str(score)]))
+
+def formaterJSON(id1,seq1,id2,seq2,score,alignement):
+    resultat={"id1":id1,"id2":id2,"score":score}
+    if (alignement is not None):
+        resultat["cigar"]=cigarAlignement(alignement)
+        resultat["alignement1"]="".join(a for a,b in reversed(alignement))
+        resultat["alignement2"]="".join(b for a,b in reversed(alignement))
+    return(json.dumps(resultat))
+
+formats={"tsv":formaterTSV, "sam":formaterSAM, "json":formaterJSON}
+
+def pairesValides(paires,sequences,alphabet,erreurs):
+    # Filtre des paires valides (séquences écrites dans l'alphabet de la
+    # matrice de score), les paires invalides étant signalées sur
+    # erreurs. Les séquences sont gardées dans le dictionnaire sequences
+    # jusqu'à l'écriture du résultat (format SAM), sous le numéro de la
+    # paire ajouté au premier identifiant.
+    for numero,(id1,seq1,id2,seq2) in enumerate(paires):
+        if (not alphabet.valide(seq1) or not alphabet.valide(seq2)):
+            print("Paire ignorée (séquence invalide): "+id1+" / "+id2,file=erreurs)
+            continue
+        sequences[numero]=(seq1,seq2)
+        yield((numero,id1),seq1,id2,seq2)
+
+def analyserArguments(argv):
+    parser = argparse.ArgumentParser(prog="python -m NeedlemanWunsch",
+        description="Alignement de Needleman et Wunsch de paires de séquences "
+                    "lues dans des fichiers FASTA / FASTQ (éventuellement gzip). "
+                    "Sans argument, le menu interactif est lancé.")
+    parser.add_argument("fichiers",nargs="+",metavar="fichier",
+        help="un fichier (séquences appariées deux à deux) ou deux fichiers "
+             "(appariés ligne à ligne), - pour l'entrée standard")
+    parser.add_argument("-a","--algorithme",choices=["simple","affine"],default="simple")
+    parser.add_argument("-d",type=int,default=d,help="score de gap / d'ouverture de gap")
+    parser.add_argument("-k",type=int,default=k,help="score de prolongation de gap (affine)")
+    parser.add_argument("-m","--matrice",
+        help="matrice de substitution: BLOSUM62, PAM250, NUC.4.4 ou un fichier "
+             "au format du NCBI (par défaut, la matrice ADN de costmat)")
+    parser.add_argument("-f","--format",choices=sorted(formats),default="tsv")
+    parser.add_argument("-s","--score-seul",action="store_true",
+        help="ne calcule que le score (plus rapide)")
+    parser.add_argument("-p","--processus",type=int,default=1,
+        help="nombre de processus (0: autant que de coeurs)")
+    parser.add_argument("-o","--sortie",default="-",help="fichier de sortie")
+    parser.add_argument("--cache",metavar="FICHIER",
+        help="fichier SQLite où garder les résultats d'une exécution à l'autre")
+    parser.add_argument("--cache-taille",type=int,default=4096,
+        help="nombre de résultats gardés en mémoire par processus")
+    parser.add_argument("--mesures",metavar="FICHIER",
+        help="fichier JSON où écrire les mesures des phases (- pour la sortie "
+             "d'erreur, aussi activées par NEEDLEMANWUNSCH_MESURES=1)")
+    arguments = parser.parse_args(argv)
+    if (len(arguments.fichiers)>2):
+        parser.error("un ou deux fichiers attendus")
+    return(arguments)
+
+def aligner(arguments,erreurs):
+    # Alignement des paires des fichiers et écriture des résultats
+    formater = formats[arguments.format]
+    if (arguments.mesures is not None):
+        activerMesures()
+    
+    if (arguments.matrice is None):
+        matrice = matriceSubstitution(costmat)
+    else:
+        matrice = chargerMatrice(arguments.matrice)
+    
+    # Sortie avec un grand tampon: l'écriture ne doit pas ralentir l'alignement
+    if (arguments.sortie=="-"):
+        sortie = open(sys.stdout.fileno(),"w",buffering=1<<20,closefd=False)
+    else:
+        sortie = open(arguments.sortie,"w",buffering=1<<20)
+    
+    cache = None
+    if (arguments.cache is not None):
+        cache = cacheAlignement(arguments.cache_taille,arguments.cache)
+    
+    sequences = {}
+    paires = pairesValides(lirePaires(*arguments.fichiers),sequences,matrice.alphabet,erreurs)
+    try:
+        with sortie:
+            resultats = alignerLot(paires,arguments.algorithme,arguments.d,arguments.k,
+                                   matrice,arguments.score_seul,arguments.processus or None,
+                                   cache=cache)
+            for (numero,id1),id2,score,alignement in resultats:
+                seq1,seq2 = sequences.pop(numero)
+                sortie.write(formater(id1,seq1,id2,seq2,score,alignement)+"\n")
+    except BrokenPipeError:
+        pass
+    finally:
+        if (cache is not None):
+            print("Cache: "+json.dumps(cache.statistiques()),file=erreurs)
+            cache.fermer()
+    
+    if (mesures.actif):
+        if (arguments.mesures in (None,"-")):
+            print("Mesures: "+json.dumps(exporterMesures()),file=erreurs)
+        else:
+            exporterMesures(arguments.mesures)
+
+def main(argv=None,erreurs=sys.stderr):
+    arguments = analyserArguments(argv)
+    try:
+        aligner(arguments,erreurs)
+    except (ValueError,OSError) as erreur:
+        # Erreur dans les fichiers ou les paramètres: un message, sans trace
+        print("Erreur: "+str(erreur),file=erreurs)
+        sys.exit(1)
+    
@@ -0,0 +1,293 @@
+import hashlib
+import os
+
+import numpy as np
+
+from .initialisation import costmat
+from .vectoriel import (DIAGONALE, ETAT_A, ETAT_B, ETAT_C, GAUCHE, HAUT,
+                        compilerCostmat, encoderSequence, etatsEgaux)
+
+######################################################################
+#                                                                    #
+#           Alignement sur disque, par tuiles, avec reprise          #
+#                                                                    #
+# Pour de très longues séquences, même les directions des moteurs    #
+# vectorisés (1 ou 2 octets par case) ne tiennent pas en mémoire.    #
+# Elles sont donc rangées dans un fichier projeté en mémoire         #
+# (numpy.memmap), par tuiles carrées de taille_tuile cases: chaque   #
+# tuile est contiguë dans le fichier. Le remplissage se fait tuile   #
+# par tuile, de gauche à droite puis de haut en bas; une tuile ne    #
+# dépend que de la dernière ligne des tuiles du dessus et de la      #
+# dernière colonne de la tuile de gauche, gardées en mémoire.        #
+#                                                                    #
+# Après chaque ligne de tuiles, le fichier est vidé sur le disque et #
+# un point de reprise (la ligne de scores du bas, le nombre de       #
+# lignes de tuiles faites) remplace atomiquement le précédent. Un    #
+# calcul interrompu reprend à la ligne de tuiles suivante quand on   #
+# relance la même fonction sur le même dossier avec les mêmes        #
+# paramètres. Seules les directions sont gardées: les scores de la   #
+# matrice ne servent pas au retour sur trace.                        #
+#                                                                    #
+# Les résultats se parcourent avec iterRecallbackNumpy et            #
+# iterRecallbackAffineNumpy: le retour sur trace ne lit que les      #
+# tuiles traversées par les chemins, chargées à la demande par le    #
+# système. Les directions et les codes sont identiques à ceux de     #
+# alignementSimpleNumpy et alignementAffineNumpy.                    #
+#                                                                    #
+######################################################################
+
+class matriceTuiles:
+    ''' Matrice (hauteur, largeur) rangée par tuiles carrées dans un
+        fichier projeté en mémoire. m[j,i] lit une case, m[j] une ligne
+        complète (en numpy).'''
+
+    def __init__(self,chemin,hauteur,largeur,dtype,taille_tuile,mode="r+"):
+        self.shape = (hauteur,largeur)
+        self.taille_tuile = taille_tuile
+        self.tuiles = (-(-hauteur//taille_tuile), -(-largeur//taille_tuile))
+        self.donnees = np.memmap(chemin, dtype=dtype, mode=mode,
+                                 shape=self.tuiles+(taille_tuile,taille_tuile))
+
+    def __getitem__(self,position):
+        T = self.taille_tuile
+        if (isinstance(position,tuple)):
+            j,i = position
+            return(self.donnees[j//T,i//T,j%T,i%T])
+        return(self.donnees[position//T,:,position%T,:].reshape(-1)[:self.shape[1]])
+
+    def tuile(self,tj,ti):
+        # Partie de la tuile (tj,ti) qui est dans la matrice
+        T = self.taille_tuile
+        return(self.donnees[tj,ti,:min(T,self.shape[0]-tj*T),:min(T,self.shape[1]-ti*T)])
+
+    def vider(self):
+        self.donnees.flush()
+
+def signatureCalcul(*parametres):
+    # Empreinte des paramètres d'un calcul, gardée avec le point de reprise
+    empreinte = hashlib.sha1()
+    for parametre in parametres:
+        empreinte.update(repr(parametre).encode() if not isinstance(parametre,np.ndarray)
+                         else parametre.tobytes())
+        empreinte.update(b"\0")
+    return(empreinte.hexdigest())
+
+def lireReprise(dossier,signature):
+    # Point de reprise du dossier: (lignes de tuiles faites, frontière)
+    # ou None s'il n'y en a pas ou s'il correspond à un autre calcul
+    chemin = os.path.join(dossier,"reprise.npz")
+    if (not os.path.isfile(chemin)):
+        return(None)
+    with np.load(chemin) as reprise:
+        if (str(reprise["signature"])!=signature):
+            return(None)
+        return(int(reprise["faites"]), reprise["frontiere"].copy())
+
+def ecrireReprise(dossier,signature,faites,frontiere):
+    # Ecriture dans un fichier temporaire puis remplacement: un point de
+    # reprise est toujours complet
+    temporaire = os.path.join(dossier,"reprise.tmp.npz")
+    np.savez(temporaire, signature=signature, faites=faites, frontiere=frontiere)
+    os.replace(temporaire,os.path.join(dossier,"reprise.npz"))
+
+def ouvrirCalcul(dossier,signature,hauteur,largeur,dtype,taille_tuile):
+    # Matrice du dossier, et point de reprise si le calcul est à reprendre
+    os.makedirs(dossier, exist_ok=True)
+    chemin = os.path.join(dossier,"directions.bin")
+    reprise = lireReprise(dossier,signature)
+    if (reprise is None or not os.path.isfile(chemin)):
+        return(matriceTuiles(chemin,hauteur,largeur,dtype,taille_tuile,"w+"), None)
+    return(matriceTuiles(chemin,hauteur,largeur,dtype,taille_tuile,"r+"), reprise)
+
+def remplirTuileSimple(tuile,j0,i0,dessus,gauche,code2,profil,d):
+    # Remplissage d'une tuile (lignes j0.., colonnes i0..) de l'algorithme
+    # simple. dessus: scores de la ligne j0-1, colonnes i0-1 à i1-1;
+    # gauche: scores de la colonne i0-1 (inutilisés si i0 vaut 0).
+    # Renvoie la dernière ligne et la dernière colonne de la tuile.
+    m,n = tuile.shape
+    colonnes = np.arange(i0,i0+n, dtype=np.int64)
+    # Première colonne calculée: la colonne 0 est une colonne de gaps
+    s = 1 if i0==0 else 0
+    gaps = d*np.arange(n-s+1, dtype=np.int64)
+    precedente = dessus
+    droite = np.empty(m, dtype=np.int64)
+    for r in range(m):
+        j = j0+r
+        ligne = np.empty(n+1, dtype=np.int64)
+        if (j==0):
+            ligne[1:] = d*colonnes
+            ligne[0] = d*(i0-1)
+            tuile[r] = GAUCHE
+            if (i0==0):
+                tuile[r,0] = 0
+        else:
+            depart = d*j if i0==0 else gauche[r]
+            diag = precedente[s:n]+profil[code2[j-1],i0+s-1:i0+n-1]
+            haut = precedente[s+1:n+1]+d
+            valeurs = np.empty(n-s+1, dtype=np.int64)
+            valeurs[0] = depart
+            np.maximum(diag,haut,out=valeurs[1:])
+            valeurs = np.maximum.accumulate(valeurs-gaps)+gaps
+            maximum = valeurs[1:]
+            tuile[r,s:] = ( (diag==maximum)*DIAGONALE
+                          | (haut==maximum)*HAUT
+                          | (valeurs[:-1]+d==maximum)*GAUCHE )
+            ligne[s+1:] = maximum
+            ligne[0] = depart if i0>0 else d*j
+            if (i0==0):
+                ligne[1] = d*j
+                tuile[r,0] = HAUT
+        droite[r] = ligne[-1]
+        precedente = ligne
+    return(precedente[1:], droite)
+
+def alignementSimpleDisque(seq1,seq2,d,dossier,cost=costmat,taille_tuile=1024):
+    ''' Equivalent de alignementSimpleNumpy dont les directions sont
+        rangées sur disque, dans le dossier donné (voir plus haut).
+        Renvoie le couple (score, directions), directions étant une
+        matriceTuiles à parcourir avec iterRecallbackNumpy.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    l1= len(code1)
+    l2= len(code2)
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    signature = signatureCalcul("simple",code1,code2,dense,d,taille_tuile)
+    directions, reprise = ouvrirCalcul(dossier,signature,l2+1,l1+1,np.uint8,taille_tuile)
+    T = taille_tuile
+
+    # frontiere: scores de la dernière ligne calculée (ligne j0-1)
+    faites, frontiere = reprise if reprise is not None else (0, np.zeros(l1+1, dtype=np.int64))
+    for tj in range(faites,directions.tuiles[0]):
+        j0 = tj*T
+        gauche = None
+        coin = 0
+        for ti in range(directions.tuiles[1]):
+            i0 = ti*T
+            tuile = directions.tuile(tj,ti)
+            n = tuile.shape[1]
+            dessus = np.empty(n+1, dtype=np.int64)
+            dessus[0] = coin
+            dessus[1:] = frontiere[i0:i0+n]
+            coin = frontiere[i0+n-1]
+            bas, gauche = remplirTuileSimple(tuile,j0,i0,dessus,gauche,code2,profil,d)
+            frontiere[i0:i0+n] = bas
+        directions.vider()
+        ecrireReprise(dossier,signature,tj+1,frontiere)
+    return(int(frontiere[-1]), directions)
+
+# Même valeur que dans alignementAffine
+infini = 42*(-10**6)
+
+def remplirTuileAffine(tuile,j0,i0,dessus,gauche,code2,profil,d,k):
+    # Equivalent de remplirTuileSimple pour le gap affine: dessus et
+    # gauche sont des tableaux (3, ...) des scores de A, B et C, et la
+    # fonction renvoie la dernière ligne et la dernière colonne des trois
+    # matrices. Mêmes calculs que alignementAffineNumpy, case (1,1) comprise.
+    m,n = tuile.shape
+    colonnes = np.arange(i0,i0+n, dtype=np.int64)
+    s = 1 if i0==0 else 0
+    relatives = np.arange(n-s, dtype=np.int64)
+    A,B,C = dessus
+    droite = np.empty((3,m), dtype=np.int64)
+    for r in range(m):
+        j = j0+r
+        nA = np.empty(n+1, dtype=np.int64)
+        nB = np.empty(n+1, dtype=np.int64)
+        nC = np.empty(n+1, dtype=np.int64)
+        if (i0>0):
+            nA[0],nB[0],nC[0] = gauche[:,r]
+        if (j==0):
+            # Première ligne: A et B à infini, C est une suite de gaps
+            nA[1:] = infini
+            nB[1:] = infini
+            nC[1:] = d+k*colonnes
+            tuile[r] = ETAT_C<<6
+            if (i0==0):
+                nA[1] = nB[1] = nC[1] = 0
+                tuile[r,0] = 0
+        else:
+            # Case à gauche de la première case calculée: la colonne 0
+            # (gap vertical) ou la dernière colonne de la tuile de gauche
+            if (i0==0):
+                gA,gB,gC = infini,d+k*j,infini
+            else:
+                gA,gB,gC = nA[0],nB[0],nC[0]
+
+            # Matrice A (diagonale)
+            maximum = np.maximum(np.maximum(A[s:n],B[s:n]),C[s:n])
+            codeA = etatsEgaux((A[s:n],B[s:n],C[s:n]),maximum)
+            valeursA = maximum+profil[code2[j-1],i0+s-1:i0+n-1]
+            if (j==1 and i0+s==1 and n>s):
+                valeursA[0] = profil[code2[0],0]
+                codeA[0] = ETAT_A
+
+            # Matrice B (haut)
+            hA = A[s+1:n+1]+d+k
+            hB = B[s+1:n+1]+k
+            hC = C[s+1:n+1]+d+k
+            valeursB = np.maximum(np.maximum(hA,hB),hC)
+            codeB = etatsEgaux((hA,hB,hC),valeursB)
+
+            # Matrice C (gauche), depuis la case de gauche
+            gaucheA = np.empty(n-s, dtype=np.int64)
+            gaucheB = np.empty(n-s, dtype=np.int64)
+            gaucheA[:1] = gA
+            gaucheB[:1] = gB
+            gaucheA[1:] = valeursA[:-1]
+            gaucheB[1:] = valeursB[:-1]
+            Y = np.maximum(gaucheA,gaucheB)
+            valeursC = d+k*(relatives+1)+np.maximum.accumulate(Y-k*relatives)
+            np.maximum(valeursC, gC+k*(relatives+1), out=valeursC)
+            gaucheC = np.empty(n-s, dtype=np.int64)
+            gaucheC[:1] = gC
+            gaucheC[1:] = valeursC[:-1]
+            codeC = etatsEgaux((gaucheA+d+k,gaucheB+d+k,gaucheC+k),valeursC)
+
+            tuile[r,s:] = codeA | (codeB<<3) | (codeC<<6)
+            nA[s+1:] = valeursA
+            nB[s+1:] = valeursB
+            nC[s+1:] = valeursC
+            if (i0==0):
+                nA[1],nB[1],nC[1] = gA,gB,gC
+                tuile[r,0] = ETAT_B<<3
+        droite[:,r] = nA[-1],nB[-1],nC[-1]
+        A,B,C = nA,nB,nC
+    return(np.array([A[1:],B[1:],C[1:]]), droite)
+
+def alignementAffineDisque(seq1,seq2,d,k,dossier,cost=costmat,taille_tuile=1024):
+    ''' Equivalent de alignementAffineNumpy dont les codes sont rangés
+        sur disque (voir alignementSimpleDisque). Renvoie le couple
+        (finaux, codes), à parcourir avec iterRecallbackAffineNumpy.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    l1= len(code1)
+    l2= len(code2)
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    signature = signatureCalcul("affine",code1,code2,dense,d,k,taille_tuile)
+    codes, reprise = ouvrirCalcul(dossier,signature,l2+1,l1+1,np.uint16,taille_tuile)
+    T = taille_tuile
+
+    faites, frontiere = reprise if reprise is not None else (0, np.zeros((3,l1+1), dtype=np.int64))
+    for tj in range(faites,codes.tuiles[0]):
+        j0 = tj*T
+        gauche = None
+        coin = np.zeros(3, dtype=np.int64)
+        for ti in range(codes.tuiles[1]):
+            i0 = ti*T
+            tuile = codes.tuile(tj,ti)
+            n = tuile.shape[1]
+            dessus = np.empty((3,n+1), dtype=np.int64)
+            dessus[:,0] = coin
+            dessus[:,1:] = frontiere[:,i0:i0+n]
+            coin = frontiere[:,i0+n-1].copy()
+            bas, gauche = remplirTuileAffine(tuile,j0,i0,dessus,gauche,code2,profil,d,k)
+            frontiere[:,i0:i0+n] = bas
+        codes.vider()
+        ecrireReprise(dossier,signature,tj+1,frontiere)
+    return(tuple(int(score) for score in frontiere[:,-1]), codes)
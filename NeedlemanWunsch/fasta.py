@@ -0,0 +1,90 @@
+import gzip
+import io
+import sys
+
+######################################################################
+#                                                                    #
+#                  Lecture de fichiers FASTA / FASTQ                 #
+#                                                                    #
+# Les fichiers sont lus ligne par ligne et les séquences sont        #
+# renvoyées une par une par des générateurs: un fichier n'est jamais #
+# chargé en entier. Le format (FASTA ou FASTQ) et la compression     #
+# gzip sont détectés à partir des premiers octets, ce qui permet     #
+# aussi de lire l'entrée standard.                                   #
+#                                                                    #
+######################################################################
+
+def ouvrirSequences(chemin):
+    # Ouverture en mode texte d'un fichier ("-" pour l'entrée standard),
+    # décompressé à la volée s'il commence par l'en-tête gzip. Fermer le
+    # flux renvoyé ferme le fichier, mais pas l'entrée standard.
+    if (chemin=="-"):
+        brut = open(sys.stdin.fileno(),"rb",buffering=1<<16,closefd=False)
+    else:
+        brut = open(chemin,"rb",buffering=1<<16)
+    if (brut.peek(2)[:2]==b"\x1f\x8b"):
+        if (chemin=="-"):
+            brut = gzip.GzipFile(fileobj=brut)
+        else:
+            # GzipFile ne ferme pas un fichier qu'il n'a pas ouvert
+            brut.close()
+            brut = gzip.open(chemin,"rb")
+    return(io.TextIOWrapper(brut,encoding="ascii",errors="replace"))
+
+def lireSequences(flux):
+    ''' Générateur des couples (identifiant, séquence) d'un flux FASTA
+        (séquences éventuellement sur plusieurs lignes) ou FASTQ.'''
+    identifiant=None
+    morceaux=[]
+    for ligne in flux:
+        ligne=ligne.strip()
+        if (ligne==""):
+            continue
+        
+        # FASTQ: en-tête, séquence, séparateur "+", qualités
+        if (ligne[0]=="@" and identifiant is None):
+            sequence=next(flux,"").strip()
+            next(flux,None)
+            next(flux,None)
+            yield(ligne[1:].split()[0] if len(ligne)>1 else "", sequence)
+            continue
+        
+        if (ligne[0]==">"):
+            if (identifiant is not None):
+                yield(identifiant,"".join(morceaux))
+            identifiant=ligne[1:].split()[0] if len(ligne)>1 else ""
+            morceaux=[]
+        elif (identifiant is not None):
+            morceaux.append(ligne)
+        else:
+            raise ValueError("Format inconnu: un fichier FASTA / FASTQ est attendu")
+    if (identifiant is not None):
+        yield(identifiant,"".join(morceaux))
+
+def lirePaires(chemin1,chemin2=None):
+    ''' Générateur des paires (id1, seq1, id2, seq2). Avec un seul
+        fichier, les séquences sont appariées deux à deux (1 avec 2,
+        3 avec 4, ...). Avec deux fichiers, la n-ième séquence du
+        premier est appariée avec la n-ième du second.'''
+    # Les fichiers sont fermés à la fin de la lecture, après une erreur
+    # ou quand le générateur est abandonné
+    flux1=ouvrirSequences(chemin1)
+    flux2=None
+    try:
+        premier=lireSequences(flux1)
+        if (chemin2 is None):
+            second=premier
+        else:
+            flux2=ouvrirSequences(chemin2)
+            second=lireSequences(flux2)
+        for id1,seq1 in premier:
+            suivant=next(second,None)
+            if (suivant is None):
+                raise ValueError("Nombre impair de séquences: "+id1+" n'a pas de partenaire")
+            yield(id1,seq1,suivant[0],suivant[1])
+        if (chemin2 is not None and next(second,None) is not None):
+            raise ValueError("Le second fichier contient plus de séquences que le premier")
+    finally:
+        flux1.close()
+        if (flux2 is not None):
+            flux2.close()
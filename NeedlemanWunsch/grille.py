@@ -0,0 +1,131 @@
+import numpy as np
+
+from .initialisation import costmat
+from .lineaire import ligneScoresAffine, preparerLineaire
+from .vectoriel import (ETAT_A, ETAT_B, ETAT_C, compilerCostmat, encoderSequence,
+                        etatsEgaux, iterRecallbackAffineNumpy)
+
+######################################################################
+#                                                                    #
+#         Grille de paramètres de gap (d, k) en un seul calcul       #
+#                                                                    #
+# Pour régler d et k, on aligne les mêmes paires avec toute une      #
+# grille de valeurs. Plutôt qu'un appel à alignementAffine par       #
+# réglage, les lignes des trois matrices de alignementAffineNumpy    #
+# reçoivent un axe de plus, celui des réglages: chaque ligne de la   #
+# séquence verticale est calculée d'un bloc pour tous les (d, k), et #
+# le profil de la séquence horizontale est préparé une seule fois.   #
+#                                                                    #
+# Sans les alignements, ce sont les lignes CC et DD de scoreAffine   #
+# (voir lineaire.py) qui reçoivent l'axe des réglages.               #
+#                                                                    #
+# Le schéma simple est un cas particulier: un gap de longueur L y    #
+# coûte L*d, soit le réglage (0, d) du gap affine (d + L*k).         #
+#                                                                    #
+# Avec alignements=True, les codes des parents sont gardés pour tous #
+# les réglages (2 octets par case et par réglage) et un meilleur     #
+# alignement est extrait pour chacun, le même que le premier de      #
+# iterRecallbackAffineNumpy avec ce réglage.                         #
+#                                                                    #
+######################################################################
+
+# Même valeur que dans alignementAffine
+infini = 42*(-10**6)
+
+def remplirGrille(code1,code2,dense,D,K,codes=None):
+    # Remplissage affine de la paire pour les réglages D, K (tableaux
+    # (réglages, 1)). Renvoie les scores finaux (réglages, 3) des
+    # matrices A, B et C; si codes (réglages, l2+1, l1+1) est donné, il
+    # reçoit les codes de alignementAffineNumpy de chaque réglage.
+    l1= len(code1)
+    l2= len(code2)
+    reglages = len(D)
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    colonnes = np.arange(l1+1, dtype=np.int64)
+
+    # Première ligne: A et B à infini, C est une suite de gaps
+    A = np.full((reglages,l1+1), infini, dtype=np.int64)
+    B = A.copy()
+    C = D+K*colonnes
+    A[:,0] = B[:,0] = C[:,0] = 0
+    if (codes is not None):
+        codes[:,0,1:] = ETAT_C<<6
+
+    for j in range(1,l2+1):
+        # Matrice A (diagonale)
+        maximum = np.maximum(np.maximum(A[:,:-1],B[:,:-1]),C[:,:-1])
+        nouveauA = np.empty_like(A)
+        nouveauA[:,0] = infini
+        nouveauA[:,1:] = maximum+profil[code2[j-1]]
+        if (codes is not None):
+            codeA = etatsEgaux((A[:,:-1],B[:,:-1],C[:,:-1]),maximum)
+        if (j==1 and l1>0):
+            # Cas spécial de la case (1,1): seule l'origine de A
+            nouveauA[:,1] = profil[code2[0]][0]
+            if (codes is not None):
+                codeA[:,0] = ETAT_A
+
+        # Matrice B (haut)
+        hA = A[:,1:]+D+K
+        hB = B[:,1:]+K
+        hC = C[:,1:]+D+K
+        nouveauB = np.empty_like(B)
+        nouveauB[:,:1] = D+K*j
+        nouveauB[:,1:] = np.maximum(np.maximum(hA,hB),hC)
+
+        # Matrice C (gauche), voir alignementAffineNumpy
+        Y = np.maximum(nouveauA,nouveauB)
+        nouveauC = np.empty_like(C)
+        nouveauC[:,0] = infini
+        nouveauC[:,1:] = D+K*colonnes[1:]+np.maximum.accumulate(Y[:,:-1]-K*colonnes[:-1], axis=1)
+        np.maximum(nouveauC[:,1:], infini+K*colonnes[1:], out=nouveauC[:,1:])
+
+        if (codes is not None):
+            codeB = etatsEgaux((hA,hB,hC),nouveauB[:,1:])
+            codeC = etatsEgaux((nouveauA[:,:-1]+D+K,nouveauB[:,:-1]+D+K,nouveauC[:,:-1]+K),
+                               nouveauC[:,1:])
+            codes[:,j,0] = ETAT_B<<3
+            codes[:,j,1:] = codeA | (codeB<<3) | (codeC<<6)
+        A, B, C = nouveauA, nouveauB, nouveauC
+
+    return(np.stack((A[:,-1],B[:,-1],C[:,-1]), axis=1))
+
+def grilleGaps(paires,gaps,cost=costmat,alignements=False):
+    ''' Scores de l'alignement affine de chaque paire (seq1, seq2) pour
+        chaque réglage (d, k) de gaps. paires est une paire (tuple de
+        deux chaînes) ou un itérable de paires. Renvoie le tableau des
+        scores (paires, réglages), ou (réglages,) pour une seule paire;
+        avec alignements=True, renvoie aussi un meilleur alignement par
+        paire et par réglage (listes de même forme).'''
+    seule = isinstance(paires,tuple) and len(paires)==2 and isinstance(paires[0],str)
+    paires = [paires] if seule else list(paires)
+    table, dense = compilerCostmat(cost)
+    # Réglages en colonne: ils s'étendent sur l'axe des colonnes
+    D = np.array([d for d,k in gaps], dtype=np.int64).reshape(-1,1)
+    K = np.array([k for d,k in gaps], dtype=np.int64).reshape(-1,1)
+    scores = np.empty((len(paires),len(D)), dtype=np.int64)
+    meilleurs = []
+    for numero,(seq1,seq2) in enumerate(paires):
+        seq1=seq1.upper()
+        seq2=seq2.upper()
+        if (not alignements):
+            # Scores seuls: lignes CC et DD de scoreAffine, un réglage
+            # par ligne
+            codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+            scores[numero] = ligneScoresAffine(codeV,profil,D,K,D)[0][:,-1]
+            continue
+        code1 = encoderSequence(seq1, table)
+        code2 = encoderSequence(seq2, table)
+        codes = np.zeros((len(D),len(code2)+1,len(code1)+1), dtype=np.uint16)
+        finaux = remplirGrille(code1,code2,dense,D,K,codes)
+        scores[numero] = finaux.max(axis=1)
+        if (not (seq1 or seq2)):
+            # Deux séquences vides: l'alignement vide
+            meilleurs.append([[] for _ in D])
+            continue
+        meilleurs.append([next(iterRecallbackAffineNumpy(tuple(finaux[reglage].tolist()),
+                                                         codes[reglage],seq1,seq2,1))
+                          for reglage in range(len(D))])
+    if (not alignements):
+        return(scores[0] if seule else scores)
+    return((scores[0], meilleurs[0]) if seule else (scores, meilleurs))
@@ -0,0 +1,193 @@
+import numpy as np
+
+from .initialisation import costmat, d
+from .vectoriel import (DIAGONALE, ETAT_A, ETAT_B, ETAT_C, GAUCHE, HAUT,
+                        compilerCostmat, compterAlignementsAffineNumpy,
+                        compterAlignementsNumpy, encoderSequence, etatsEgaux,
+                        iterRecallbackAffineNumpy, iterRecallbackNumpy)
+
+######################################################################
+#                                                                    #
+#             Réalignement incrémental d'une requête éditée          #
+#                                                                    #
+# La même référence (seq2, verticale) est réalignée après de petites #
+# modifications de la requête (seq1, horizontale). La matrice est    #
+# donc remplie colonne par colonne: la colonne i ne dépend que de la #
+# colonne i-1 et du résidu i-1 de la requête. Ajouter des résidus ne #
+# calcule que les nouvelles colonnes; modifier la requête à partir   #
+# de la position p ne recalcule que les colonnes après p.            #
+#                                                                    #
+# Les directions (ou les codes en affine) de toutes les colonnes     #
+# sont gardées, pour le retour sur trace. Les scores ne sont gardés  #
+# que toutes les intervalle colonnes (et pour la dernière): une      #
+# modification en p repart du point de reprise le plus proche avant  #
+# p, soit au plus intervalle colonnes de plus à recalculer.          #
+#                                                                    #
+# Dans une colonne, le gap vertical (HAUT, matrice B) dépend de la   #
+# case du dessus: il se calcule par maximum cumulé, comme le gap     #
+# horizontal des moteurs vectorisés qui remplissent par lignes. Les  #
+# directions et les codes sont ceux de alignementSimpleNumpy et      #
+# alignementAffineNumpy(requete, reference, ...).                    #
+#                                                                    #
+######################################################################
+
+# Même valeur que dans alignementAffine
+infini = 42*(-10**6)
+
+def colonneSimple(precedente,i,sub,d,lignes):
+    # Scores (1, l2+1) et directions de la colonne i >= 1, precedente
+    # étant les scores de la colonne i-1 et sub les scores du résidu
+    # i-1 de la requête contre la référence
+    S = precedente[0]
+    valeurs = np.empty_like(S)
+    valeurs[0] = d*i
+    diag = S[:-1]+sub
+    gauche = S[1:]+d
+    np.maximum(diag,gauche,out=valeurs[1:])
+    nouvelle = np.maximum.accumulate(valeurs-d*lignes)+d*lignes
+    directions = np.empty(len(S), dtype=np.uint8)
+    directions[0] = GAUCHE
+    directions[1:] = ( (diag==nouvelle[1:])*DIAGONALE
+                     | (nouvelle[:-1]+d==nouvelle[1:])*HAUT
+                     | (gauche==nouvelle[1:])*GAUCHE )
+    return(nouvelle[np.newaxis], directions)
+
+def colonneAffine(precedente,i,sub,d,k,lignes):
+    # Equivalent de colonneSimple pour les matrices A, B et C (scores
+    # (3, l2+1) et codes de alignementAffineNumpy)
+    A,B,C = precedente
+    l2 = len(A)-1
+    codes = np.empty(l2+1, dtype=np.uint16)
+    codes[0] = ETAT_C<<6
+
+    # Matrice A (diagonale)
+    maximum = np.maximum(np.maximum(A[:-1],B[:-1]),C[:-1])
+    codeA = etatsEgaux((A[:-1],B[:-1],C[:-1]),maximum)
+    nouveauA = np.empty_like(A)
+    nouveauA[0] = infini
+    nouveauA[1:] = maximum+sub
+    if (i==1 and l2>0):
+        # Cas spécial de la case (1,1): seule l'origine de A
+        nouveauA[1] = sub[0]
+        codeA[0] = ETAT_A
+
+    # Matrice C (gauche), depuis la colonne précédente
+    gA = A[1:]+d+k
+    gB = B[1:]+d+k
+    gC = C[1:]+k
+    nouveauC = np.empty_like(C)
+    nouveauC[0] = d+k*i
+    nouveauC[1:] = np.maximum(np.maximum(gA,gB),gC)
+    codeC = etatsEgaux((gA,gB,gC),nouveauC[1:])
+
+    # Matrice B (haut): B[j] = max_t<j( max(A,C)[t] + d + (j-t)*k )
+    # (la ligne 0 de B est à infini)
+    Y = np.maximum(nouveauA,nouveauC)
+    nouveauB = np.empty_like(B)
+    nouveauB[0] = infini
+    nouveauB[1:] = d+k*lignes[1:]+np.maximum.accumulate(Y[:-1]-k*lignes[:-1])
+    np.maximum(nouveauB[1:], infini+k*lignes[1:], out=nouveauB[1:])
+    codeB = etatsEgaux((nouveauA[:-1]+d+k,nouveauB[:-1]+k,nouveauC[:-1]+d+k),nouveauB[1:])
+
+    codes[1:] = codeA | (codeB<<3) | (codeC<<6)
+    return(np.array([nouveauA,nouveauB,nouveauC]), codes)
+
+class alignementIncremental:
+    ''' Alignement global d'une requête (seq1), modifiable, contre une
+        référence fixe (seq2). Sans k, schéma simple (gap de coût d),
+        sinon gap affine (d + L*k). Voir ajouter et remplacer.'''
+
+    def __init__(self,reference,requete="",d=d,k=None,cost=costmat,intervalle=64):
+        self.reference = reference.upper()
+        self.d = d
+        self.k = k
+        self.intervalle = intervalle
+        self.table, dense = compilerCostmat(cost)
+        # profil[c] : scores du résidu de code c contre la référence
+        self.profil = np.ascontiguousarray(dense[:,encoderSequence(self.reference,self.table)],
+                                           dtype=np.int64)
+        l2 = len(self.reference)
+        self.lignes = np.arange(l2+1, dtype=np.int64)
+        self.requete = ""
+        self.codes = np.empty(0, dtype=np.uint8)
+        # directions[i] : directions (ou codes) de la colonne i
+        if (k is None):
+            colonne = (d*self.lignes)[np.newaxis]
+            self.directions = np.empty((64,l2+1), dtype=np.uint8)
+            self.directions[0] = HAUT
+        else:
+            colonne = np.array([np.full(l2+1,infini),d+k*self.lignes,np.full(l2+1,infini)])
+            colonne[:,0] = 0
+            self.directions = np.empty((64,l2+1), dtype=np.uint16)
+            self.directions[0] = ETAT_B<<3
+        self.directions[0,0] = 0
+        # Points de reprise: scores des colonnes gardées
+        self.points = {0: colonne}
+        self.colonnes_calculees = 0
+        self.ajouter(requete)
+
+    def calculer(self,position):
+        # Recalcul des colonnes après position, depuis le point de
+        # reprise le plus proche
+        depart = max(colonne for colonne in self.points if colonne<=position)
+        scores = self.points[depart]
+        self.points = {colonne: valeurs for colonne,valeurs in self.points.items()
+                       if colonne<=depart and colonne%self.intervalle==0}
+        l1 = len(self.codes)
+        if (len(self.directions)<=l1):
+            agrandies = np.empty((max(l1+1,2*len(self.directions)),self.directions.shape[1]),
+                                 dtype=self.directions.dtype)
+            agrandies[:len(self.directions)] = self.directions
+            self.directions = agrandies
+        for i in range(depart+1,l1+1):
+            sub = self.profil[self.codes[i-1]]
+            if (self.k is None):
+                scores, self.directions[i] = colonneSimple(scores,i,sub,self.d,self.lignes)
+            else:
+                scores, self.directions[i] = colonneAffine(scores,i,sub,self.d,self.k,self.lignes)
+            if (i%self.intervalle==0):
+                self.points[i] = scores
+        self.colonnes_calculees += l1-depart
+        self.points[l1] = scores
+
+    def ajouter(self,residus):
+        ''' Ajoute des résidus à la fin de la requête: seules les
+            nouvelles colonnes sont calculées.'''
+        self.remplacer(len(self.requete),len(self.requete),residus)
+
+    def remplacer(self,debut,fin,residus=""):
+        ''' Remplace requete[debut:fin] par residus (insertion si debut
+            vaut fin, suppression si residus est vide): les colonnes
+            avant debut ne sont pas recalculées.'''
+        if (not 0<=debut<=fin<=len(self.requete)):
+            raise ValueError("Intervalle hors de la requête: "+str((debut,fin)))
+        residus = residus.upper()
+        nouveaux = encoderSequence(residus,self.table)
+        self.requete = self.requete[:debut]+residus+self.requete[fin:]
+        self.codes = np.concatenate((self.codes[:debut],nouveaux,self.codes[fin:]))
+        self.calculer(debut)
+
+    def score(self):
+        ''' Score de l'alignement optimal de la requête actuelle.'''
+        return(int(self.points[len(self.requete)][:,-1].max()))
+
+    def matrice(self):
+        # Directions (ou codes) indexées [j][i], comme celles des moteurs
+        # vectorisés
+        return(self.directions[:len(self.requete)+1].T)
+
+    def iterAlignements(self,max_alignements=None):
+        ''' Générateur des alignements optimaux (format de recallback),
+            les mêmes que ceux des moteurs vectorisés.'''
+        if (self.k is None):
+            return(iterRecallbackNumpy(self.matrice(),self.requete,self.reference,max_alignements))
+        finaux = tuple(self.points[len(self.requete)][:,-1].tolist())
+        return(iterRecallbackAffineNumpy(finaux,self.matrice(),self.requete,self.reference,
+                                         max_alignements))
+
+    def compterAlignements(self):
+        ''' Nombre d'alignements optimaux.'''
+        if (self.k is None):
+            return(compterAlignementsNumpy(self.matrice()))
+        finaux = tuple(self.points[len(self.requete)][:,-1].tolist())
+        return(compterAlignementsAffineNumpy(finaux,self.matrice()))
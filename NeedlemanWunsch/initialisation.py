@@ -0,0 +1,88 @@
+import re
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+  #     #
+ ##    #            Déclaration & 
+  #   #                       Initialisation 
+ ### #    
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+ 
+######################################################################
+# Création d'objets facilement manipulables pour le calcule de score #
+# et la procédure de callback (chemin inverse). Cela nous permettra  #
+# de savoir d'où vient un node, et si l'alignement précédent était   #
+# un gap ou non.                                                     #
+######################################################################
+
+class node:
+    ''' Noeud d'un graphe de score d'alignement selon l'algorithme
+        de Needleman Wunsch. Un noeud est défini par son score
+        et une liste de noeuds parents qui peuvent êtres nulles'''
+    def __init__(self, s,p):
+         
+        self.score  = None
+        self.parent = None
+        if (s!=None):
+            self.score = s
+        if (p!=None):
+            self.parent = p
+         
+    # Fonction de modificiation du score d'un node
+    def setScore(self,n):
+        self.score=n
+    
+    # Fonction de modificiation des parents d'un node
+    def setParent(self,p):
+        self.parent=p
+         
+         
+class parent:
+    ''' Parent d'un noeud. Il s'agit d'objets 'node' associés à
+        des alignements (ex: ('A','-') ).'''
+        
+    def __init__(self, n , al):
+         self.nodes = []
+         if(n!=None):
+            self.nodes.append(n)
+            
+         self.alignements = []
+         if(al!=None):
+            self.alignements.append(al)
+    
+    def addNode(self,n):
+        self.nodes.append(n)
+    
+    def addAlign(self,al):
+        self.alignements.append(al)
+         
+######################################################################
+#                                                                    #
+#                   Creation des variables globales                  #
+#                                                                    #
+######################################################################
+
+# Valeurs de gap par défaut
+d= -2  # Coût de gap / d'ouverture de gap
+k= -1  # Coût de prolongation de gap
+
+# Matrice pour le score de match / mismatch par défaut
+costmat= { "A":{"A": 3 ,"T":-1 ,"C":-1 ,"G":-1 },
+           "T":{"A":-1 ,"T": 3 ,"C":-1 ,"G":-1 },
+           "C":{"A":-1 ,"T":-1 ,"C": 3 ,"G":-1 },
+           "G":{"A":-1 ,"T":-1 ,"C":-1 ,"G":3  }}
+
+######################################################################
+#                                                                    #
+#                   Creation d'une regex de controle                 #
+#                                                                    #
+######################################################################
+
+# Afin de vérifier que les séquences soient bien de l'ADN et ne fassent
+# pas planter le programme, les séquences seront testées avant d'être
+# alignée.
+DNA= re.compile(r"^[ATCG]+$",re.IGNORECASE)
+
+def isDNA(string):
+    if DNA.search(string):
+        return(True)
+    return False
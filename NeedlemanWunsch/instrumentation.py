@@ -0,0 +1,176 @@
+import json
+import os
+import sys
+import time
+
+######################################################################
+#                                                                    #
+#                 Mesures des phases d'un alignement                 #
+#                                                                    #
+# Chronomètres et compteurs par phase (allocation des matrices,      #
+# remplissage, retour sur trace, lots...): cases calculées, égalités #
+# (cases à plusieurs parents), chemins énumérés, taille maximum des  #
+# matrices en octets.                                                #
+#                                                                    #
+# Les mesures sont désactivées par défaut: chaque fonction ne fait   #
+# alors qu'un test par appel (jamais par case). Elles s'activent     #
+# avec activerMesures() ou la variable d'environnement               #
+# NEEDLEMANWUNSCH_MESURES=1, et s'exportent en JSON                  #
+# (exporterMesures) ou vers une fonction appelée à la fin de chaque  #
+# phase avec son nom et sa durée.                                    #
+#                                                                    #
+######################################################################
+
+class phaseNulle:
+    # Phase des mesures désactivées: ne fait rien
+    def __enter__(self):
+        return(self)
+    def __exit__(self,*erreur):
+        return(False)
+
+class phaseMesuree:
+    def __init__(self,registre,nom):
+        self.registre = registre
+        self.nom = nom
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return(self)
+    def __exit__(self,*erreur):
+        self.registre.ajouterDuree(self.nom,time.perf_counter()-self.debut)
+        return(False)
+
+class chronometreNul:
+    def etape(self,nom):
+        pass
+    def reprendre(self):
+        pass
+
+class chronometre:
+    # Chaque étape reçoit le temps écoulé depuis l'étape précédente
+    def __init__(self,registre,prefixe):
+        self.registre = registre
+        self.prefixe = prefixe
+        self.debut = time.perf_counter()
+    def etape(self,nom):
+        fin = time.perf_counter()
+        self.registre.ajouterDuree(self.prefixe+"."+nom,fin-self.debut)
+        self.debut = fin
+    def reprendre(self):
+        # Le temps écoulé depuis la dernière étape n'est pas compté
+        # (par exemple celui passé hors d'un générateur)
+        self.debut = time.perf_counter()
+
+class registreMesures:
+    ''' Ensemble des mesures du processus courant.'''
+
+    def __init__(self):
+        self.actif = False
+        self.rappel = None
+        self.nulle = phaseNulle()
+        self.chronometreNul = chronometreNul()
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        self.phases = {}
+        self.compteurs = {}
+        self.maximums = {}
+
+    def phase(self,nom):
+        ''' Gestionnaire de contexte qui chronomètre la phase nom.'''
+        if (not self.actif):
+            return(self.nulle)
+        return(phaseMesuree(self,nom))
+
+    def chrono(self,prefixe):
+        ''' Chronomètre d'une suite de phases: chrono.etape(nom) mesure
+            la phase prefixe.nom, qui vient de se terminer.'''
+        if (not self.actif):
+            return(self.chronometreNul)
+        return(chronometre(self,prefixe))
+
+    def ajouterDuree(self,nom,duree,appels=1):
+        if (not self.actif):
+            return
+        mesure = self.phases.setdefault(nom,[0,0.0])
+        mesure[0] += appels
+        mesure[1] += duree
+        if (self.rappel is not None):
+            self.rappel(nom,duree)
+
+    def compter(self,nom,nombre=1):
+        if (self.actif):
+            self.compteurs[nom] = self.compteurs.get(nom,0)+nombre
+
+    def maximum(self,nom,valeur):
+        if (self.actif):
+            self.maximums[nom] = max(self.maximums.get(nom,valeur),valeur)
+
+    def exporter(self):
+        return({"phases": {nom: {"appels": appels, "secondes": secondes}
+                           for nom,(appels,secondes) in sorted(self.phases.items())},
+                "compteurs": dict(sorted(self.compteurs.items())),
+                "maximums": dict(sorted(self.maximums.items()))})
+
+    def extraire(self):
+        # Mesures depuis le dernier appel (pour les renvoyer d'un
+        # processus de calcul au processus principal), None si inactif
+        if (not self.actif):
+            return(None)
+        mesures = self.exporter()
+        self.reinitialiser()
+        return(mesures)
+
+    def fusionner(self,mesures):
+        # Ajout des mesures renvoyées par extraire
+        if (not self.actif or mesures is None):
+            return
+        for nom,phase in mesures["phases"].items():
+            self.ajouterDuree(nom,phase["secondes"],phase["appels"])
+        for nom,nombre in mesures["compteurs"].items():
+            self.compter(nom,nombre)
+        for nom,valeur in mesures["maximums"].items():
+            self.maximum(nom,valeur)
+
+# Registre du processus
+mesures = registreMesures()
+mesures.actif = os.environ.get("NEEDLEMANWUNSCH_MESURES","0") not in ("","0")
+
+def activerMesures(rappel=None):
+    ''' Active les mesures. rappel(nom, secondes), optionnel, est
+        appelé à la fin de chaque phase.'''
+    mesures.actif = True
+    mesures.rappel = rappel
+
+def desactiverMesures():
+    mesures.actif = False
+    mesures.rappel = None
+
+def reinitialiserMesures():
+    mesures.reinitialiser()
+
+def exporterMesures(fichier=None):
+    ''' Mesures accumulées depuis l'activation (ou la dernière
+        réinitialisation), sous forme de dictionnaire, écrites en JSON
+        dans fichier s'il est donné ("-" pour la sortie d'erreur).'''
+    resultat = mesures.exporter()
+    if (fichier=="-"):
+        print(json.dumps(resultat),file=sys.stderr)
+    elif (fichier is not None):
+        with open(fichier,"w") as sortie:
+            json.dump(resultat,sortie,indent=1)
+    return(resultat)
+
+def mesurerNodes(prefixe,matrices):
+    # Cases, égalités (cases à plusieurs parents) et taille estimée des
+    # matrices de node remplies: la taille d'une case (node, parent,
+    # leurs attributs et leurs listes) multipliée par le nombre de cases.
+    # Parcourt les matrices: n'est appelée que si les mesures sont actives.
+    case = matrices[0][-1][-1]
+    taille = (sys.getsizeof(case)+sys.getsizeof(case.__dict__)
+              +sys.getsizeof(case.parent)+sys.getsizeof(case.parent.__dict__)
+              +sys.getsizeof(case.parent.nodes)+sys.getsizeof(case.parent.alignements))
+    cases = sum(len(matrice)*len(matrice[0]) for matrice in matrices)
+    mesures.compter(prefixe+".cellules",cases)
+    mesures.compter(prefixe+".egalites",sum(len(n.parent.nodes)>1 for matrice in matrices
+                                            for ligne in matrice for n in ligne))
+    mesures.maximum(prefixe+".octets_matrices",taille*cases)
@@ -0,0 +1,298 @@
+import os
+
+import numpy as np
+
+from .initialisation import costmat
+from .lineaire import alignementHirschberg, alignementMyersMiller
+from .vectoriel import (DIAGONALE, ETAT_A, ETAT_B, ETAT_C, GAUCHE, HAUT,
+                        alignementAffineNumpy, alignementSimpleNumpy,
+                        compilerCostmat, encoderSequence,
+                        iterRecallbackAffineNumpy, iterRecallbackNumpy)
+
+######################################################################
+#                                                                    #
+#              Noyaux compilés (Numba) des remplissages              #
+#                                                                    #
+# La récurrence affine ne se vectorise pas bien le long des lignes.  #
+# Les doubles boucles des remplissages (et des retours sur trace)    #
+# sont donc écrites case par case sur des tableaux NumPy, et         #
+# compilées par Numba quand il est installé. Sinon, les mêmes        #
+# fonctions sont exécutées telles quelles, en Python pur.            #
+#                                                                    #
+# Les résultats sont ceux des moteurs vectorisés:                    #
+#  - alignementSimpleJit comme alignementSimpleNumpy (scores,        #
+#    directions), à parcourir avec iterRecallbackNumpy;              #
+#  - alignementAffineJit comme alignementAffineNumpy (finaux,        #
+#    codes), à parcourir avec iterRecallbackAffineNumpy.             #
+#                                                                    #
+# Les noyaux compilés sont gardés sur disque (cache de Numba, dans   #
+# __pycache__ ou NUMBA_CACHE_DIR): un nouveau processus les recharge #
+# sans les recompiler. NEEDLEMANWUNSCH_JIT=0 désactive Numba.        #
+#                                                                    #
+# alignementSimpleAuto et alignementAffineAuto choisissent le moteur #
+# à l'exécution: les noyaux compilés si JIT est vrai, sinon les      #
+# moteurs vectorisés (les noyaux en Python pur sont bien plus        #
+# lents). Au-delà de CASES_MAX cases, la matrice complète ne tient   #
+# plus en mémoire: on passe aux modes en espace linéaire. C'est le   #
+# moteur de alignerLot (et donc de la ligne de commande et du        #
+# service) et de alignementLocal / alignementSemiGlobal.             #
+#                                                                    #
+######################################################################
+
+try:
+    if (os.environ.get("NEEDLEMANWUNSCH_JIT","1")=="0"):
+        raise ImportError
+    import numba
+except ImportError:
+    numba = None
+
+# Vrai si les noyaux sont compilés
+JIT = numba is not None
+
+def compiler(fonction):
+    # Compilation à la première utilisation, avec cache sur disque
+    if (numba is None):
+        return(fonction)
+    return(numba.njit(cache=True, nogil=True)(fonction))
+
+# Même valeur que dans alignementAffine
+INFINI = 42*(-10**6)
+
+@compiler
+def remplirSimple(code1,code2,dense,d,scores,directions):
+    l1 = len(code1)
+    l2 = len(code2)
+    for i in range(l1+1):
+        scores[0,i] = d*i
+        directions[0,i] = GAUCHE if i>0 else 0
+    for j in range(1,l2+1):
+        scores[j,0] = d*j
+        directions[j,0] = HAUT
+        c = code2[j-1]
+        for i in range(1,l1+1):
+            diag = scores[j-1,i-1]+dense[code1[i-1],c]
+            haut = scores[j-1,i]+d
+            gauche = scores[j,i-1]+d
+            maximum = max(diag,haut,gauche)
+            code = 0
+            if (diag==maximum):
+                code |= DIAGONALE
+            if (haut==maximum):
+                code |= HAUT
+            if (gauche==maximum):
+                code |= GAUCHE
+            scores[j,i] = maximum
+            directions[j,i] = code
+
+@compiler
+def remplirAffine(code1,code2,dense,d,k,codes,finaux):
+    # Une ligne par matrice: avant d'écrire la case i de la ligne j, les
+    # tableaux contiennent encore la case i de la ligne j-1 (parent
+    # haut), la case i-1 de la ligne j (parent gauche) et la case i-1 de
+    # la ligne j-1 est gardée à part (parent diagonal).
+    l1 = len(code1)
+    l2 = len(code2)
+    A = np.empty(l1+1, dtype=np.int64)
+    B = np.empty(l1+1, dtype=np.int64)
+    C = np.empty(l1+1, dtype=np.int64)
+    A[0] = 0
+    B[0] = 0
+    C[0] = 0
+    for i in range(1,l1+1):
+        A[i] = INFINI
+        B[i] = INFINI
+        C[i] = d+k*i
+        codes[0,i] = ETAT_C<<6
+    for j in range(1,l2+1):
+        c = code2[j-1]
+        dA = A[0]
+        dB = B[0]
+        dC = C[0]
+        A[0] = INFINI
+        B[0] = d+k*j
+        C[0] = INFINI
+        codes[j,0] = ETAT_B<<3
+        for i in range(1,l1+1):
+            # Matrice A (diagonale), avec le cas spécial de la case (1,1)
+            maximum = max(dA,dB,dC)
+            if (j==1 and i==1):
+                a = dense[code1[0],c]
+                codeA = ETAT_A
+            else:
+                a = maximum+dense[code1[i-1],c]
+                codeA = 0
+                if (dA==maximum):
+                    codeA |= ETAT_A
+                if (dB==maximum):
+                    codeA |= ETAT_B
+                if (dC==maximum):
+                    codeA |= ETAT_C
+            # Matrice B (haut)
+            hA = A[i]+d+k
+            hB = B[i]+k
+            hC = C[i]+d+k
+            b = max(hA,hB,hC)
+            codeB = 0
+            if (hA==b):
+                codeB |= ETAT_A
+            if (hB==b):
+                codeB |= ETAT_B
+            if (hC==b):
+                codeB |= ETAT_C
+            # Matrice C (gauche)
+            gA = A[i-1]+d+k
+            gB = B[i-1]+d+k
+            gC = C[i-1]+k
+            g = max(gA,gB,gC)
+            codeC = 0
+            if (gA==g):
+                codeC |= ETAT_A
+            if (gB==g):
+                codeC |= ETAT_B
+            if (gC==g):
+                codeC |= ETAT_C
+            dA = A[i]
+            dB = B[i]
+            dC = C[i]
+            A[i] = a
+            B[i] = b
+            C[i] = g
+            codes[j,i] = codeA | (codeB<<3) | (codeC<<6)
+    finaux[0] = A[l1]
+    finaux[1] = B[l1]
+    finaux[2] = C[l1]
+
+@compiler
+def retourSimple(directions,operations):
+    # Premier chemin du retour sur trace (premier parent dans l'ordre
+    # diagonale, haut, gauche): operations reçoit 0 (diagonale), 1 (haut)
+    # ou 2 (gauche) de la fin vers le début. Renvoie leur nombre.
+    j = directions.shape[0]-1
+    i = directions.shape[1]-1
+    n = 0
+    while (directions[j,i]!=0):
+        code = directions[j,i]
+        if (code & DIAGONALE):
+            operations[n] = 0
+            j -= 1
+            i -= 1
+        elif (code & HAUT):
+            operations[n] = 1
+            j -= 1
+        else:
+            operations[n] = 2
+            i -= 1
+        n += 1
+    return(n)
+
+@compiler
+def retourAffine(codes,etat,operations):
+    # Equivalent de retourSimple pour les codes affines, depuis l'état
+    # final etat (0, 1 ou 2 pour A, B ou C).
+    j = codes.shape[0]-1
+    i = codes.shape[1]-1
+    n = 0
+    while True:
+        code = (codes[j,i]>>(3*etat)) & 7
+        if (code==0):
+            return(n)
+        operations[n] = etat
+        if (etat==0):
+            j -= 1
+            i -= 1
+        elif (etat==1):
+            j -= 1
+        else:
+            i -= 1
+        n += 1
+        if (code & ETAT_A):
+            etat = 0
+        elif (code & ETAT_B):
+            etat = 1
+        else:
+            etat = 2
+
+def alignementSimpleJit(seq1,seq2,d,cost=costmat):
+    ''' Equivalent de alignementSimpleNumpy avec le noyau compilé.
+        Renvoie le couple (scores, directions).'''
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1.upper(), table)
+    code2 = encoderSequence(seq2.upper(), table)
+    scores = np.empty((len(code2)+1, len(code1)+1), dtype=np.int32)
+    directions = np.empty((len(code2)+1, len(code1)+1), dtype=np.uint8)
+    remplirSimple(code1,code2,dense,d,scores,directions)
+    return(scores, directions)
+
+def alignementAffineJit(seq1,seq2,d,k,cost=costmat):
+    ''' Equivalent de alignementAffineNumpy avec le noyau compilé.
+        Renvoie le couple (finaux, codes).'''
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1.upper(), table)
+    code2 = encoderSequence(seq2.upper(), table)
+    codes = np.zeros((len(code2)+1, len(code1)+1), dtype=np.uint16)
+    finaux = np.zeros(3, dtype=np.int64)
+    remplirAffine(code1,code2,dense,d,k,codes,finaux)
+    return(tuple(int(score) for score in finaux), codes)
+
+def operationsVersAlignement(operations,seq1,seq2):
+    # Alignement au format de recallback à partir des opérations 0
+    # (match), 1 (gap dans seq1) et 2 (gap dans seq2), de la fin vers le début
+    alignement = []
+    i = len(seq1)
+    j = len(seq2)
+    for operation in operations.tolist():
+        if (operation==0):
+            alignement.append((seq1[i-1],seq2[j-1]))
+            i -= 1
+            j -= 1
+        elif (operation==1):
+            alignement.append(("-",seq2[j-1]))
+            j -= 1
+        else:
+            alignement.append((seq1[i-1],"-"))
+            i -= 1
+    return(alignement)
+
+def retourSimpleJit(directions,seq1,seq2):
+    ''' Premier alignement optimal (le premier de iterRecallbackNumpy).'''
+    operations = np.empty(sum(directions.shape), dtype=np.uint8)
+    n = retourSimple(directions,operations)
+    return(operationsVersAlignement(operations[:n],seq1.upper(),seq2.upper()))
+
+def retourAffineJit(finaux,codes,seq1,seq2):
+    ''' Premier alignement optimal (le premier de iterRecallbackAffineNumpy).'''
+    operations = np.empty(sum(codes.shape), dtype=np.uint8)
+    n = retourAffine(codes,list(finaux).index(max(finaux)),operations)
+    return(operationsVersAlignement(operations[:n],seq1.upper(),seq2.upper()))
+
+# Nombre de cases au-delà duquel les alignements passent en espace
+# linéaire (environ 10 octets par case pour le moteur simple)
+CASES_MAX = 10**7
+
+def alignementSimpleAuto(seq1,seq2,d,cost=costmat):
+    ''' Un alignement optimal de l'algorithme simple, par le meilleur
+        moteur disponible. Renvoie le couple (score, alignement),
+        l'alignement étant au format de recallback.'''
+    seq1 = seq1.upper()
+    seq2 = seq2.upper()
+    if ((len(seq1)+1)*(len(seq2)+1)>CASES_MAX):
+        return(alignementHirschberg(seq1,seq2,d,cost))
+    if (JIT):
+        scores, directions = alignementSimpleJit(seq1,seq2,d,cost)
+        return(int(scores[-1,-1]), retourSimpleJit(directions,seq1,seq2))
+    scores, directions = alignementSimpleNumpy(seq1,seq2,d,cost)
+    return(int(scores[-1,-1]), next(iterRecallbackNumpy(directions,seq1,seq2,1)))
+
+def alignementAffineAuto(seq1,seq2,d,k,cost=costmat):
+    ''' Equivalent de alignementSimpleAuto pour l'algorithme affine.'''
+    seq1 = seq1.upper()
+    seq2 = seq2.upper()
+    if (not seq1 and not seq2):
+        return(0, [])
+    if ((len(seq1)+1)*(len(seq2)+1)>CASES_MAX):
+        return(alignementMyersMiller(seq1,seq2,d,k,cost))
+    if (JIT):
+        finaux, codes = alignementAffineJit(seq1,seq2,d,k,cost)
+        return(max(finaux), retourAffineJit(finaux,codes,seq1,seq2))
+    finaux, codes = alignementAffineNumpy(seq1,seq2,d,k,cost)
+    return(int(max(finaux)), next(iterRecallbackAffineNumpy(finaux,codes,seq1,seq2,1)))
@@ -0,0 +1,249 @@
+import numpy as np
+
+from .initialisation import costmat
+from .vectoriel import compilerCostmat, encoderSequence
+
+######################################################################
+# Mode Hirschberg (espace linéaire)                                  #
+#                                                                    #
+# Diviser pour régner: la ligne du milieu de la séquence verticale   #
+# est alignée grâce aux scores de la moitié haute (calculés de haut  #
+# en bas) et de la moitié basse (calculés de bas en haut), puis les  #
+# deux moitiés sont alignées récursivement. On ne garde jamais plus  #
+# de deux lignes de scores, de la taille de la plus petite séquence. #
+# On ne récupère qu'un seul alignement optimal.                      #
+######################################################################
+
+# Les alignements sont construits sous forme d'une liste d'opérations:
+# 'M' (match / mismatch), 'V' (gap dans la séquence horizontale) et
+# 'H' (gap dans la séquence verticale).
+
+def preparerLineaire(seq1,seq2,cost):
+    # Codage des séquences et choix de la plus courte comme séquence
+    # horizontale, qui fixe la taille des lignes de scores.
+    # profil[c][j] est le score du résidu vertical de code c contre
+    # le j-ième résidu horizontal.
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    if (len(code1) <= len(code2)):
+        profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+        return(code2, profil, False)
+    profil = np.ascontiguousarray(dense[:,code2], dtype=np.int64)
+    return(code1, profil, True)
+
+def opsVersAlignement(ops,seq1,seq2,inverse):
+    # Conversion des opérations en alignement au format de recallback
+    # (liste de couples (seq1, seq2) de la fin vers le début).
+    if (inverse):
+        horizontale, verticale = seq2, seq1
+    else:
+        horizontale, verticale = seq1, seq2
+    alignement=[]
+    i=j=0
+    for op in ops:
+        if (op=='M'):
+            colonne=(horizontale[j],verticale[i])
+            i+=1
+            j+=1
+        elif (op=='V'):
+            colonne=("-",verticale[i])
+            i+=1
+        else:
+            colonne=(horizontale[j],"-")
+            j+=1
+        if (inverse):
+            colonne=(colonne[1],colonne[0])
+        alignement.append(colonne)
+    alignement.reverse()
+    return(alignement)
+
+def scoreAlignement(alignement,d,k=None,cost=costmat):
+    ''' Score d'un alignement au format de recallback. Sans k, chaque
+        gap coûte d. Avec k, un gap de longueur L coûte d + L*k.'''
+    score=0
+    precedent=None
+    for a,b in alignement:
+        if (a!="-" and b!="-"):
+            score+=cost[a][b]
+            precedent=None
+        else:
+            type_gap= 1 if a=="-" else 2
+            if (k is None):
+                score+=d
+            elif (type_gap==precedent):
+                score+=k
+            else:
+                score+=d+k
+            precedent=type_gap
+    return(score)
+
+def ligneScoresSimple(codeV,profil,d,controle=None):
+    # Dernière ligne de scores de l'algorithme simple entre la séquence
+    # verticale codeV et la séquence horizontale décrite par profil.
+    # Le calcul se fait sur le dernier axe: un profil de forme
+    # (A, nombre de cibles, n) calcule plusieurs lignes à la fois.
+    # controle(j, 0, [ligne]), optionnel, est appelé après chaque ligne
+    # (voir arret.py): s'il renvoie True, le calcul s'arrête et on
+    # renvoie None.
+    n= profil.shape[-1]
+    gaps= d*np.arange(n+1, dtype=np.int64)
+    ligne= np.broadcast_to(gaps, profil.shape[1:-1]+(n+1,)).copy()
+    for numero,c in enumerate(codeV,1):
+        suivante= np.empty_like(ligne)
+        suivante[...,0]= numero*d
+        np.maximum(ligne[...,:-1]+profil[c], ligne[...,1:]+d, out=suivante[...,1:])
+        ligne= np.maximum.accumulate(suivante-gaps, axis=-1)+gaps
+        if (controle is not None and controle(numero,0,[ligne])):
+            return(None)
+    return(ligne)
+
+def hirschberg(codeV,profil,d,i0,i1,j0,j1,ops):
+    M= i1-i0
+    N= j1-j0
+    if (M==0):
+        ops.extend('H'*N)
+        return
+    if (N==0):
+        ops.extend('V'*M)
+        return
+    if (M==1):
+        # Un seul résidu vertical: il est aligné avec le meilleur
+        # résidu horizontal, ou mis en face d'un gap.
+        sub= profil[codeV[i0],j0:j1]
+        j= int(np.argmax(sub))
+        if (sub[j]+(N-1)*d >= (N+1)*d):
+            ops.extend('H'*j+'M'+'H'*(N-1-j))
+        else:
+            ops.extend('V'+'H'*N)
+        return
+    
+    milieu= i0+M//2
+    haut= ligneScoresSimple(codeV[i0:milieu], profil[:,j0:j1], d)
+    bas= ligneScoresSimple(codeV[milieu:i1][::-1], profil[:,j0:j1][:,::-1], d)
+    coupure= j0+int(np.argmax(haut+bas[::-1]))
+    
+    hirschberg(codeV,profil,d,i0,milieu,j0,coupure,ops)
+    hirschberg(codeV,profil,d,milieu,i1,coupure,j1,ops)
+
+def alignementHirschberg(seq1,seq2,d,cost=costmat):
+    ''' Un alignement optimal de l'algorithme simple en espace linéaire.
+        Renvoie le couple (score, alignement), l'alignement étant au
+        format de recallback.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+    ops=[]
+    hirschberg(codeV,profil,d,0,len(codeV),0,profil.shape[1],ops)
+    alignement= opsVersAlignement(ops,seq1,seq2,inverse)
+    return(scoreAlignement(alignement,d,None,cost), alignement)
+
+
+######################################################################
+# Mode Myers-Miller (espace linéaire avec gap affine)                #
+#                                                                    #
+# Même principe que le mode Hirschberg, mais on garde pour chaque    #
+# ligne deux tableaux: CC (meilleur score) et DD (meilleur score     #
+# finissant par un gap vertical). Un gap vertical peut traverser la  #
+# ligne du milieu: dans ce cas son ouverture ne doit être comptée    #
+# qu'une seule fois, ce que permettent les coûts d'ouverture tb et   #
+# te (d ou 0) des gaps verticaux en début et en fin de sous-problème.#
+######################################################################
+
+def ligneScoresAffine(codeV,profil,d,k,tb,controle=None):
+    # Dernières lignes CC et DD de l'algorithme affine entre codeV et
+    # la séquence horizontale décrite par profil. tb est le coût
+    # d'ouverture d'un gap vertical commençant en haut à gauche.
+    # Comme pour ligneScoresSimple, le calcul se fait sur le dernier axe
+    # et controle(j, 0, [CC, DD]) peut l'arrêter (on renvoie alors None).
+    # d, k et tb peuvent être des tableaux (réglages, 1): un calcul par
+    # réglage sur l'avant-dernier axe (voir grille.py).
+    n= profil.shape[-1]
+    colonnes= np.arange(n+1, dtype=np.int64)
+    premiere= d+k*colonnes
+    premiere[...,0]= 0
+    CC= np.broadcast_to(premiere, np.broadcast_shapes(premiere.shape, profil.shape[1:-1]+(n+1,))).copy()
+    DD= CC+d
+    for numero,c in enumerate(codeV,1):
+        DD= np.maximum(DD, CC+d)+k
+        suivante= np.empty_like(CC)
+        suivante[...,:1]= tb+k*numero
+        DD[...,0]= suivante[...,0]
+        np.maximum(DD[...,1:], CC[...,:-1]+profil[c], out=suivante[...,1:])
+        # Gap horizontal: e[j] = max_t<j( c[t] + d + (j-t)*k ), ce qui
+        # se ramène à un maximum cumulé (d<=0, prolonger ne coûte pas
+        # plus que rouvrir).
+        gauche= k*colonnes[1:]+d+np.maximum.accumulate(suivante[...,:-1]-k*colonnes[:-1], axis=-1)
+        np.maximum(suivante[...,1:], gauche, out=suivante[...,1:])
+        CC= suivante
+        if (controle is not None and controle(numero,0,[CC,DD])):
+            return(None)
+    return(CC, DD)
+
+def gapAffine(longueur,d,k):
+    if (longueur==0):
+        return(0)
+    return(d+k*longueur)
+
+def myersMiller(codeV,profil,d,k,i0,i1,j0,j1,tb,te,ops):
+    M= i1-i0
+    N= j1-j0
+    if (N==0):
+        ops.extend('V'*M)
+        return
+    if (M==0):
+        ops.extend('H'*N)
+        return
+    if (M==1):
+        # Soit le résidu vertical est mis en face d'un gap (qui peut
+        # prolonger le gap vertical du début ou de la fin), soit il est
+        # aligné avec le meilleur résidu horizontal.
+        sub= profil[codeV[i0],j0:j1]
+        meilleur= max(tb,te)+k+gapAffine(N,d,k)
+        choix= None
+        for j in range(N):
+            score= gapAffine(j,d,k)+sub[j]+gapAffine(N-1-j,d,k)
+            if (score>=meilleur):
+                meilleur= score
+                choix= j
+        if (choix is not None):
+            ops.extend('H'*choix+'M'+'H'*(N-1-choix))
+        elif (tb>=te):
+            ops.extend('V'+'H'*N)
+        else:
+            ops.extend('H'*N+'V')
+        return
+    
+    milieu= i0+M//2
+    CC, DD= ligneScoresAffine(codeV[i0:milieu], profil[:,j0:j1], d, k, tb)
+    RR, SS= ligneScoresAffine(codeV[milieu:i1][::-1], profil[:,j0:j1][:,::-1], d, k, te)
+    type1= CC+RR[::-1]
+    type2= DD+SS[::-1]-d
+    coupure1= int(np.argmax(type1))
+    coupure2= int(np.argmax(type2))
+    
+    if (type1[coupure1]>=type2[coupure2]):
+        # Le chemin passe par (milieu, coupure)
+        coupure= j0+coupure1
+        myersMiller(codeV,profil,d,k,i0,milieu,j0,coupure,tb,d,ops)
+        myersMiller(codeV,profil,d,k,milieu,i1,coupure,j1,d,te,ops)
+    else:
+        # Un gap vertical traverse la ligne du milieu: les résidus
+        # milieu-1 et milieu sont face à des gaps, et les deux
+        # sous-problèmes prolongent ce gap (ouverture à 0).
+        coupure= j0+coupure2
+        myersMiller(codeV,profil,d,k,i0,milieu-1,j0,coupure,tb,0,ops)
+        ops.extend('VV')
+        myersMiller(codeV,profil,d,k,milieu+1,i1,coupure,j1,0,te,ops)
+
+def alignementMyersMiller(seq1,seq2,d,k,cost=costmat):
+    ''' Un alignement optimal de l'algorithme affine en espace linéaire.
+        Renvoie le couple (score, alignement), l'alignement étant au
+        format de recallback.'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+    ops=[]
+    myersMiller(codeV,profil,d,k,0,len(codeV),0,profil.shape[1],d,d,ops)
+    alignement= opsVersAlignement(ops,seq1,seq2,inverse)
+    return(scoreAlignement(alignement,d,k,cost), alignement)
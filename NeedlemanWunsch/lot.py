@@ -0,0 +1,142 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from .initialisation import costmat, d, k
+from .cache import cacheAlignement
+from .instrumentation import activerMesures, mesures
+from .jit import alignementAffineAuto, alignementSimpleAuto
+from .score import scoreAffine, scoreSimple
+
+######################################################################
+#                                                                    #
+#            Alignement par lots sur plusieurs processus             #
+#                                                                    #
+# Les paires (id1, seq1, id2, seq2) sont regroupées en blocs qui     #
+# sont répartis sur un ProcessPoolExecutor. Les paramètres communs   #
+# (schéma, d, k, matrice de score) sont envoyés une seule fois à     #
+# chaque processus, à son initialisation, et non avec chaque bloc.   #
+# Si les mesures sont actives, chaque bloc revient avec les mesures  #
+# de son processus, ajoutées à celles du processus principal.        #
+# Pour borner la mémoire, seul un nombre limité de blocs est en      #
+# cours de calcul à un instant donné.                                #
+#                                                                    #
+######################################################################
+
+# Paramètres du processus courant, fixés par initialiserTravailleur:
+# la fonction d'alignement, ses paramètres après les deux séquences et
+# le mode score seul.
+parametresLot = None
+
+# Cache du processus de calcul (None sans cache)
+cacheLot = None
+
+def choisirFonction(schema,score_seul,d,k,cost):
+    # Fonction d'alignement du schéma et ses paramètres après les deux
+    # séquences (le moteur des alignements est choisi par jit.py)
+    if (schema=="simple"):
+        return(scoreSimple if score_seul else alignementSimpleAuto, (d,cost))
+    if (schema=="affine"):
+        return(scoreAffine if score_seul else alignementAffineAuto, (d,k,cost))
+    raise ValueError("Schéma inconnu: "+str(schema))
+
+def initialiserTravailleur(schema,score_seul,d,k,cost,cache=None,mesurer=False):
+    # cache est un cacheAlignement (processus courant) ou, dans un
+    # processus de calcul, le couple (taille, chemin): chaque processus
+    # ouvre son propre cache, une connexion SQLite ne devant pas être
+    # partagée après un fork.
+    global parametresLot, cacheLot
+    if (mesurer):
+        activerMesures()
+    fonction,parametres = choisirFonction(schema,score_seul,d,k,cost)
+    if (isinstance(cache,tuple)):
+        cache = cacheAlignement(*cache)
+    cacheLot = cache
+    if (cache is not None):
+        fonction = cache.memoiser(fonction)
+    parametresLot = (fonction,parametres,score_seul)
+
+def alignerPaire(id1,seq1,id2,seq2):
+    # Alignement d'une paire avec les paramètres du processus.
+    # Le résultat est (id1, id2, score, alignement), l'alignement (un
+    # alignement optimal au format de recallback) valant None en mode
+    # score seul.
+    fonction,parametres,score_seul = parametresLot
+    mesures.compter("lot.paires")
+    mesures.compter("lot.cellules",len(seq1)*len(seq2))
+    with mesures.phase("lot.alignement"):
+        if (score_seul):
+            return((id1,id2,fonction(seq1,seq2,*parametres),None))
+        score,alignement = fonction(seq1,seq2,*parametres)
+    return((id1,id2,score,alignement))
+
+def alignerBloc(bloc):
+    # Résultats du bloc, mesures et compteurs du cache du processus
+    # depuis le bloc précédent
+    resultats = [alignerPaire(*paire) for paire in bloc]
+    compteurs = None if cacheLot is None else cacheLot.extraireCompteurs()
+    return(resultats, mesures.extraire(), compteurs)
+
+def resultatsBloc(futur,cache):
+    resultats,mesures_bloc,compteurs = futur.result()
+    mesures.fusionner(mesures_bloc)
+    if (compteurs is not None):
+        cache.fusionnerCompteurs(compteurs)
+    return(resultats)
+
+def alignerLot(paires,schema="simple",d=d,k=k,cost=costmat,score_seul=True,
+               processus=None,taille_bloc=64,ordre=True,cache=None):
+    ''' Générateur des résultats (id1, id2, score, alignement) pour un
+        itérable de paires (id1, seq1, id2, seq2), lu au fur et à mesure.
+        schema vaut "simple" ou "affine". Avec ordre=True les résultats
+        sortent dans l'ordre des paires, sinon dans l'ordre de fin de
+        calcul. processus=1 calcule tout dans le processus courant.
+        cache (un cacheAlignement) est optionnel: avec plusieurs
+        processus, chacun a son propre niveau mémoire et seul le niveau
+        disque est partagé; leurs compteurs sont ajoutés à ceux de
+        cache.'''
+    paires = iter(paires)
+    blocs = iter(lambda: list(islice(paires,taille_bloc)), [])
+    
+    if (processus==1):
+        initialiserTravailleur(schema,score_seul,d,k,cost,cache)
+        for bloc in blocs:
+            yield from (alignerPaire(*paire) for paire in bloc)
+        return
+    
+    processus = processus or os.cpu_count() or 1
+    configuration = None
+    if (cache is not None):
+        configuration = (cache.taille,cache.chemin)
+        # Les niveaux mémoire des processus d'un lot précédent n'existent plus
+        cache.tailles_processus = {}
+    with ProcessPoolExecutor(max_workers=processus,
+                             initializer=initialiserTravailleur,
+                             initargs=(schema,score_seul,d,k,cost,configuration,
+                                       mesures.actif)) as pool:
+        limite = 2*processus
+        en_cours = deque()
+        for bloc in blocs:
+            en_cours.append(pool.submit(alignerBloc,bloc))
+            if (len(en_cours)<limite):
+                continue
+            # Nombre maximum de blocs atteint: on attend des résultats
+            if (ordre):
+                yield from resultatsBloc(en_cours.popleft(),cache)
+            else:
+                finis,restants = wait(en_cours,return_when=FIRST_COMPLETED)
+                en_cours = deque(restants)
+                for futur in finis:
+                    yield from resultatsBloc(futur,cache)
+        
+        # Vidage des derniers blocs
+        if (ordre):
+            while en_cours:
+                yield from resultatsBloc(en_cours.popleft(),cache)
+        else:
+            while en_cours:
+                finis,restants = wait(en_cours,return_when=FIRST_COMPLETED)
+                en_cours = deque(restants)
+                for futur in finis:
+                    yield from resultatsBloc(futur,cache)
@@ -0,0 +1,153 @@
+import numpy as np
+
+from .initialisation import costmat
+from .jit import alignementAffineAuto, alignementSimpleAuto
+from .vectoriel import compilerCostmat, encoderSequence
+
+######################################################################
+#                                                                    #
+#             Alignement local et alignement semi-global             #
+#                                                                    #
+# Smith-Waterman (local): les scores sont planchers à 0 et le        #
+# meilleur alignement peut finir dans n'importe quelle case.         #
+#                                                                    #
+# Semi-global: les gaps en début et en fin de chaque séquence        #
+# peuvent être gratuits. debut1 / fin1 rendent gratuits les résidus  #
+# non alignés au début / à la fin de la séquence 1 (idem pour la     #
+# séquence 2). Par exemple:                                          #
+#  - debut2=fin2=True: la séquence 1 (une lecture) est alignée en    #
+#    entier à l'intérieur de la séquence 2 (une référence);          #
+#  - les quatre à True: chevauchement (overlap) des deux séquences.  #
+#                                                                    #
+# Le remplissage se fait ligne par ligne comme pour scoreSimple et   #
+# scoreAffine (k=None pour les gaps linéaires). La fin du meilleur   #
+# alignement est trouvée pendant le remplissage, puis son début par  #
+# un second passage sur les préfixes retournés, ancré sur cette fin. #
+# Les coordonnées sont des couples (i, j) de positions dans seq1 et  #
+# seq2: l'alignement porte sur seq1[debut[0]:fin[0]] et              #
+# seq2[debut[1]:fin[1]].                                             #
+#                                                                    #
+######################################################################
+
+def lignesModes(code2,profil,d,k,libre1,libre2,local):
+    # Générateur des lignes (j, scores) de la matrice entre la séquence 1
+    # (horizontale, décrite par profil) et la séquence 2 (code2).
+    # libre1 / libre2: début gratuit de la séquence 1 / 2.
+    n = profil.shape[1]
+    colonnes = np.arange(n+1, dtype=np.int64)
+    if (k is None):
+        ligne = np.zeros(n+1, dtype=np.int64) if (libre1 or local) else d*colonnes
+        yield(0, ligne)
+        for j,c in enumerate(code2,1):
+            candidat = np.empty(n+1, dtype=np.int64)
+            candidat[0] = 0 if (libre2 or local) else j*d
+            np.maximum(ligne[:-1]+profil[c], ligne[1:]+d, out=candidat[1:])
+            if (local):
+                np.maximum(candidat, 0, out=candidat)
+            ligne = np.maximum.accumulate(candidat-d*colonnes)+d*colonnes
+            yield(j, ligne)
+        return
+
+    # Gap affine: mêmes lignes CC / DD que ligneScoresAffine
+    if (libre1 or local):
+        CC = np.zeros(n+1, dtype=np.int64)
+    else:
+        CC = d+k*colonnes
+        CC[0] = 0
+    DD = CC+d
+    yield(0, CC)
+    for j,c in enumerate(code2,1):
+        DD = np.maximum(DD, CC+d)+k
+        suivante = np.empty(n+1, dtype=np.int64)
+        suivante[0] = 0 if (libre2 or local) else d+k*j
+        np.maximum(DD[1:], CC[:-1]+profil[c], out=suivante[1:])
+        if (local):
+            np.maximum(suivante, 0, out=suivante)
+        gauche = k*colonnes[1:]+d+np.maximum.accumulate(suivante[:-1]-k*colonnes[:-1])
+        np.maximum(suivante[1:], gauche, out=suivante[1:])
+        CC = suivante
+        yield(j, CC)
+
+def meilleureFin(code1,code2,dense,d,k,libres,local,partout=None):
+    # Meilleur score et case (i, j) où finit l'alignement optimal.
+    # libres = (debut1, fin1, debut2, fin2). partout (par défaut égal
+    # à local) permet de finir dans n'importe quelle case.
+    if (partout is None):
+        partout = local
+    debut1, fin1, debut2, fin2 = libres
+    l1 = len(code1)
+    l2 = len(code2)
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    meilleur = None
+    for j,ligne in lignesModes(code2,profil,d,k,debut1,debut2,local):
+        candidats = []
+        if (partout or (fin1 and j==l2)):
+            i = int(np.argmax(ligne))
+            candidats.append((int(ligne[i]), i))
+        if (fin2 or j==l2):
+            candidats.append((int(ligne[l1]), l1))
+        for score,i in candidats:
+            if (meilleur is None or score>meilleur[0]):
+                meilleur = (score, i, j)
+    return(meilleur)
+
+def coordonneesModes(seq1,seq2,d,k,cost,libres,local):
+    # Score, début et fin du meilleur alignement, sans matrice complète
+    seq1 = seq1.upper()
+    seq2 = seq2.upper()
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    score, i1, j1 = meilleureFin(code1,code2,dense,d,k,libres,local)
+
+    # Second passage sur les préfixes retournés, ancré en (i1, j1): le
+    # début libre devient une fin libre. En local, le début peut être
+    # n'importe quelle case, mais sans plancher à 0 pour rester ancré.
+    debut1, fin1, debut2, fin2 = libres
+    retour = (False, debut1, False, debut2)
+    score_retour, i, j = meilleureFin(code1[:i1][::-1],code2[:j1][::-1],dense,d,k,retour,False,local)
+    if (score_retour!=score):
+        raise RuntimeError("Le passage retour ne retrouve pas le score "+str(score)
+                           +" ("+str(score_retour)+")")
+    return(score, (i1-i, j1-j), (i1, j1))
+
+def scoreLocal(seq1,seq2,d,k=None,cost=costmat):
+    ''' Score de Smith-Waterman, avec les coordonnées (i, j) du début et
+        de la fin du meilleur alignement local: (score, debut, fin).
+        Sans k les gaps coûtent d, avec k un gap de longueur L coûte
+        d + L*k.'''
+    return(coordonneesModes(seq1,seq2,d,k,cost,(True,True,True,True),True))
+
+def scoreSemiGlobal(seq1,seq2,d,k=None,cost=costmat,debut1=True,fin1=True,debut2=True,fin2=True):
+    ''' Score semi-global (gaps gratuits aux extrémités choisies), avec
+        les coordonnées du début et de la fin: (score, debut, fin).'''
+    return(coordonneesModes(seq1,seq2,d,k,cost,(debut1,fin1,debut2,fin2),False))
+
+def alignementRegion(seq1,seq2,d,k,cost,score,debut,fin):
+    # La région entre debut et fin est alignée globalement (moteur
+    # choisi par jit.py): son score global est exactement le meilleur
+    # score.
+    region1 = seq1[debut[0]:fin[0]]
+    region2 = seq2[debut[1]:fin[1]]
+    if (k is None):
+        score_region, alignement = alignementSimpleAuto(region1,region2,d,cost)
+    else:
+        score_region, alignement = alignementAffineAuto(region1,region2,d,k,cost)
+    if (score_region!=score):
+        raise RuntimeError("L'alignement de la région ne retrouve pas le score "+str(score)
+                           +" ("+str(score_region)+")")
+    return((score, alignement, debut, fin))
+
+def alignementLocal(seq1,seq2,d,k=None,cost=costmat):
+    ''' Meilleur alignement local: (score, alignement, debut, fin),
+        l'alignement (au format de recallback) ne portant que sur la
+        région alignée.'''
+    score, debut, fin = scoreLocal(seq1,seq2,d,k,cost)
+    return(alignementRegion(seq1.upper(),seq2.upper(),d,k,cost,score,debut,fin))
+
+def alignementSemiGlobal(seq1,seq2,d,k=None,cost=costmat,debut1=True,fin1=True,debut2=True,fin2=True):
+    ''' Meilleur alignement semi-global: (score, alignement, debut, fin),
+        les résidus non alignés aux extrémités n'étant pas dans
+        l'alignement.'''
+    score, debut, fin = scoreSemiGlobal(seq1,seq2,d,k,cost,debut1,fin1,debut2,fin2)
+    return(alignementRegion(seq1.upper(),seq2.upper(),d,k,cost,score,debut,fin))
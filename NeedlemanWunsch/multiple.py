@@ -0,0 +1,206 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .balayage import profilRequete
+from .initialisation import costmat, d, k
+from .score import scoreAffine
+from .vectoriel import compilerCostmat, iterRecallbackAffineNumpy, remplirAffineNumpy
+
+######################################################################
+#                                                                    #
+#             Alignement multiple progressif (arbre guide)           #
+#                                                                    #
+# 1/ Matrice des distances: scores affines de toutes les paires par  #
+#    le calcul du score seul (profilRequete), une ligne de la        #
+#    matrice par tâche, réparties sur plusieurs processus. Avec un   #
+#    cacheAlignement, les scores sont cherchés puis gardés sous la   #
+#    même clé que scoreAffine mémoïsée (alignerLot avec cache): ils  #
+#    servent d'une exécution à l'autre. La distance de deux          #
+#    séquences vaut 1 - score / min(score de chacune contre          #
+#    elle-même), bornée à 0.                                         #
+#                                                                    #
+# 2/ Arbre guide, par UPGMA ou neighbor-joining: la liste des        #
+#    fusions (a, b), le noeud créé par la fusion t portant le numéro #
+#    n+t (les feuilles sont les séquences 0 à n-1).                  #
+#                                                                    #
+# 3/ Alignement progressif: les profils (blocs de séquences déjà     #
+#    alignées) sont fusionnés dans l'ordre de l'arbre. Deux colonnes #
+#    de profils ont pour score la moyenne de cost sur toutes les     #
+#    paires de résidus (les gaps ne comptent pas), multipliée par    #
+#    ECHELLE et arrondie pour rester en entiers; L colonnes de gaps  #
+#    insérées dans un profil coûtent d + L*k, multipliés par         #
+#    ECHELLE, comme dans alignementAffine. Deux profils d'une        #
+#    séquence chacun sont donc alignés comme par                     #
+#    alignementAffineNumpy.                                          #
+#                                                                    #
+######################################################################
+
+ECHELLE = 100
+
+def cleScore(cache,seq1,seq2,d,k,cost):
+    # Clé de scoreAffine(seq1,seq2,d,k,cost) mémoïsée par cache
+    return(cache.cle(scoreAffine.__module__+"."+scoreAffine.__qualname__,
+                     {"seq1":seq1,"seq2":seq2,"d":d,"k":k,"cost":cost}))
+
+def scoresLigne(requete,cibles,d,k,cost):
+    # Scores de la requête contre les cibles (tâche d'un processus)
+    return(profilRequete(requete,d,k,cost).scores(cibles))
+
+def matriceDistances(sequences,d=d,k=k,cost=costmat,processus=None,cache=None):
+    ''' Matrice (n, n) des distances entre les séquences, calculée à
+        partir des scores de alignementAffine (voir plus haut).
+        processus=1 calcule tout dans le processus courant; cache est
+        un cacheAlignement optionnel.'''
+    n = len(sequences)
+    sequences = [sequence.upper() for sequence in sequences]
+    scores = np.zeros((n,n), dtype=np.int64)
+    # Paires à calculer, par ligne: (i, j) pour j >= i
+    lignes = []
+    for i in range(n):
+        manquantes = []
+        for j in range(i,n):
+            score = None
+            if (cache is not None):
+                score = cache.obtenir(cleScore(cache,sequences[i],sequences[j],d,k,cost))
+            if (score is None):
+                manquantes.append(j)
+            else:
+                scores[i,j] = scores[j,i] = score
+        if manquantes:
+            lignes.append((i,manquantes))
+
+    def enregistrer(i,colonnes,resultats):
+        for j,score in zip(colonnes,resultats):
+            scores[i,j] = scores[j,i] = score
+            if (cache is not None):
+                cache.enregistrer(cleScore(cache,sequences[i],sequences[j],d,k,cost),score)
+
+    processus = processus or os.cpu_count() or 1
+    if (processus==1 or len(lignes)<2):
+        for i,colonnes in lignes:
+            enregistrer(i,colonnes,scoresLigne(sequences[i],[sequences[j] for j in colonnes],d,k,cost))
+    else:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            futurs = {pool.submit(scoresLigne,sequences[i],[sequences[j] for j in colonnes],d,k,cost):
+                      (i,colonnes) for i,colonnes in lignes}
+            for futur in as_completed(futurs):
+                enregistrer(*futurs[futur],futur.result())
+
+    propres = np.diag(scores)
+    minimums = np.minimum.outer(propres,propres)
+    with np.errstate(divide="ignore",invalid="ignore"):
+        distances = np.where(minimums>0, 1-scores/np.where(minimums>0,minimums,1), 1.0)
+    distances = np.maximum(distances,0.0)
+    np.fill_diagonal(distances,0.0)
+    return(distances)
+
+def arbreGuide(distances,methode="upgma"):
+    ''' Fusions de l'arbre guide (UPGMA ou neighbor-joining "nj") de la
+        matrice des distances: liste de couples (a, b) de noeuds, la
+        fusion t créant le noeud n+t.'''
+    if (methode not in ("upgma","nj")):
+        raise ValueError("Méthode inconnue: "+str(methode))
+    n = len(distances)
+    D = np.array(distances, dtype=np.float64)
+    noeuds = list(range(n))
+    tailles = np.ones(n)
+    actifs = np.ones(n, dtype=bool)
+    fusions = []
+    for t in range(n-1):
+        indices = np.flatnonzero(actifs)
+        sous = D[np.ix_(indices,indices)]
+        m = len(indices)
+        if (methode=="nj" and m>2):
+            sommes = sous.sum(axis=1)
+            critere = (m-2)*sous-sommes[:,np.newaxis]-sommes[np.newaxis,:]
+        else:
+            critere = sous.copy()
+        np.fill_diagonal(critere,np.inf)
+        a,b = divmod(int(np.argmin(critere)),m)
+        a,b = indices[min(a,b)],indices[max(a,b)]
+        fusions.append((noeuds[a],noeuds[b]))
+        # La ligne a devient celle du nouveau noeud, b est retirée
+        if (methode=="upgma"):
+            nouvelle = (D[a]*tailles[a]+D[b]*tailles[b])/(tailles[a]+tailles[b])
+        else:
+            nouvelle = (D[a]+D[b]-D[a,b])/2
+        D[a,:] = D[:,a] = nouvelle
+        D[a,a] = 0.0
+        tailles[a] += tailles[b]
+        actifs[b] = False
+        noeuds[a] = n+t
+    return(fusions)
+
+def newick(fusions,noms):
+    ''' Arbre guide au format Newick (sans longueurs de branches).'''
+    textes = list(noms)
+    for a,b in fusions:
+        textes.append("("+textes[a]+","+textes[b]+")")
+    return(textes[-1]+";")
+
+def fusionnerProfils(lignes1,lignes2,table,dense,d,k):
+    # Alignement de deux profils (tableaux (n, L) de codes ASCII, "-"
+    # pour les gaps): renvoie le profil fusionné (n1+n2, L)
+    n1,L1 = lignes1.shape
+    n2,L2 = lignes2.shape
+    gap = ord("-")
+    if (L1==0 or L2==0):
+        # Un profil vide: l'autre face à des gaps
+        operations = [("X","-")]*L1+[("-","X")]*L2
+    else:
+        frequences = []
+        for lignes in (lignes1,lignes2):
+            codes = table[lignes]
+            frequences.append(np.array([(codes==c).sum(axis=0) for c in range(len(dense))],
+                                       dtype=np.int64))
+        # sub[j][i]: score de la colonne j du profil 2 contre la colonne
+        # i du profil 1
+        somme = frequences[1].T @ dense.astype(np.int64) @ frequences[0]
+        sub = np.rint(ECHELLE*somme/(n1*n2)).astype(np.int64)
+        finaux, codes = remplirAffineNumpy(sub,np.arange(L2),d*ECHELLE,k*ECHELLE)
+        operations = next(iterRecallbackAffineNumpy(finaux,codes,"X"*L1,"X"*L2,1))[::-1]
+    # Colonne de chaque profil (-1: colonne de gaps ajoutée à la fin)
+    presents1 = np.array([a!="-" for a,b in operations], dtype=bool)
+    presents2 = np.array([b!="-" for a,b in operations], dtype=bool)
+    colonnes1 = np.where(presents1, np.cumsum(presents1)-1, -1)
+    colonnes2 = np.where(presents2, np.cumsum(presents2)-1, -1)
+    etendues1 = np.concatenate((lignes1, np.full((n1,1), gap, dtype=np.uint8)), axis=1)
+    etendues2 = np.concatenate((lignes2, np.full((n2,1), gap, dtype=np.uint8)), axis=1)
+    return(np.concatenate((etendues1[:,colonnes1], etendues2[:,colonnes2])))
+
+def versLignes(sequences):
+    # Profil (n, L) des séquences alignées (de même longueur)
+    return(np.array([np.frombuffer(sequence.upper().encode("ascii"), dtype=np.uint8)
+                     for sequence in sequences], dtype=np.uint8).reshape(len(sequences),-1))
+
+def alignerProfils(profil1,profil2,d=d,k=k,cost=costmat):
+    ''' Alignement de deux profils (listes de séquences alignées, "-"
+        pour les gaps): renvoie les séquences des deux profils, dans
+        l'ordre, alignées ensemble.'''
+    table, dense = compilerCostmat(cost)
+    fusion = fusionnerProfils(versLignes(profil1),versLignes(profil2),table,dense,d,k)
+    return([ligne.tobytes().decode("ascii") for ligne in fusion])
+
+def alignementMultiple(sequences,d=d,k=k,cost=costmat,methode="upgma",processus=None,cache=None):
+    ''' Alignement multiple progressif des séquences: renvoie les
+        séquences alignées (avec des "-"), dans l'ordre donné. methode
+        choisit l'arbre guide ("upgma" ou "nj"); processus et cache
+        servent au calcul des distances (voir matriceDistances).'''
+    n = len(sequences)
+    if (n==0):
+        return([])
+    table, dense = compilerCostmat(cost)
+    distances = matriceDistances(sequences,d,k,cost,processus,cache)
+    # Profils en cours: numéros des séquences et lignes alignées
+    profils = {i: ([i],versLignes([sequence])) for i,sequence in enumerate(sequences)}
+    for t,(a,b) in enumerate(arbreGuide(distances,methode)):
+        numeros1,lignes1 = profils.pop(a)
+        numeros2,lignes2 = profils.pop(b)
+        profils[n+t] = (numeros1+numeros2,fusionnerProfils(lignes1,lignes2,table,dense,d,k))
+    (numeros,lignes), = profils.values()
+    resultat = [None]*n
+    for numero,ligne in zip(numeros,lignes):
+        resultat[numero] = ligne.tobytes().decode("ascii")
+    return(resultat)
@@ -0,0 +1,192 @@
+from .initialisation import costmat, d, k
+from .simple import alignementSimple
+from .affine import alignementAffine
+from .affichage import compterAlignements, iterRecallback, printMatrices, printSequence
+
+# Lettres de la matrice de score (majuscules et minuscules), pour
+# valider les séquences saisies sans charger NumPy
+lettres=frozenset("".join(costmat).upper()+"".join(costmat).lower())
+
+def sequenceValide(sequence):
+    return(len(sequence)>0 and lettres.issuperset(sequence))
+
+# Procédure de recherche et d'affichage de l'alignement optimal
+
+def lancerAlignementSimple(s1="42",s2="42"):
+    global costmat,d
+    print("Alignement simple")
+    while (not sequenceValide(s1) or not sequenceValide(s2)):
+        s1=input("Entrez la première séquence: \n")
+        s2=input("Entrez la seconde séquence: \n")
+
+    print("\nLes séquences qui seront alignées sont:\n")
+    print("Séquence 1: "+s1+"\nSéquence 2: "+s2+"\n")
+    print(" Score de gap d = " +str(d))
+    print("\n Matrice d'alignement\n")
+    resultat=alignementSimple(s1,s2,d,costmat)
+    for line in resultat:
+        l=""
+        for objects in line:
+            l+="% 5d" % objects.score
+        print(l)
+    print("\n")
+    print("Le meilleur score d'alignement est: "+str(resultat[-1][-1].score))
+    print("Nombre d'alignements optimaux: "+str(compterAlignements(resultat[-1][-1])))
+    # on lance le retour sur trace depuis le coin en bas à droite
+    printSequence(iterRecallback(resultat[-1][-1]))
+
+
+# Procédure de recherche et d'affichage de l'alignement optimal
+# pour la méthode avec gap affine
+# Par défaut, les valeurs s1 et s2 sont invalide.
+# Si on ne passe pas de paramètre, un couple de séquence
+# valide sera demandé.
+
+def lancerAlignementAffine(s1="42",s2="42"):
+    # les couts sont des valeurs globales
+    global costmat,d,k 
+    
+    print(" Alignement Affine")
+    while (not sequenceValide(s1) or not sequenceValide(s2)):
+        s1=input("Entrez la première séquence: \n")
+        s2=input("Entrez la seconde séquence: \n")
+    
+    print("\nLes séquences qui seront alignées sont:\n")
+    print("Séquence 1: "+s1+"\nSéquence 2: "+s2+"\n")
+    print(" Score de gap d = " +str(d))
+    print(" et k = " +str(k))
+    print("\n Matrices d'alignement\n")
+    
+    resultat=alignementAffine(s1,s2,d,k,costmat)
+    printMatrices(resultat)
+    maximum=max( [ resultat[0][-1][-1].score,
+                resultat[1][-1][-1].score,
+                resultat[2][-1][-1].score ] )
+    print("Le meilleur score est: "+str(maximum))
+    # on lance le retour sur trace à partir du meilleur
+    # node terminal (test entre chaques matrice)
+    depart=[]
+    for i in range(3):
+        if(resultat[i][-1][-1].score==maximum):
+            depart.append(resultat[i][-1][-1])
+    print("Nombre d'alignements optimaux: "+str(sum(compterAlignements(n) for n in depart)))
+    # parcours depuis les meilleurs noeuds
+    for node in depart:
+        printSequence(iterRecallback(node))
+        
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+  ####      #
+  #        #           Procédure
+  ###     #                      de
+     #   #                          Test
+  ###   #
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def lancerTest():
+    print("##################################################################")
+    print("#                                                                #")
+    print("#                       -=~ TESTS ~=-                            #")
+    print("#                                                                #")
+    print("##################################################################")
+    
+    # Les première séquences testée viennent de l'exercice 6 du TD
+    # Ici, ce sont les séquences 1 et 2.
+    # Le résultat est supposé être un alignement simple avec un score finale de 3
+    # et l'alignement suivant:
+    #   TACGATGA
+    #   TCCGAT-A
+    print(" TEST N° 1")
+    print("Test des séquences S1 et S2 de l'exercice 6 du TD, NW simple")
+    print("Alignement attendu: ")
+    print("TACGATGA")
+    print("TCCGAT-A")
+    print("Test: \n")
+    
+    s1="TACGATGA"
+    s2="TCCGATA"
+    lancerAlignementSimple(s1,s2)
+
+    print(" \nTEST N° 2")
+    print("Test des séquences S2 et S3 de l'exercice 6 du TD, NW simple")
+    print("De multiples alignements doivent être trouvés")
+    print("\n")
+    # Sequences 3 et 4 du TD, comprenant des alignements optimaux multiples
+    # Le programme se chargera de retrouver ces alignements et de les afficher
+    s3="ACGACGA"
+    lancerAlignementSimple(s2,s3)
+    
+    print(" \nTEST N° 3")
+    print("Test sur l'alignement gap affine")
+    print("Séquence TTATT vs TT, doit donner soit:")
+    print("TT---, soit ---TT, soit T---T ")
+    print("C'est à dire toujours le gap le plus long possible.")
+    print("L'algorithme classique donnerai plus de réponses (mais moins probables).")
+    print("\n")
+    s1="TTATT"
+    s2="TT"
+    lancerAlignementAffine(s1,s2)
+    
+    print(" \nTEST N° 4")
+    print("Test des deux algorithme sur une séquence comportant la possibilité")
+    print("d'aligne soit un grand gap, soit de le couper en deux.")
+    print("Ce test doit donner un seul alignement possible pour la version affine")
+    print("et deux alignements pour la version simple (sans gestion du gap) ")
+    
+    print("\n")
+    s1="ATGTGACGA"
+    s2="ATACGA"
+    lancerAlignementAffine(s1,s2)
+    
+    print("\n")
+    lancerAlignementSimple(s1,s2)
+    
+    print("\n")
+    print(r"/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!\ ")
+    print("ATTENTION, le test génère beacoup de texte, remontez bien jusqu'en haut")
+    print(r"/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!/!\ ")
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #       #
+   #       #           
+  ###     #                   Menu
+ #   #   #       
+  ###   #
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def menu():
+    print("##################################################################")
+    print("#                                                                #")
+    print("#                      Needleman Wunsch                          #")
+    print("#                                                                #")
+    print("##################################################################")
+    print(""" Ce programme vous permettra d'aligner deux séquences d'ADN 
+          en utilisant l'algorithme de Needleman et Wunsch. Deux versions 
+          vous seront proposés ici: avec gap fixe, ou gap affine """)
+
+    # On stock les objets fonctions dans un dictionnaire
+    # Il n'y a pas de switch/case en python.
+    routine={'1':lancerAlignementSimple, '2':lancerAlignementAffine, '3':lancerTest}
+
+    # on continue tant qu'on a pas de demande pour quitter
+    continuer = True
+    while(continuer):
+        print("\n Veuillez selecionner l'algorithme que vous souhaitez utiliser")
+        print(" ou lancer des alignements de test")
+        choix="-1"
+        # véfification des inputs
+        while(choix not in ['1','2','3','0']):
+            print("1- Classique   2- Gap Affine  3- Tests ou 0- Quitter")
+            choix=input()
+        
+        # on quitte si l'utilisateur le demande
+        if (choix=='0'):
+            continuer=False
+            break
+        # on execute la fonction appropriée
+        routine[choix]()
+
+# Fin
+###################################################################################B
+#                           TGUgcHl0aG9uIGMnZXN0IHN5bXBh                           #
+#6#################################################################################4
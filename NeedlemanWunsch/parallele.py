@@ -0,0 +1,172 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .disque import remplirTuileAffine, remplirTuileSimple
+from .initialisation import costmat
+from .vectoriel import compilerCostmat, encoderSequence
+
+######################################################################
+#                                                                    #
+#          Remplissage parallèle d'une seule paire, par tuiles       #
+#                                                                    #
+# alignerLot répartit des paires entre processus, ce qui n'aide pas  #
+# quand une seule très grande paire domine. Ici la matrice d'une     #
+# paire est découpée en tuiles (comme dans disque.py): la tuile      #
+# (tj,ti) ne dépend que des tuiles (tj-1,ti) et (tj,ti-1), donc les  #
+# tuiles d'une même anti-diagonale tj+ti sont indépendantes. Chaque  #
+# tuile est confiée à un processus dès que ses deux voisines sont    #
+# finies (front d'onde).                                             #
+#                                                                    #
+# Les directions et les bords des tuiles sont en mémoire partagée    #
+# (multiprocessing.shared_memory), vus comme des tableaux numpy par  #
+# tous les processus: une tuile lit la dernière ligne de scores de   #
+# la tuile du dessus et la dernière colonne de celle de gauche, et   #
+# écrit ses directions et ses propres bords en place. Seuls les      #
+# numéros des tuiles passent par le pool.                            #
+#                                                                    #
+# Les directions (et les codes en affine) sont celles de             #
+# alignementSimpleNumpy et alignementAffineNumpy, recopiées hors de  #
+# la mémoire partagée à la fin du calcul.                            #
+#                                                                    #
+######################################################################
+
+# Paramètres du processus courant, fixés par initialiserTravailleur:
+# le schéma, les tableaux partagés (directions, lignes du bas et
+# colonnes de droite des tuiles), les données de l'alignement et les
+# segments de mémoire partagée à garder ouverts.
+parametresFront = None
+
+def tableauxPartages(memoires,hauteur,largeur,dtype,plans,taille_tuile):
+    # Vues numpy sur les trois segments de mémoire partagée: directions
+    # (hauteur, largeur), bas (lignes de tuiles, plans, largeur) et
+    # droite (colonnes de tuiles, plans, hauteur)
+    lignes = -(-hauteur//taille_tuile)
+    colonnes = -(-largeur//taille_tuile)
+    directions = np.ndarray((hauteur,largeur), dtype=dtype, buffer=memoires[0].buf)
+    bas = np.ndarray((lignes,plans,largeur), dtype=np.int64, buffer=memoires[1].buf)
+    droite = np.ndarray((colonnes,plans,hauteur), dtype=np.int64, buffer=memoires[2].buf)
+    return(directions,bas,droite)
+
+def initialiserTravailleur(schema,noms,code2,profil,d,k,taille_tuile):
+    global parametresFront
+    memoires = [shared_memory.SharedMemory(name=nom) for nom in noms]
+    hauteur,largeur = len(code2)+1,profil.shape[1]+1
+    dtype,plans = (np.uint8,1) if schema=="simple" else (np.uint16,3)
+    tableaux = tableauxPartages(memoires,hauteur,largeur,dtype,plans,taille_tuile)
+    parametresFront = (schema,tableaux,code2,profil,d,k,taille_tuile,memoires)
+
+def remplirTuile(tj,ti):
+    # Remplissage de la tuile (tj,ti) avec les paramètres du processus:
+    # les tuiles (tj-1,ti) et (tj,ti-1) sont finies
+    schema,(directions,bas,droite),code2,profil,d,k,T,_ = parametresFront
+    hauteur,largeur = directions.shape
+    j0,i0 = tj*T,ti*T
+    j1,i1 = min(j0+T,hauteur),min(i0+T,largeur)
+    plans = bas.shape[1]
+    dessus = np.zeros((plans,i1-i0+1), dtype=np.int64)
+    if (tj>0):
+        dessus[:,1:] = bas[tj-1,:,i0:i1]
+        if (ti>0):
+            dessus[:,0] = bas[tj-1,:,i0-1]
+    gauche = droite[ti-1,:,j0:j1] if ti>0 else None
+    tuile = directions[j0:j1,i0:i1]
+    if (schema=="simple"):
+        ligne,colonne = remplirTuileSimple(tuile,j0,i0,dessus[0],
+                                           None if gauche is None else gauche[0],code2,profil,d)
+    else:
+        ligne,colonne = remplirTuileAffine(tuile,j0,i0,dessus,gauche,code2,profil,d,k)
+    bas[tj,:,i0:i1] = ligne
+    droite[ti,:,j0:j1] = colonne
+
+def remplirFront(tuiles,soumettre,attendre):
+    # Parcours des tuiles en front d'onde: soumettre(tj,ti) lance une
+    # tuile, attendre() rend les tuiles finies depuis le dernier appel
+    lignes,colonnes = tuiles
+    restantes = {}
+    soumettre(0,0)
+    en_cours = 1
+    while en_cours:
+        for tj,ti in attendre():
+            en_cours -= 1
+            for suivante in ((tj+1,ti),(tj,ti+1)):
+                if (suivante[0]>=lignes or suivante[1]>=colonnes):
+                    continue
+                # Une tuile attend ses voisines du dessus et de gauche
+                attendues = (suivante[0]>0)+(suivante[1]>0)
+                restantes[suivante] = restantes.get(suivante,attendues)-1
+                if (restantes[suivante]==0):
+                    del restantes[suivante]
+                    soumettre(*suivante)
+                    en_cours += 1
+
+def alignementParallele(schema,seq1,seq2,d,k,cost,taille_tuile,processus):
+    # Remplissage commun aux deux schémas, renvoie la dernière ligne des
+    # scores (plans, l1+1) et une copie des directions
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    hauteur,largeur = len(code2)+1,len(code1)+1
+    dtype,plans = (np.uint8,1) if schema=="simple" else (np.uint16,3)
+    T = taille_tuile
+    tuiles = (-(-hauteur//T), -(-largeur//T))
+    tailles = (hauteur*largeur*np.dtype(dtype).itemsize,
+               tuiles[0]*plans*largeur*8, tuiles[1]*plans*hauteur*8)
+    memoires = [shared_memory.SharedMemory(create=True, size=max(taille,1)) for taille in tailles]
+    try:
+        processus = processus or os.cpu_count() or 1
+        if (processus==1):
+            global parametresFront
+            tableaux = tableauxPartages(memoires,hauteur,largeur,dtype,plans,T)
+            parametresFront = (schema,tableaux,code2,profil,d,k,T,None)
+            try:
+                for tj in range(tuiles[0]):
+                    for ti in range(tuiles[1]):
+                        remplirTuile(tj,ti)
+            finally:
+                parametresFront = None
+                del tableaux
+        else:
+            with ProcessPoolExecutor(max_workers=processus,
+                                     initializer=initialiserTravailleur,
+                                     initargs=(schema,[memoire.name for memoire in memoires],
+                                               code2,profil,d,k,T)) as pool:
+                futurs = {}
+                def soumettre(tj,ti):
+                    futurs[pool.submit(remplirTuile,tj,ti)] = (tj,ti)
+                def attendre():
+                    finis,_ = wait(futurs,return_when=FIRST_COMPLETED)
+                    for futur in finis:
+                        futur.result()
+                    return([futurs.pop(futur) for futur in finis])
+                remplirFront(tuiles,soumettre,attendre)
+        directions,bas,droite = tableauxPartages(memoires,hauteur,largeur,dtype,plans,T)
+        resultat = (bas[-1].copy(), directions.copy())
+        del directions,bas,droite
+        return(resultat)
+    finally:
+        # Suppression des segments avant leur fermeture: ils ne restent
+        # pas dans /dev/shm même si une vue empêche la fermeture
+        for memoire in memoires:
+            memoire.unlink()
+            memoire.close()
+
+def alignementSimpleParallele(seq1,seq2,d,cost=costmat,taille_tuile=2048,processus=None):
+    ''' Equivalent de alignementSimpleNumpy dont le remplissage est
+        réparti sur plusieurs processus (voir plus haut). Renvoie le
+        couple (score, directions), à parcourir avec iterRecallbackNumpy.
+        processus=1 remplit les tuiles dans le processus courant.'''
+    ligne, directions = alignementParallele("simple",seq1,seq2,d,0,cost,taille_tuile,processus)
+    return(int(ligne[0,-1]), directions)
+
+def alignementAffineParallele(seq1,seq2,d,k,cost=costmat,taille_tuile=2048,processus=None):
+    ''' Equivalent de alignementAffineNumpy dont le remplissage est
+        réparti sur plusieurs processus. Renvoie le couple (finaux,
+        codes), à parcourir avec iterRecallbackAffineNumpy.'''
+    ligne, codes = alignementParallele("affine",seq1,seq2,d,k,cost,taille_tuile,processus)
+    return(tuple(int(score) for score in ligne[:,-1]), codes)
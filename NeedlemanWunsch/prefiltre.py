@@ -0,0 +1,170 @@
+import json
+import os
+
+import numpy as np
+
+from .arret import alignementAffineBandeArret, alignementSimpleBandeArret
+from .initialisation import costmat, d, k
+from .vectoriel import compilerCostmat, encoderSequence
+
+######################################################################
+#                                                                    #
+#            Préfiltre par k-mers (graines et extension)             #
+#                                                                    #
+# Pour une requête contre une base, presque toutes les paires ont un #
+# mauvais score. On indexe donc les k-mers des cibles: chaque k-mer  #
+# est codé en un entier (ses codes en base A, la taille de           #
+# l'alphabet: 2 bits par lettre pour l'ADN), et l'index garde trois  #
+# tableaux triés par k-mer (valeur, cible, position), que l'on peut  #
+# sauver puis relire en mémoire partagée (np.load(mmap_mode="r")).   #
+#                                                                    #
+# Les k-mers de la requête trouvés dans l'index sont des graines,    #
+# repérées par leur cible et leur diagonale (position dans la        #
+# requête moins position dans la cible, comme i-j dans bande.py).    #
+# Les graines d'une cible sont enchaînées quand leurs diagonales     #
+# sont à moins de ecart l'une de l'autre: seules les cibles dont une #
+# chaîne a au moins graines_min graines sont alignées, en bande      #
+# autour des diagonales de leurs chaînes (la bande est ensuite       #
+# élargie si besoin, le score est donc exact).                       #
+#                                                                    #
+# Les k-mers trop fréquents (répétitions) sont ignorés: au delà de   #
+# occurrences_max, ils ne sont pas gardés dans l'index.              #
+#                                                                    #
+######################################################################
+
+def kmers(codes,taille,base):
+    # Valeurs des k-mers (de taille lettres) d'une suite de codes, dans
+    # l'ordre des positions
+    if (len(codes)<taille):
+        return(np.empty(0, dtype=np.int64))
+    puissances = base**np.arange(taille-1,-1,-1, dtype=np.int64)
+    fenetres = np.lib.stride_tricks.sliding_window_view(codes.astype(np.int64),taille)
+    return(fenetres@puissances)
+
+class indexKmers:
+    ''' Index des k-mers d'un ensemble de cibles (voir construireIndex
+        et chargerIndex).'''
+
+    def __init__(self,valeurs,cibles,positions,taille_kmer,base,table,nombre_cibles):
+        self.valeurs = valeurs
+        self.cibles = cibles
+        self.positions = positions
+        self.taille_kmer = taille_kmer
+        self.base = base
+        self.table = table
+        self.nombre_cibles = nombre_cibles
+
+    def __len__(self):
+        return(len(self.valeurs))
+
+    def sauver(self,chemin):
+        ''' Ecrit l'index dans le dossier chemin (relu par chargerIndex).'''
+        os.makedirs(chemin, exist_ok=True)
+        for nom in ("valeurs","cibles","positions","table"):
+            np.save(os.path.join(chemin,nom+".npy"), getattr(self,nom))
+        with open(os.path.join(chemin,"index.json"),"w") as fichier:
+            json.dump({"taille_kmer": self.taille_kmer, "base": self.base,
+                       "nombre_cibles": self.nombre_cibles}, fichier)
+
+    def graines(self,requete):
+        ''' Graines de la requête: tableaux (cible, diagonale, position
+            dans la requête) de ses k-mers présents dans l'index.'''
+        valeurs = kmers(encoderSequence(requete.upper(),self.table),self.taille_kmer,self.base)
+        gauche = np.searchsorted(self.valeurs,valeurs,"left")
+        nombres = np.searchsorted(self.valeurs,valeurs,"right")-gauche
+        # Une ligne par occurrence dans l'index de chaque k-mer de la requête
+        rang = np.repeat(np.arange(len(valeurs)),nombres)
+        premiers = np.cumsum(nombres)-nombres
+        indices = gauche[rang]+np.arange(len(rang))-premiers[rang]
+        return(np.asarray(self.cibles[indices], dtype=np.int64),
+               rang-np.asarray(self.positions[indices], dtype=np.int64), rang)
+
+    def candidats(self,requete,graines_min=4,ecart=16):
+        ''' Cibles retenues pour la requête: liste de (cible, diagonale
+            min, diagonale max, graines) triée par nombre de graines
+            décroissant, les diagonales couvrant les chaînes retenues.'''
+        cibles, diagonales, rang = self.graines(requete)
+        if (len(cibles)==0):
+            return([])
+        ordre = np.lexsort((diagonales,cibles))
+        cibles = cibles[ordre]
+        diagonales = diagonales[ordre]
+        # Une nouvelle chaîne commence à chaque changement de cible ou
+        # saut de diagonale de plus de ecart
+        nouvelle = np.ones(len(cibles), dtype=bool)
+        nouvelle[1:] = (cibles[1:]!=cibles[:-1]) | (diagonales[1:]-diagonales[:-1]>ecart)
+        debuts = np.flatnonzero(nouvelle)
+        tailles = np.diff(np.append(debuts,len(cibles)))
+        retenues = tailles>=graines_min
+        chaines = zip(cibles[debuts][retenues].tolist(),
+                      diagonales[debuts][retenues].tolist(),
+                      np.maximum.reduceat(diagonales,debuts)[retenues].tolist(),
+                      tailles[retenues].tolist())
+        resultat = {}
+        for cible,diagonale_min,diagonale_max,taille in chaines:
+            if (cible in resultat):
+                _,autre_min,autre_max,autre_taille = resultat[cible]
+                resultat[cible] = (cible,min(diagonale_min,autre_min),
+                                   max(diagonale_max,autre_max),max(taille,autre_taille))
+            else:
+                resultat[cible] = (cible,diagonale_min,diagonale_max,taille)
+        return(sorted(resultat.values(), key=lambda candidat: (-candidat[3],candidat[0])))
+
+def construireIndex(cibles,taille_kmer=11,cost=costmat,occurrences_max=1000):
+    ''' Index des k-mers (de taille_kmer lettres) des cibles (liste de
+        séquences), codés avec l'alphabet de la matrice de score.'''
+    table, dense = compilerCostmat(cost)
+    base = len(dense)
+    if (base**taille_kmer>=2**63):
+        raise ValueError("k-mers trop longs pour l'alphabet: "+str(taille_kmer))
+    codes = [encoderSequence(cible.upper(),table) for cible in cibles]
+    longueurs = np.array([len(code) for code in codes], dtype=np.int64)
+    # Les k-mers sont calculés sur la concaténation des cibles, puis ceux
+    # qui chevauchent deux cibles sont retirés.
+    tout = np.concatenate(codes) if codes else np.empty(0, dtype=np.uint8)
+    valeurs = kmers(tout,taille_kmer,base)
+    numeros = np.repeat(np.arange(len(codes), dtype=np.int32),longueurs)[:len(valeurs)]
+    positions = (np.arange(len(valeurs))-(np.cumsum(longueurs)-longueurs)[numeros]).astype(np.int32)
+    valides = positions<=longueurs[numeros]-taille_kmer
+    valeurs, numeros, positions = valeurs[valides], numeros[valides], positions[valides]
+
+    ordre = np.argsort(valeurs, kind="stable")
+    valeurs, numeros, positions = valeurs[ordre], numeros[ordre], positions[ordre]
+    # Retrait des k-mers trop fréquents
+    uniques, nombres = np.unique(valeurs, return_counts=True)
+    gardes = np.repeat(nombres<=occurrences_max,nombres)
+    return(indexKmers(valeurs[gardes],numeros[gardes],positions[gardes],taille_kmer,base,table,len(codes)))
+
+def chargerIndex(chemin):
+    ''' Index écrit par indexKmers.sauver, ses tableaux étant projetés
+        en mémoire (lus à la demande et partagés entre processus).'''
+    with open(os.path.join(chemin,"index.json")) as fichier:
+        meta = json.load(fichier)
+    tableaux = [np.load(os.path.join(chemin,nom+".npy"), mmap_mode="r")
+                for nom in ("valeurs","cibles","positions")]
+    table = np.load(os.path.join(chemin,"table.npy"))
+    return(indexKmers(*tableaux,meta["taille_kmer"],meta["base"],table,meta["nombre_cibles"]))
+
+def largeurCandidat(l1,l2,diagonale_min,diagonale_max,marge):
+    # Demi-largeur de bande (voir limitesBande) qui couvre les diagonales
+    # des graines, plus la marge
+    return(max(0,min(0,l1-l2)-diagonale_min,diagonale_max-max(0,l1-l2))+marge)
+
+def alignerCandidats(requete,cibles,index,schema="simple",d=d,k=k,cost=costmat,
+                     graines_min=4,ecart=16,marge=8,seuil=None):
+    ''' Générateur des résultats (numéro de cible, score, alignement)
+        des cibles retenues par le préfiltre, dans l'ordre de
+        index.candidats. La requête est seq1, chaque cible seq2. Avec
+        seuil, les candidats sous le seuil sont abandonnés au plus tôt
+        (voir arret.py) et ne sont pas renvoyés.'''
+    if (schema not in ("simple","affine")):
+        raise ValueError("Schéma inconnu: "+str(schema))
+    for cible,diagonale_min,diagonale_max,graines in index.candidats(requete,graines_min,ecart):
+        seq2 = cibles[cible]
+        largeur = largeurCandidat(len(requete),len(seq2),diagonale_min,diagonale_max,marge)
+        if (schema=="simple"):
+            score, alignement, etat = alignementSimpleBandeArret(requete,seq2,d,cost,largeur,seuil)
+        else:
+            score, alignement, etat = alignementAffineBandeArret(requete,seq2,d,k,cost,largeur,seuil)
+        if (score is not None):
+            yield((cible,score,alignement))
@@ -0,0 +1,237 @@
+import json
+import re
+import struct
+from array import array
+
+######################################################################
+#                                                                    #
+#                     Résultats d'alignement compacts                #
+#                                                                    #
+# Au format de recallback, un alignement est une liste de couples de #
+# caractères (environ 64 octets par colonne). Un resultatAlignement  #
+# garde le score, les coordonnées du début et de la fin dans les     #
+# deux séquences, et les opérations codées par plages: un entier de  #
+# 32 bits par plage, longueur<<2 | code, le code étant celui d'un    #
+# CIGAR étendu:                                                      #
+#   = match, X mismatch, I résidu de la séquence 1 face à un gap,    #
+#   D résidu de la séquence 2 face à un gap                          #
+# (M, I et D comme cigarAlignement dans le CIGAR simple).            #
+#                                                                    #
+# Les statistiques (identité, mismatches, gaps) sont calculées à la  #
+# première demande puis gardées; les chaînes alignées ne sont        #
+# produites qu'à la demande, à partir des séquences.                 #
+#                                                                    #
+# Sérialisation: une ligne JSON par résultat (cigar étendu), ou un   #
+# enregistrement binaire (en-tête de 29 octets puis les plages, sur  #
+# 16 bits quand toutes les longueurs sont inférieures à 2**14).      #
+#                                                                    #
+######################################################################
+
+OPERATIONS = "=XID"
+CODES = {op: code for code,op in enumerate(OPERATIONS)}
+
+# En-tête binaire: score, début (seq1, seq2), fin (seq1, seq2), nombre
+# de plages et octets par plage (2 ou 4)
+ENTETE = struct.Struct("<qIIIIIB")
+
+class resultatAlignement:
+    ''' Résultat compact d'un alignement: score, debut et fin (couples
+        de positions dans seq1 et seq2) et plages d'opérations (voir
+        plus haut).'''
+
+    __slots__ = ("score","debut","fin","plages","stats")
+
+    def __init__(self,score,debut,fin,plages):
+        self.score = score
+        self.debut = tuple(debut)
+        self.fin = tuple(fin)
+        self.plages = plages
+        self.stats = None
+
+    def __repr__(self):
+        return("resultatAlignement("+repr(self.score)+", "+repr(self.debut)+", "
+               +repr(self.fin)+", "+repr(self.cigar(True))+")")
+
+    def __eq__(self,autre):
+        if (not isinstance(autre,resultatAlignement)):
+            return(NotImplemented)
+        return((self.score,self.debut,self.fin,self.plages)
+               ==(autre.score,autre.debut,autre.fin,autre.plages))
+
+    def __len__(self):
+        return(self.statistiques()["colonnes"])
+
+    def operations(self):
+        # Couples (longueur, opération) dans l'ordre de l'alignement
+        return([(plage>>2,OPERATIONS[plage&3]) for plage in self.plages])
+
+    def cigar(self,etendu=False):
+        ''' Chaîne CIGAR (M, I, D comme cigarAlignement) ou, si etendu,
+            CIGAR étendu (=, X, I, D).'''
+        if (etendu):
+            return("".join(str(longueur)+op for longueur,op in self.operations()))
+        # Fusion des plages = et X voisines en M
+        cigar = []
+        precedent = None
+        nombre = 0
+        for longueur,op in self.operations():
+            op = "M" if op in "=X" else op
+            if (op==precedent):
+                nombre += longueur
+                continue
+            if precedent:
+                cigar.append(str(nombre)+precedent)
+            precedent,nombre = op,longueur
+        if precedent:
+            cigar.append(str(nombre)+precedent)
+        return("".join(cigar))
+
+    def statistiques(self):
+        ''' Dictionnaire des statistiques de l'alignement (colonnes,
+            identiques, mismatches, gaps ouverts, residus_gap,
+            identite), calculé une seule fois.'''
+        if (self.stats is None):
+            totaux = [0]*4
+            gaps = 0
+            for plage in self.plages:
+                totaux[plage&3] += plage>>2
+                gaps += (plage&3)>=2
+            colonnes = sum(totaux)
+            self.stats = {"colonnes": colonnes, "identiques": totaux[0],
+                          "mismatches": totaux[1], "gaps": gaps,
+                          "residus_gap": totaux[2]+totaux[3],
+                          "identite": totaux[0]/colonnes if colonnes else 0.0}
+        return(self.stats)
+
+    def identite(self):
+        return(self.statistiques()["identite"])
+
+    def mismatches(self):
+        return(self.statistiques()["mismatches"])
+
+    def gaps(self):
+        return(self.statistiques()["gaps"])
+
+    def chaines(self,seq1,seq2):
+        ''' Les deux lignes de l'alignement (avec des "-" pour les gaps),
+            seq1 et seq2 étant les séquences complètes.'''
+        i,j = self.debut
+        ligne1 = []
+        ligne2 = []
+        for longueur,op in self.operations():
+            if (op in "=X"):
+                ligne1.append(seq1[i:i+longueur])
+                ligne2.append(seq2[j:j+longueur])
+                i += longueur
+                j += longueur
+            elif (op=="I"):
+                ligne1.append(seq1[i:i+longueur])
+                ligne2.append("-"*longueur)
+                i += longueur
+            else:
+                ligne1.append("-"*longueur)
+                ligne2.append(seq2[j:j+longueur])
+                j += longueur
+        return("".join(ligne1), "".join(ligne2))
+
+    def alignement(self,seq1,seq2):
+        ''' Alignement au format de recallback (de la fin vers le
+            début).'''
+        ligne1,ligne2 = self.chaines(seq1,seq2)
+        return(list(zip(ligne1,ligne2))[::-1])
+
+    def versJSON(self):
+        ''' Ligne JSON du résultat (relue par resultatDepuisJSON).'''
+        return(json.dumps({"score": self.score, "debut": self.debut,
+                           "fin": self.fin, "cigar": self.cigar(True)}))
+
+    def versOctets(self):
+        ''' Enregistrement binaire du résultat (relu par
+            resultatDepuisOctets).'''
+        plages = self.plages
+        if (all(plage<1<<16 for plage in plages)):
+            plages = array("H",plages)
+        return(ENTETE.pack(self.score,*self.debut,*self.fin,len(plages),plages.itemsize)
+               +plages.tobytes())
+
+def coderPlages(operations):
+    # Plages codées à partir d'un itérable de couples (longueur, op)
+    plages = array("I")
+    precedent = None
+    nombre = 0
+    for longueur,op in operations:
+        if (op==precedent):
+            nombre += longueur
+            continue
+        if precedent:
+            plages.append(nombre<<2 | CODES[precedent])
+        precedent,nombre = op,longueur
+    if precedent:
+        plages.append(nombre<<2 | CODES[precedent])
+    return(plages)
+
+def resultatDepuisAlignement(score,alignement,debut=(0,0)):
+    ''' resultatAlignement d'un alignement au format de recallback,
+        commençant aux positions debut de seq1 et seq2.'''
+    operations = []
+    i,j = debut
+    for a,b in reversed(alignement):
+        if (a=="-"):
+            operations.append((1,"D"))
+            j += 1
+        elif (b=="-"):
+            operations.append((1,"I"))
+            i += 1
+        else:
+            operations.append((1,"=" if a==b else "X"))
+            i += 1
+            j += 1
+    return(resultatAlignement(score,debut,(i,j),coderPlages(operations)))
+
+def resultatDepuisJSON(texte):
+    ''' resultatAlignement d'une ligne écrite par versJSON.'''
+    donnees = json.loads(texte)
+    operations = [(int(longueur),op) for longueur,op in re.findall(r"(\d+)([=XID])",donnees["cigar"])]
+    return(resultatAlignement(donnees["score"],donnees["debut"],donnees["fin"],coderPlages(operations)))
+
+def resultatDepuisOctets(octets,position=0):
+    ''' Couple (resultatAlignement, position suivante) de
+        l'enregistrement binaire qui commence à position.'''
+    score,debut1,debut2,fin1,fin2,nombre,taille = ENTETE.unpack_from(octets,position)
+    position += ENTETE.size
+    lues = array("H" if taille==2 else "I")
+    lues.frombytes(bytes(octets[position:position+taille*nombre]))
+    plages = lues if taille==4 else array("I",lues)
+    return(resultatAlignement(score,(debut1,debut2),(fin1,fin2),plages), position+taille*nombre)
+
+def ecrireResultats(chemin,resultats,format="binaire"):
+    ''' Ecrit les résultats (itérable de resultatAlignement) dans le
+        fichier chemin, en binaire ou en JSON ("jsonl", une ligne par
+        résultat). Renvoie le nombre de résultats écrits.'''
+    if (format not in ("binaire","jsonl")):
+        raise ValueError("Format inconnu: "+str(format))
+    nombre = 0
+    with open(chemin,"wb" if format=="binaire" else "w") as fichier:
+        for resultat in resultats:
+            fichier.write(resultat.versOctets() if format=="binaire" else resultat.versJSON()+"\n")
+            nombre += 1
+    return(nombre)
+
+def lireResultats(chemin,format="binaire"):
+    ''' Générateur des resultatAlignement écrits par ecrireResultats.'''
+    if (format=="jsonl"):
+        with open(chemin) as fichier:
+            for ligne in fichier:
+                if (ligne.strip()):
+                    yield(resultatDepuisJSON(ligne))
+        return
+    if (format!="binaire"):
+        raise ValueError("Format inconnu: "+str(format))
+    with open(chemin,"rb") as fichier:
+        while True:
+            entete = fichier.read(ENTETE.size)
+            if (not entete):
+                return
+            nombre,taille = ENTETE.unpack(entete)[-2:]
+            resultat,_ = resultatDepuisOctets(entete+fichier.read(taille*nombre))
+            yield(resultat)
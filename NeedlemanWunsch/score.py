@@ -0,0 +1,73 @@
+import numpy as np
+
+from .initialisation import costmat
+from .lineaire import ligneScoresAffine, ligneScoresSimple, preparerLineaire
+from .vectoriel import compilerCostmat, encoderSequence
+
+######################################################################
+# Calcul du score seul                                               #
+#                                                                    #
+# Quand seul le score final nous intéresse (resultat[-1][-1].score), #
+# il est inutile de garder les parents: on ne conserve que deux      #
+# lignes de scores, de la taille de la plus petite séquence.         #
+# La version "Lot" aligne une requête contre plusieurs cibles: les   #
+# cibles sont regroupées par longueurs proches et chaque groupe est  #
+# calculé d'un bloc, une ligne de la requête à la fois.              #
+######################################################################
+
+def scoreSimple(seq1,seq2,d,cost=costmat):
+    ''' Score de l'alignement simple optimal (sans les alignements).'''
+    codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+    return(int(ligneScoresSimple(codeV,profil,d)[-1]))
+
+def preparerLot(requete,cibles,cost,taille_lot):
+    # Découpage des cibles en groupes de longueurs proches.
+    # Pour chaque groupe on renvoie les indices des cibles, leurs
+    # longueurs et le profil (A, taille du groupe, longueur max)
+    # des cibles, complétées par des codes quelconques: les colonnes
+    # au delà de la longueur d'une cible n'influencent pas son score.
+    table, dense = compilerCostmat(cost)
+    codeR = encoderSequence(requete.upper(), table)
+    codes = [encoderSequence(cible.upper(), table) for cible in cibles]
+    ordre = sorted(range(len(codes)), key=lambda n: len(codes[n]))
+    for debut in range(0, len(ordre), taille_lot):
+        indices = ordre[debut:debut+taille_lot]
+        longueurs = np.array([len(codes[n]) for n in indices])
+        bloc = np.zeros((len(indices), longueurs.max()), dtype=np.uint8)
+        for ligne,n in enumerate(indices):
+            bloc[ligne,:len(codes[n])] = codes[n]
+        # profil[c][t][j] = cost[requete][cible] pour le résidu c de la requête
+        profil = dense[:,bloc].astype(np.int64)
+        yield(indices, longueurs, codeR, profil)
+
+def scoresSimpleLot(requete,cibles,d,cost=costmat,taille_lot=256):
+    ''' Scores de l'alignement simple de la requête (seq1) contre
+        chacune des cibles (seq2), dans l'ordre des cibles.'''
+    scores = [0]*len(cibles)
+    for indices, longueurs, codeR, profil in preparerLot(requete,cibles,cost,taille_lot):
+        lignes = ligneScoresSimple(codeR,profil,d)
+        for ligne,n in enumerate(indices):
+            scores[n] = int(lignes[ligne,longueurs[ligne]])
+    return(scores)
+
+######################################################################
+# Calcul du score seul avec gap affine                               #
+#                                                                    #
+# Seules les lignes courantes des trois matrices sont gardées (sous  #
+# la forme CC / DD décrite plus haut). Voir scoreSimple.             #
+######################################################################
+
+def scoreAffine(seq1,seq2,d,k,cost=costmat):
+    ''' Meilleur score final des trois matrices de alignementAffine.'''
+    codeV, profil, inverse = preparerLineaire(seq1,seq2,cost)
+    return(int(ligneScoresAffine(codeV,profil,d,k,d)[0][-1]))
+
+def scoresAffineLot(requete,cibles,d,k,cost=costmat,taille_lot=256):
+    ''' Scores de l'alignement affine de la requête (seq1) contre
+        chacune des cibles (seq2), dans l'ordre des cibles.'''
+    scores = [0]*len(cibles)
+    for indices, longueurs, codeR, profil in preparerLot(requete,cibles,cost,taille_lot):
+        lignes = ligneScoresAffine(codeR,profil,d,k,d)[0]
+        for ligne,n in enumerate(indices):
+            scores[n] = int(lignes[ligne,longueurs[ligne]])
+    return(scores)
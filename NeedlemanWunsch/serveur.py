@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from .initialisation import costmat, d, k
+from .affichage import cigarAlignement
+from .alphabets import chargerMatrice, matriceSubstitution
+from .lot import choisirFonction
+
+######################################################################
+#                                                                    #
+#                     Service d'alignement (HTTP)                    #
+#                                                                    #
+# Petit serveur HTTP asyncio (sur un port TCP ou une socket Unix):   #
+#                                                                    #
+#   POST /aligner        {"seq1": ..., "seq2": ..., "schema":        #
+#                         "simple"|"affine", "score_seul": false,    #
+#                         "d": -2, "k": -1}                          #
+#   GET  /statistiques   files d'attente et histogrammes de latence  #
+#                                                                    #
+# Les requêtes simultanées sont regroupées en petits lots (au plus   #
+# taille_lot requêtes, ou ce qui est arrivé en delai secondes) qui   #
+# sont calculés dans un ProcessPoolExecutor: la programmation        #
+# dynamique ne bloque jamais la boucle d'événements.                 #
+#                                                                    #
+# Contre-pression: la file d'attente est bornée (réponse 503 quand   #
+# elle est pleine), le nombre de lots en calcul aussi, et chaque     #
+# requête a une taille maximum (413) et un délai maximum (504).      #
+#                                                                    #
+#   python -m NeedlemanWunsch.serveur --port 8080 -p 4               #
+#                                                                    #
+######################################################################
+
+# Bornes (en secondes) des classes des histogrammes de latence
+bornesLatence = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10]
+
+# Textes des codes HTTP utilisés
+statutsHTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable", 504: "Gateway Timeout"}
+
+class erreurRequete(Exception):
+    ''' Requête refusée, avec son code HTTP.'''
+    def __init__(self,statut,message):
+        Exception.__init__(self,message)
+        self.statut = statut
+
+######################################################################
+#   Calcul dans les processus du pool                                #
+######################################################################
+
+# Matrice de score du processus, fixée par initialiserServeur
+matriceServeur = costmat
+
+def initialiserServeur(cost):
+    global matriceServeur
+    matriceServeur = cost
+
+def alignerRequete(requete):
+    schema, score_seul, seq1, seq2, gap, prolongation = requete
+    fonction,parametres = choisirFonction(schema,score_seul,gap,prolongation,matriceServeur)
+    if (score_seul):
+        return({"score": fonction(seq1,seq2,*parametres)})
+    score, alignement = fonction(seq1,seq2,*parametres)
+    return({"score": score, "cigar": cigarAlignement(alignement),
+            "alignement1": "".join(a for a,b in reversed(alignement)),
+            "alignement2": "".join(b for a,b in reversed(alignement))})
+
+def alignerRequetes(lot):
+    # Une erreur ne concerne que sa requête, pas tout le lot
+    resultats = []
+    for requete in lot:
+        try:
+            resultats.append((True, alignerRequete(requete)))
+        except Exception as erreur:
+            resultats.append((False, str(erreur)))
+    return(resultats)
+
+######################################################################
+#   Mesures                                                          #
+######################################################################
+
+class histogramme:
+    ''' Histogramme de latences (en secondes) à classes fixes.'''
+
+    def __init__(self):
+        self.nombres = [0]*(len(bornesLatence)+1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def ajouter(self,duree):
+        self.nombres[bisect_left(bornesLatence,duree)] += 1
+        self.total += duree
+        self.maximum = max(self.maximum,duree)
+
+    def exporter(self):
+        nombre = sum(self.nombres)
+        return({"nombre": nombre,
+                "moyenne": self.total/nombre if nombre else 0.0,
+                "maximum": self.maximum,
+                "classes": {("<="+str(borne) if borne is not None else "+inf"): n
+                            for borne,n in zip(bornesLatence+[None], self.nombres)}})
+
+######################################################################
+#   Serveur                                                          #
+######################################################################
+
+class serveurAlignement:
+    ''' Serveur d'alignement. processus est le nombre de processus de
+        calcul, taille_lot et delai règlent les lots, taille_file et
+        lots_max bornent les requêtes en attente et les lots en calcul,
+        delai_requete (secondes), longueur_max (résidus par séquence) et
+        taille_max (octets par corps de requête) bornent chaque requête.'''
+
+    def __init__(self,cost=costmat,processus=None,taille_lot=32,delai=0.002,
+                 taille_file=1024,lots_max=None,delai_requete=30.0,
+                 longueur_max=20000,taille_max=1<<20):
+        self.cost = cost
+        self.alphabet = (cost if isinstance(cost,matriceSubstitution) else matriceSubstitution(cost)).alphabet
+        self.processus = processus or os.cpu_count() or 1
+        self.taille_lot = taille_lot
+        self.delai = delai
+        self.taille_file = taille_file
+        self.lots_max = lots_max or 2*self.processus
+        self.delai_requete = delai_requete
+        self.longueur_max = longueur_max
+        self.taille_max = taille_max
+        self.pool = None
+        self.file = None
+        self.serveur = None
+        self.regroupement = None
+        self.taches = set()
+        self.connexions = {}
+        # Compteurs et histogrammes
+        self.debut = time.time()
+        self.requetes = {}
+        self.lots_en_cours = 0
+        self.file_maximum = 0
+        self.tailles_lots = [0]*(taille_lot+1)
+        self.latences = {"attente": histogramme(), "calcul": histogramme(), "totale": histogramme()}
+
+    def compter(self,nom):
+        self.requetes[nom] = self.requetes.get(nom,0)+1
+
+    def statistiques(self):
+        ''' Etat du serveur (files et latences), exporté en JSON.'''
+        return({"secondes": time.time()-self.debut,
+                "processus": self.processus,
+                "file": self.file.qsize() if self.file is not None else 0,
+                "file_maximum": self.file_maximum,
+                "file_taille": self.taille_file,
+                "lots_en_cours": self.lots_en_cours,
+                "lots_max": self.lots_max,
+                "requetes": dict(self.requetes),
+                "tailles_lots": {str(n): nombre for n,nombre in enumerate(self.tailles_lots) if nombre},
+                "latences": {nom: h.exporter() for nom,h in self.latences.items()}})
+
+    # Lecture et validation d'une requête d'alignement
+
+    def lireRequete(self,corps):
+        try:
+            requete = json.loads(corps)
+            seq1 = requete["seq1"]
+            seq2 = requete["seq2"]
+        except (ValueError, KeyError, TypeError):
+            raise erreurRequete(400,"JSON avec seq1 et seq2 attendu") from None
+        if (not isinstance(requete,dict) or not isinstance(seq1,str) or not isinstance(seq2,str)):
+            raise erreurRequete(400,"seq1 et seq2 doivent être des chaînes")
+        if (len(seq1)>self.longueur_max or len(seq2)>self.longueur_max):
+            raise erreurRequete(413,"séquence de plus de "+str(self.longueur_max)+" résidus")
+        if (not self.alphabet.valide(seq1) or not self.alphabet.valide(seq2)):
+            raise erreurRequete(400,"séquence invalide pour la matrice de score")
+        schema = requete.get("schema","simple")
+        if (schema not in ("simple","affine")):
+            raise erreurRequete(400,"schema vaut simple ou affine")
+        gap = requete.get("d",d)
+        prolongation = requete.get("k",k)
+        if (not isinstance(gap,int) or not isinstance(prolongation,int)):
+            raise erreurRequete(400,"d et k doivent être des entiers")
+        return((schema, bool(requete.get("score_seul",False)), seq1, seq2, gap, prolongation))
+
+    async def aligner(self,requete):
+        # Mise en file d'une requête et attente de son résultat
+        arrivee = time.perf_counter()
+        futur = asyncio.get_running_loop().create_future()
+        try:
+            self.file.put_nowait((requete, futur, arrivee))
+        except asyncio.QueueFull:
+            raise erreurRequete(503,"file d'attente pleine") from None
+        self.file_maximum = max(self.file_maximum, self.file.qsize())
+        try:
+            succes, resultat = await asyncio.wait_for(asyncio.shield(futur), self.delai_requete)
+        except asyncio.TimeoutError:
+            # Le résultat sera ignoré s'il arrive plus tard. La latence
+            # est comptée: sans les requêtes abandonnées, l'histogramme
+            # sous-estimerait la charge.
+            futur.cancel()
+            self.latences["totale"].ajouter(time.perf_counter()-arrivee)
+            raise erreurRequete(504,"délai dépassé") from None
+        self.latences["totale"].ajouter(time.perf_counter()-arrivee)
+        if (not succes):
+            # Les requêtes ont été validées avant la mise en file: une
+            # erreur du calcul ou du pool vient du serveur
+            raise erreurRequete(500,resultat)
+        return(resultat)
+
+    async def regrouper(self):
+        # Tâche de fond: formation des lots et envoi au pool. Le nombre
+        # de lots en calcul est borné par un sémaphore: quand il est
+        # atteint, la file se remplit et les nouvelles requêtes sont
+        # refusées.
+        boucle = asyncio.get_running_loop()
+        places = asyncio.Semaphore(self.lots_max)
+        while True:
+            lot = [await self.file.get()]
+            fin = boucle.time()+self.delai
+            while (len(lot)<self.taille_lot):
+                reste = fin-boucle.time()
+                if (reste<=0):
+                    break
+                try:
+                    lot.append(await asyncio.wait_for(self.file.get(), reste))
+                except asyncio.TimeoutError:
+                    break
+            # Les requêtes abandonnées (délai dépassé) ne sont pas calculées
+            lot = [element for element in lot if not element[1].done()]
+            if (not lot):
+                continue
+            await places.acquire()
+            tache = asyncio.ensure_future(self.calculer(lot, places))
+            self.taches.add(tache)
+            tache.add_done_callback(self.taches.discard)
+
+    async def calculer(self,lot,places):
+        boucle = asyncio.get_running_loop()
+        self.lots_en_cours += 1
+        self.tailles_lots[len(lot)] += 1
+        debut = time.perf_counter()
+        for requete,futur,arrivee in lot:
+            self.latences["attente"].ajouter(debut-arrivee)
+        try:
+            resultats = await boucle.run_in_executor(self.pool, alignerRequetes,
+                                                     [requete for requete,futur,arrivee in lot])
+        except Exception as erreur:
+            resultats = [(False, "erreur de calcul: "+str(erreur))]*len(lot)
+        finally:
+            self.lots_en_cours -= 1
+            places.release()
+        self.latences["calcul"].ajouter(time.perf_counter()-debut)
+        for (requete,futur,arrivee),resultat in zip(lot,resultats):
+            if (not futur.done()):
+                futur.set_result(resultat)
+
+    # Protocole HTTP (HTTP/1.1 minimal, connexions persistantes)
+
+    async def lireHTTP(self,lecteur):
+        # Renvoie (méthode, chemin, corps, garder la connexion) ou None
+        ligne = await lecteur.readline()
+        if (not ligne):
+            return(None)
+        try:
+            methode, chemin, version = ligne.decode("latin-1").split()
+        except ValueError:
+            raise erreurRequete(400,"ligne de requête invalide") from None
+        entetes = {}
+        while True:
+            ligne = await lecteur.readline()
+            if (ligne in (b"\r\n", b"\n", b"")):
+                break
+            nom, _, valeur = ligne.decode("latin-1").partition(":")
+            entetes[nom.strip().lower()] = valeur.strip()
+        try:
+            longueur = int(entetes.get("content-length","0"))
+        except ValueError:
+            raise erreurRequete(400,"Content-Length invalide") from None
+        if (longueur>self.taille_max):
+            raise erreurRequete(413,"corps de plus de "+str(self.taille_max)+" octets")
+        corps = await lecteur.readexactly(longueur) if longueur else b""
+        connexion = entetes.get("connection","").lower()
+        garder = connexion!="close" if version=="HTTP/1.1" else connexion=="keep-alive"
+        return(methode, chemin, corps, garder)
+
+    def ecrireHTTP(self,ecrivain,statut,contenu,garder):
+        corps = (json.dumps(contenu)+"\n").encode()
+        entete = ("HTTP/1.1 "+str(statut)+" "+statutsHTTP[statut]+"\r\n"
+                  "Content-Type: application/json\r\n"
+                  "Content-Length: "+str(len(corps))+"\r\n"
+                  "Connection: "+("keep-alive" if garder else "close")+"\r\n\r\n")
+        ecrivain.write(entete.encode()+corps)
+
+    async def repondre(self,methode,chemin,corps):
+        if (chemin=="/statistiques"):
+            if (methode!="GET"):
+                raise erreurRequete(405,"GET attendu")
+            return(self.statistiques())
+        if (chemin=="/aligner"):
+            if (methode!="POST"):
+                raise erreurRequete(405,"POST attendu")
+            return(await self.aligner(self.lireRequete(corps)))
+        raise erreurRequete(404,"chemin inconnu: "+chemin)
+
+    async def connexion(self,lecteur,ecrivain):
+        self.connexions[ecrivain] = asyncio.current_task()
+        try:
+            garder = True
+            while garder:
+                requete = None
+                try:
+                    requete = await self.lireHTTP(lecteur)
+                    if (requete is None):
+                        break
+                    methode, chemin, corps, garder = requete
+                    statut, contenu = 200, await self.repondre(methode,chemin,corps)
+                    self.compter("200")
+                except erreurRequete as erreur:
+                    statut, contenu = erreur.statut, {"erreur": str(erreur)}
+                    self.compter(str(erreur.statut))
+                    # Après une erreur de lecture, le flux n'est plus fiable
+                    if (requete is None):
+                        garder = False
+                self.ecrireHTTP(ecrivain,statut,contenu,garder)
+                await ecrivain.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connexions.pop(ecrivain,None)
+            ecrivain.close()
+
+    async def demarrer(self,hote="127.0.0.1",port=8080,unix=None):
+        ''' Démarre le pool, la formation des lots et l'écoute.'''
+        self.pool = ProcessPoolExecutor(max_workers=self.processus,
+                                        initializer=initialiserServeur,
+                                        initargs=(self.cost,))
+        # Les processus sont lancés avant l'écoute: lancés plus tard (par
+        # fork), ils hériteraient des sockets des clients connectés, qui
+        # ne seraient alors plus vraiment fermées par ecrivain.close()
+        boucle = asyncio.get_running_loop()
+        await asyncio.gather(*(boucle.run_in_executor(self.pool,os.getpid)
+                               for _ in range(self.processus)))
+        self.file = asyncio.Queue(self.taille_file)
+        self.regroupement = asyncio.ensure_future(self.regrouper())
+        if (unix is not None):
+            self.serveur = await asyncio.start_unix_server(self.connexion, unix)
+        else:
+            self.serveur = await asyncio.start_server(self.connexion, hote, port)
+        return(self.serveur)
+
+    async def arreter(self):
+        self.serveur.close()
+        # Fermeture des connexions persistantes encore ouvertes
+        connexions = list(self.connexions.items())
+        for ecrivain,tache in connexions:
+            ecrivain.close()
+        await asyncio.gather(*(tache for ecrivain,tache in connexions), return_exceptions=True)
+        await self.serveur.wait_closed()
+        self.regroupement.cancel()
+        for tache in list(self.taches):
+            await tache
+        self.pool.shutdown()
+
+def analyserArguments(argv):
+    parser = argparse.ArgumentParser(prog="python -m NeedlemanWunsch.serveur",
+        description="Service HTTP d'alignement (POST /aligner, GET /statistiques)")
+    parser.add_argument("--hote",default="127.0.0.1")
+    parser.add_argument("--port",type=int,default=8080)
+    parser.add_argument("--unix",metavar="CHEMIN",help="écoute sur une socket Unix")
+    parser.add_argument("-m","--matrice",help="BLOSUM62, PAM250, NUC.4.4 ou un fichier")
+    parser.add_argument("-p","--processus",type=int,default=0,
+        help="nombre de processus de calcul (0: autant que de coeurs)")
+    parser.add_argument("--taille-lot",type=int,default=32)
+    parser.add_argument("--delai-lot",type=float,default=2.0,help="en millisecondes")
+    parser.add_argument("--taille-file",type=int,default=1024)
+    parser.add_argument("--delai-requete",type=float,default=30.0,help="en secondes")
+    parser.add_argument("--longueur-max",type=int,default=20000)
+    parser.add_argument("--taille-max",type=int,default=1<<20,help="en octets")
+    return(parser.parse_args(argv))
+
+async def servir(arguments):
+    cost = costmat if arguments.matrice is None else chargerMatrice(arguments.matrice)
+    serveur = serveurAlignement(cost,arguments.processus or None,arguments.taille_lot,
+                                arguments.delai_lot/1000,arguments.taille_file,None,
+                                arguments.delai_requete,arguments.longueur_max,
+                                arguments.taille_max)
+    await serveur.demarrer(arguments.hote,arguments.port,arguments.unix)
+    adresse = arguments.unix or arguments.hote+":"+str(arguments.port)
+    print("Service d'alignement sur "+adresse,file=sys.stderr,flush=True)
+    arret = asyncio.Event()
+    boucle = asyncio.get_running_loop()
+    for signal_arret in (signal.SIGINT, signal.SIGTERM):
+        boucle.add_signal_handler(signal_arret, arret.set)
+    await arret.wait()
+    await serveur.arreter()
+
+def main(argv=None):
+    asyncio.run(servir(analyserArguments(argv)))
+
+if __name__ == "__main__":
+    main()
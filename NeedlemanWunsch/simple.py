@@ -0,0 +1,82 @@
+from .initialisation import costmat, node, parent
+from .instrumentation import mesures, mesurerNodes
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+  ##      #
+ #  #    #            Implémentation
+   #    #                     de
+ ####  #                     l'algorithme simple
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+######################################################################
+# Implementation de l'algorithme de Needleman-Wunsch simple          #
+######################################################################
+
+def alignementSimple(seq1,seq2,d,cost=costmat):
+    # Implementation de l'aglgorythme de Needleman Wunch utilisant une valeur fixe de d et une matrice de score.
+    
+    # Pré traitement des séquences ( passage en majuscule )
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    
+    # Récupération de la taille de la séquence
+    l1= len(seq1)
+    l2= len(seq2)
+    
+    # Mesure des phases (sans effet si les mesures sont désactivées)
+    chrono= mesures.chrono("simple")
+    
+    # Création d'une matrice contenant des noeuds "vides".
+    # Cela permet au passage de "zeroter" le noeud (0,0).
+    matriceAlignement = [[node(0,parent(None,None)) for i in range(l1+1)] for j in range(l2+1)] 
+    chrono.etape("allocation")
+    
+    # Initialisation de la matrice (et remplissage des lignes de gap)
+    
+    # Remplissage de la première ligne
+    for i in range(1,l1+1):
+        matriceAlignement[0][i]= node( matriceAlignement[0][i-1].score + d, parent( matriceAlignement[0][i-1] , (seq1[i-1],"-") ) )
+    
+    # Remplissage de la première colone
+    for i in range(1,l2+1):
+        matriceAlignement[i][0]= node( matriceAlignement[i-1][0].score + d, parent( matriceAlignement[i-1][0] , ("-",seq2[i-1]) ) )
+    
+    # Remplissage de la matrice
+    for j in range(1,l2+1):
+        for i in range(1, l1+1):
+            
+            # Récupération des objets node précédent.
+            ant1= matriceAlignement[j-1][i-1] # Diagonal     
+            ant2= matriceAlignement[j-1][i]   # Haut
+            ant3= matriceAlignement[j][i-1]   # Gauche
+        
+            # Calcule du meilleur score
+            maximum= max(ant1.score + cost[seq1[i-1]][seq2[j-1]], ant2.score + d , ant3.score + d)
+            
+            # Determination des noeuds parents
+            # Ces noeuds sont liés à l'alignement correspondant.
+            
+            # Création d'un parent vide
+            parents= parent(None,None)
+            
+            if (ant1.score+cost[seq1[i-1]][seq2[j-1]] == maximum):
+                parents.addNode(ant1)
+                parents.addAlign( (seq1[i-1],seq2[j-1]) )
+            
+            if(ant2.score + d == maximum):
+                parents.addNode(ant2)
+                parents.addAlign( ("-",seq2[j-1]) )
+                
+            if(ant3.score + d == maximum):
+                parents.addNode(ant3)
+                parents.addAlign( (seq1[i-1],"-") )
+
+            # création du nouveau noeud
+            matriceAlignement[j][i]= node(maximum, parents)
+    chrono.etape("remplissage")
+    if (mesures.actif):
+        mesurerNodes("simple",[matriceAlignement])
+    
+    # Revoi de la matrice complétée
+    return(matriceAlignement)
@@ -0,0 +1,335 @@
+# NumPy n'est nécessaire que pour les moteurs vectorisés: ce module
+# (et ceux qui en dépendent) n'est chargé qu'à la première utilisation.
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("Le moteur vectorisé nécessite NumPy (pip install numpy)") from None
+
+from .initialisation import costmat
+from .alphabets import matriceSubstitution
+
+######################################################################
+# Moteur vectorisé (NumPy) de l'algorithme simple                    #
+#                                                                    #
+# Au lieu de créer un objet node et un objet parent par case, les    #
+# scores sont stockés dans un tableau d'entiers int32 et les parents #
+# dans un tableau uint8 de directions, où chaque direction est un    #
+# bit. Les séquences sont codées en uint8 et la matrice de score     #
+# est compilée en un petit tableau dense: il n'y a plus de           #
+# dictionnaire dans la boucle de remplissage.                        #
+######################################################################
+
+# Bits de direction (un même case peut en avoir plusieurs)
+DIAGONALE = 1
+HAUT      = 2
+GAUCHE    = 4
+
+# Bits de direction pour le gap affine: pour chaque matrice, le ou les
+# états (A, B, C) de la case précédente qui donnent le maximum.
+ETAT_A = 1
+ETAT_B = 2
+ETAT_C = 4
+
+def compilerCostmat(cost=costmat):
+    ''' Compile une matrice de score (dictionnaire de dictionnaires) en
+        une table de codage octet -> code (uint8, 255 pour les lettres
+        inconnues) et une matrice dense int32 indexée par ces codes.'''
+    if (isinstance(cost,matriceSubstitution)):
+        return(cost.compiler())
+    alphabet = list(cost)
+    table = np.full(256, 255, dtype=np.uint8)
+    for code, lettre in enumerate(alphabet):
+        table[ord(lettre.upper())] = code
+        table[ord(lettre.lower())] = code
+    dense = np.array([[cost[a][b] for b in alphabet] for a in alphabet], dtype=np.int32)
+    return(table, dense)
+
+def encoderSequence(seq, table):
+    # Codage d'une séquence en uint8 à partir de la table de compilerCostmat
+    codes = table[np.frombuffer(seq.encode("ascii"), dtype=np.uint8)]
+    if (codes == 255).any():
+        raise ValueError("La séquence contient des lettres absentes de la matrice de score")
+    return(codes)
+
+def alignementSimpleNumpy(seq1,seq2,d,cost=costmat):
+    ''' Equivalent de alignementSimple. Renvoie le couple (scores, directions):
+        scores[j][i] est le score du node (i,j) et directions[j][i] la
+        combinaison des bits DIAGONALE, HAUT et GAUCHE de ses parents.'''
+    
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    l1= len(code1)
+    l2= len(code2)
+    
+    # Profil de la séquence 1: profil[c][i] = cost[seq1[i]][c]
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    
+    scores = np.empty((l2+1, l1+1), dtype=np.int32)
+    directions = np.zeros((l2+1, l1+1), dtype=np.uint8)
+    
+    # Première ligne et première colonne (lignes de gap)
+    gaps = d*np.arange(l1+1, dtype=np.int64)
+    scores[0] = gaps
+    scores[:,0] = d*np.arange(l2+1, dtype=np.int64)
+    directions[0,1:] = GAUCHE
+    directions[1:,0] = HAUT
+    
+    # Remplissage ligne par ligne.
+    # Les parents diagonal et haut viennent de la ligne précédente et se
+    # calculent d'un coup. Le parent gauche dépend de la ligne en cours:
+    # score[i] = max_t( candidat[t] + (i-t)*d ), soit un maximum cumulé
+    # une fois le terme i*d retiré.
+    ligne = np.empty(l1+1, dtype=np.int64)
+    for j in range(1,l2+1):
+        precedente = scores[j-1].astype(np.int64)
+        diag = precedente[:-1] + profil[code2[j-1]]
+        haut = precedente[1:] + d
+        
+        ligne[0] = scores[j,0]
+        np.maximum(diag, haut, out=ligne[1:])
+        ligne = np.maximum.accumulate(ligne - gaps) + gaps
+        scores[j] = ligne
+        
+        maximum = ligne[1:]
+        directions[j,1:] = ( (diag == maximum)*DIAGONALE
+                           | (haut == maximum)*HAUT
+                           | (ligne[:-1] + d == maximum)*GAUCHE )
+    
+    return(scores, directions)
+
+
+######################################################################
+#  Equivalent de recallback pour le moteur vectorisé: le chemin      #
+#  inverse est suivi dans le tableau de directions, dans le même     #
+#  ordre (diagonale, haut, gauche).                                  #
+######################################################################
+
+def parentsDirection(directions,j,i,seq1,seq2):
+    # Liste des parents ((j,i), alignement) d'une case du tableau de
+    # directions, dans l'ordre de alignementSimple.
+    code=directions[j,i]
+    parents=[]
+    if (code & DIAGONALE):
+        parents.append(((j-1,i-1),(seq1[i-1],seq2[j-1])))
+    if (code & HAUT):
+        parents.append(((j-1,i),("-",seq2[j-1])))
+    if (code & GAUCHE):
+        parents.append(((j,i-1),(seq1[i-1],"-")))
+    return(parents)
+
+def iterRecallbackNumpy(directions,seq1,seq2,max_alignements=None):
+    ''' Générateur des alignements optimaux à partir du tableau de
+        directions de alignementSimpleNumpy (voir iterRecallback).'''
+    if (max_alignements is not None and max_alignements<=0):
+        return
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    nombre=0
+    chemin=[]
+    pile=[[parentsDirection(directions,len(seq2),len(seq1),seq1,seq2),0]]
+    while pile:
+        sommet=pile[-1]
+        parents,rang=sommet
+        if (rang<len(parents)):
+            sommet[1]+=1
+            (j,i),alignement=parents[rang]
+            chemin.append(alignement)
+            pile.append([parentsDirection(directions,j,i,seq1,seq2),0])
+            continue
+        if (parents==[]):
+            yield(list(chemin))
+            nombre+=1
+            if (nombre==max_alignements):
+                return
+        pile.pop()
+        if chemin:
+            chemin.pop()
+
+def recallbackNumpy(directions,seq1,seq2):
+    return(list(iterRecallbackNumpy(directions,seq1,seq2)))
+
+def compterAlignementsNumpy(directions):
+    ''' Nombre d'alignements optimaux du tableau de directions, calculé
+        ligne par ligne (entiers Python: le nombre peut être très grand).'''
+    hauteur,largeur=directions.shape
+    precedente=None
+    for j in range(hauteur):
+        codes=directions[j].tolist()
+        ligne=[0]*largeur
+        for i in range(largeur):
+            code=codes[i]
+            if (code==0):
+                ligne[i]=1
+                continue
+            nombre=0
+            if (code & DIAGONALE):
+                nombre+=precedente[i-1]
+            if (code & HAUT):
+                nombre+=precedente[i]
+            if (code & GAUCHE):
+                nombre+=ligne[i-1]
+            ligne[i]=nombre
+        precedente=ligne
+    return(precedente[-1])
+
+
+######################################################################
+# Moteur vectorisé de l'algorithme avec gap affine                   #
+#                                                                    #
+# Les trois matrices de node de alignementAffine sont remplacées par #
+# un seul tableau uint16 de codes: pour chaque case, les bits 0-2    #
+# donnent les états (ETAT_A, ETAT_B, ETAT_C) des parents de la case  #
+# de A, les bits 3-5 ceux de B et les bits 6-8 ceux de C. Seules     #
+# deux lignes de scores sont gardées: le retour sur trace coûte 2    #
+# octets par case pour les trois matrices, contre environ 1350       #
+# octets par case avec les objets node et parent (mesurés par        #
+# benchmarks/memoireRetour.py).                                      #
+#                                                                    #
+# L'initialisation reprend exactement celle de alignementAffine (y   #
+# compris la valeur de infini et le cas de la case (1,1)), pour      #
+# obtenir les mêmes scores et les mêmes alignements, dans le même    #
+# ordre.                                                             #
+######################################################################
+
+def etatsEgaux(valeurs,maximum):
+    # Bits des états (A, B, C) dont la valeur atteint le maximum
+    A,B,C = valeurs
+    return((A==maximum)*ETAT_A | (B==maximum)*ETAT_B | (C==maximum)*ETAT_C)
+
+def alignementAffineNumpy(seq1,seq2,d,k,cost=costmat):
+    ''' Equivalent de alignementAffine. Renvoie le couple (finaux, codes):
+        finaux est le triplet des scores finaux des matrices A, B et C,
+        codes[j][i] les bits des parents de chaque matrice en (i,j).'''
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    table, dense = compilerCostmat(cost)
+    code1 = encoderSequence(seq1, table)
+    code2 = encoderSequence(seq2, table)
+    profil = np.ascontiguousarray(dense[code1].T, dtype=np.int64)
+    return(remplirAffineNumpy(profil,code2,d,k))
+
+def remplirAffineNumpy(profil,code2,d,k):
+    # Remplissage de alignementAffineNumpy: profil[c][i] est le score du
+    # code c (de la séquence verticale code2) contre le résidu i de la
+    # séquence horizontale. Un profil quelconque (l2, l1) avec
+    # code2 = range(l2) donne une ligne de scores par résidu vertical
+    # (voir alignerProfils dans multiple.py).
+    l1= profil.shape[1]
+    l2= len(code2)
+    infini= 42*(-10**6)
+    colonnes = np.arange(l1+1, dtype=np.int64)
+    codes = np.zeros((l2+1, l1+1), dtype=np.uint16)
+
+    # Première ligne: A et B à infini, C est une suite de gaps
+    A = np.full(l1+1, infini, dtype=np.int64)
+    B = A.copy()
+    C = d+k*colonnes
+    A[0] = B[0] = C[0] = 0
+    codes[0,1:] = ETAT_C<<6
+
+    for j in range(1,l2+1):
+        # Matrice A (diagonale)
+        maximum = np.maximum(np.maximum(A[:-1],B[:-1]),C[:-1])
+        codeA = etatsEgaux((A[:-1],B[:-1],C[:-1]),maximum)
+        nouveauA = np.empty(l1+1, dtype=np.int64)
+        nouveauA[0] = infini
+        nouveauA[1:] = maximum+profil[code2[j-1]]
+        if (j==1 and l1>0):
+            # Cas spécial de la case (1,1): seule l'origine de A
+            nouveauA[1] = profil[code2[0]][0]
+            codeA[0] = ETAT_A
+
+        # Matrice B (haut)
+        hA = A[1:]+d+k
+        hB = B[1:]+k
+        hC = C[1:]+d+k
+        nouveauB = np.empty(l1+1, dtype=np.int64)
+        nouveauB[0] = d+k*j
+        nouveauB[1:] = np.maximum(np.maximum(hA,hB),hC)
+        codeB = etatsEgaux((hA,hB,hC),nouveauB[1:])
+
+        # Matrice C (gauche): C[i] = max_t<i( max(A,B)[t] + d + (i-t)*k )
+        # (la colonne 0 de C est à infini)
+        Y = np.maximum(nouveauA,nouveauB)
+        nouveauC = np.empty(l1+1, dtype=np.int64)
+        nouveauC[0] = infini
+        nouveauC[1:] = d+k*colonnes[1:]+np.maximum.accumulate(Y[:-1]-k*colonnes[:-1])
+        np.maximum(nouveauC[1:], infini+k*colonnes[1:], out=nouveauC[1:])
+        codeC = etatsEgaux((nouveauA[:-1]+d+k,nouveauB[:-1]+d+k,nouveauC[:-1]+k),nouveauC[1:])
+
+        codes[j,0] = ETAT_B<<3
+        codes[j,1:] = codeA | (codeB<<3) | (codeC<<6)
+        A, B, C = nouveauA, nouveauB, nouveauC
+
+    return((int(A[-1]),int(B[-1]),int(C[-1])), codes)
+
+def parentsEtat(codes,etat,j,i,seq1,seq2):
+    # Liste des parents (etat, (j,i), alignement) de l'état d'une case,
+    # dans l'ordre de alignementAffine (A, B puis C).
+    code=(int(codes[j,i])>>(3*etat)) & 7
+    if (etat==0):
+        precedente,alignement=(j-1,i-1),(seq1[i-1],seq2[j-1])
+    elif (etat==1):
+        precedente,alignement=(j-1,i),("-",seq2[j-1])
+    else:
+        precedente,alignement=(j,i-1),(seq1[i-1],"-")
+    return([(parent,precedente,alignement) for parent in range(3) if code & (1<<parent)])
+
+def iterRecallbackAffineNumpy(finaux,codes,seq1,seq2,max_alignements=None):
+    ''' Générateur des alignements optimaux à partir du résultat de
+        alignementAffineNumpy: les mêmes que iterRecallback depuis
+        chacun des meilleurs nodes finaux (A, puis B, puis C).'''
+    if (max_alignements is not None and max_alignements<=0):
+        return
+    seq1=seq1.upper()
+    seq2=seq2.upper()
+    l1=len(seq1)
+    l2=len(seq2)
+    nombre=0
+    chemin=[]
+    for depart in range(3):
+        if (finaux[depart]!=max(finaux)):
+            continue
+        pile=[[parentsEtat(codes,depart,l2,l1,seq1,seq2),0]]
+        while pile:
+            sommet=pile[-1]
+            parents,rang=sommet
+            if (rang<len(parents)):
+                sommet[1]+=1
+                etat,(j,i),alignement=parents[rang]
+                chemin.append(alignement)
+                pile.append([parentsEtat(codes,etat,j,i,seq1,seq2),0])
+                continue
+            if (parents==[]):
+                yield(list(chemin))
+                nombre+=1
+                if (nombre==max_alignements):
+                    return
+            pile.pop()
+            if chemin:
+                chemin.pop()
+
+def recallbackAffineNumpy(finaux,codes,seq1,seq2):
+    return(list(iterRecallbackAffineNumpy(finaux,codes,seq1,seq2)))
+
+def compterAlignementsAffineNumpy(finaux,codes):
+    ''' Nombre d'alignements optimaux (depuis tous les meilleurs états
+        finaux), calculé ligne par ligne comme compterAlignementsNumpy.'''
+    hauteur,largeur=codes.shape
+    precedente=None
+    for j in range(hauteur):
+        valeurs=codes[j].tolist()
+        ligne=[None]*largeur
+        for i in range(largeur):
+            nombres=[]
+            for etat in range(3):
+                code=(valeurs[i]>>(3*etat)) & 7
+                if (code==0):
+                    nombres.append(1)
+                    continue
+                parents=precedente[i-1] if etat==0 else (precedente[i] if etat==1 else ligne[i-1])
+                nombres.append(sum(parents[parent] for parent in range(3) if code & (1<<parent)))
+            ligne[i]=nombres
+        precedente=ligne
+    return(sum(precedente[-1][etat] for etat in range(3) if finaux[etat]==max(finaux)))
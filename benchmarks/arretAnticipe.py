@@ -0,0 +1,84 @@
+######################################################################
+# Coût du rejet des paires dissemblables (arret.py)                  #
+#                                                                    #
+# Temps moyen par paire de scoreSimple / scoreAffine et              #
+# alignementSimpleBande, comparé à leurs versions avec arrêt         #
+# anticipé (score seuil, X-drop), sur des paires aléatoires          #
+# (dissemblables, à rejeter) et des paires mutées (semblables). Le   #
+# seuil est une fraction du score de la séquence contre elle-même.   #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/arretAnticipe.py --longueur 2000 --paires 20   #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import arret
+
+def muter(seq, taux, alea):
+    resultat = []
+    for lettre in seq:
+        tirage = alea.random()
+        if (tirage<taux/3):
+            continue
+        if (tirage<2*taux/3):
+            resultat.append(alea.choice("ACGT"))
+        elif (tirage<taux):
+            resultat.append(lettre+alea.choice("ACGT"))
+        else:
+            resultat.append(lettre)
+    return("".join(resultat))
+
+def mesurer(nom, fonction, paires):
+    etats = {}
+    debut = time.perf_counter()
+    for s1, s2 in paires:
+        resultat = fonction(s1, s2)
+        etat = resultat[-1] if isinstance(resultat, tuple) and isinstance(resultat[-1], str) else arret.TERMINE
+        etats[etat] = etats.get(etat, 0)+1
+    duree = time.perf_counter()-debut
+    return({"moteur": nom, "ms_par_paire": 1000*duree/len(paires), "etats": etats})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coût du rejet des paires dissemblables")
+    parser.add_argument("--longueur", type=int, default=2000)
+    parser.add_argument("--paires", type=int, default=20)
+    parser.add_argument("--fraction", type=float, default=0.7,
+                        help="seuil, en fraction du score d'une séquence contre elle-même")
+    parser.add_argument("--xdrop", type=int, default=50)
+    parser.add_argument("--taux", type=float, default=0.05, help="taux de mutation des paires semblables")
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    sequences = ["".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+                 for _ in range(arguments.paires)]
+    jeux = {"dissemblables": [(s, "".join(alea.sample(s, len(s)))) for s in sequences],
+            "semblables": [(s, muter(s, arguments.taux, alea)) for s in sequences]}
+    seuil = int(arguments.fraction*nw.scoreSimple(sequences[0], sequences[0], nw.d))
+    seuilAffine = int(arguments.fraction*nw.scoreAffine(sequences[0], sequences[0], nw.d, nw.k))
+    d, k, xdrop = nw.d, nw.k, arguments.xdrop
+    moteurs = [
+        ("scoreSimple", lambda s1, s2: nw.scoreSimple(s1, s2, d)),
+        ("scoreSimpleArret seuil", lambda s1, s2: arret.scoreSimpleArret(s1, s2, d, seuil=seuil)),
+        ("scoreSimpleArret xdrop", lambda s1, s2: arret.scoreSimpleArret(s1, s2, d, xdrop=xdrop)),
+        ("scoreAffine", lambda s1, s2: nw.scoreAffine(s1, s2, d, k)),
+        ("scoreAffineArret seuil", lambda s1, s2: arret.scoreAffineArret(s1, s2, d, k, seuil=seuilAffine)),
+        ("alignementSimpleBande", lambda s1, s2: nw.alignementSimpleBande(s1, s2, d)),
+        ("alignementSimpleBandeArret seuil",
+         lambda s1, s2: arret.alignementSimpleBandeArret(s1, s2, d, seuil=seuil)),
+        ("alignementSimpleBandeArret xdrop",
+         lambda s1, s2: arret.alignementSimpleBandeArret(s1, s2, d, xdrop=xdrop)),
+    ]
+    print(json.dumps({"seuil": seuil, "seuil_affine": seuilAffine, "xdrop": xdrop}))
+    for jeu, paires in jeux.items():
+        for nom, fonction in moteurs:
+            print(json.dumps(dict(jeu=jeu, **mesurer(nom, fonction, paires))))
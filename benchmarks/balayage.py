@@ -0,0 +1,68 @@
+######################################################################
+# Débit du balayage d'une base par une requête                       #
+#                                                                    #
+# Compare, en milliards de cases calculées par seconde (GCUPS), la   #
+# boucle de alignementSimple (sur quelques cibles seulement),        #
+# scoresSimpleLot et le profil de requête (profilRequete), pour une  #
+# requête contre une base de cibles aléatoires.                      #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/balayage.py --requete 300 --cibles 20000       #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+
+def base(nombre, longueur_min, longueur_max, alea):
+    return(["".join(alea.choice("ACGT") for _ in range(alea.randint(longueur_min, longueur_max)))
+            for _ in range(nombre)])
+
+def mesurer(nom, fonction, requete, cibles):
+    debut = time.perf_counter()
+    fonction(requete, cibles)
+    duree = time.perf_counter()-debut
+    cellules = len(requete)*sum(len(cible) for cible in cibles)
+    return({"moteur": nom, "cibles": len(cibles), "cellules": cellules,
+            "secondes": duree, "gcups": cellules/duree/1e9})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Débit (GCUPS) du balayage d'une base")
+    parser.add_argument("--requete", type=int, default=300, help="longueur de la requête")
+    parser.add_argument("--cibles", type=int, default=20000, help="nombre de cibles")
+    parser.add_argument("--longueurs", type=int, nargs=2, default=[200, 400],
+                        help="longueurs minimum et maximum des cibles")
+    parser.add_argument("--cibles-python", type=int, default=5,
+                        help="nombre de cibles pour alignementSimple")
+    parser.add_argument("--graine", type=int, default=42)
+    parser.add_argument("-d", type=int, default=nw.d)
+    parser.add_argument("-k", type=int, default=None, help="gap affine si donné")
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    requete = base(1, arguments.requete, arguments.requete, alea)[0]
+    cibles = base(arguments.cibles, arguments.longueurs[0], arguments.longueurs[1], alea)
+    d, k = arguments.d, arguments.k
+
+    resultats = []
+    if (k is None):
+        resultats.append(mesurer("alignementSimple",
+                                 lambda r, c: [nw.alignementSimple(r, x, d) for x in c],
+                                 requete, cibles[:arguments.cibles_python]))
+        resultats.append(mesurer("scoresSimpleLot", lambda r, c: nw.scoresSimpleLot(r, c, d),
+                                 requete, cibles))
+    else:
+        resultats.append(mesurer("scoresAffineLot", lambda r, c: nw.scoresAffineLot(r, c, d, k),
+                                 requete, cibles))
+    # La construction du profil fait partie de la mesure
+    resultats.append(mesurer("profilRequete", lambda r, c: nw.profilRequete(r, d, k).scores(c),
+                             requete, cibles))
+    for ligne in resultats:
+        print(json.dumps(ligne))
@@ -0,0 +1,127 @@
+######################################################################
+# Test de charge du service d'alignement (serveur.py)                #
+#                                                                    #
+# Lance un serveur local (ou utilise celui de --port), puis des       #
+# clients asyncio simultanés envoient des requêtes sur des           #
+# connexions persistantes. Affiche en JSON le débit, les latences    #
+# vues des clients (percentiles), les codes de réponse et les        #
+# statistiques du serveur (files, lots, histogrammes).               #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/chargeServeur.py --clients 64 --requetes 5000  #
+#   python benchmarks/chargeServeur.py --port 8080 --sans-serveur    #
+######################################################################
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def portLibre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return(s.getsockname()[1])
+
+async def requeteHTTP(lecteur, ecrivain, methode, chemin, corps=b""):
+    ecrivain.write((methode+" "+chemin+" HTTP/1.1\r\nHost: local\r\n"
+                    "Content-Length: "+str(len(corps))+"\r\n\r\n").encode()+corps)
+    await ecrivain.drain()
+    statut = int((await lecteur.readline()).split()[1])
+    longueur = 0
+    while True:
+        ligne = await lecteur.readline()
+        if (ligne in (b"\r\n", b"")):
+            break
+        nom, _, valeur = ligne.decode().partition(":")
+        if (nom.lower()=="content-length"):
+            longueur = int(valeur)
+    return(statut, await lecteur.readexactly(longueur))
+
+async def client(port, corps, compteur, latences, statuts):
+    lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while (compteur[0]>0):
+            compteur[0] -= 1
+            debut = time.perf_counter()
+            statut, _ = await requeteHTTP(lecteur, ecrivain, "POST", "/aligner",
+                                          random.choice(corps))
+            latences.append(time.perf_counter()-debut)
+            statuts[statut] = statuts.get(statut, 0)+1
+    finally:
+        ecrivain.close()
+
+async def attendreServeur(port, delai=30):
+    fin = time.time()+delai
+    while True:
+        try:
+            lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+            ecrivain.close()
+            return
+        except OSError:
+            if (time.time()>fin):
+                raise
+            await asyncio.sleep(0.1)
+
+def percentile(valeurs, p):
+    return(valeurs[min(len(valeurs)-1, int(p/100*len(valeurs)))])
+
+async def charger(arguments, port):
+    alea = random.Random(arguments.graine)
+    corps = []
+    for _ in range(100):
+        s1 = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+        s2 = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+        corps.append(json.dumps({"seq1": s1, "seq2": s2, "schema": arguments.schema,
+                                 "score_seul": arguments.score_seul}).encode())
+    await attendreServeur(port)
+    compteur = [arguments.requetes]
+    latences = []
+    statuts = {}
+    debut = time.perf_counter()
+    await asyncio.gather(*(client(port, corps, compteur, latences, statuts)
+                           for _ in range(arguments.clients)))
+    duree = time.perf_counter()-debut
+    latences.sort()
+    lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+    _, statistiques = await requeteHTTP(lecteur, ecrivain, "GET", "/statistiques")
+    ecrivain.close()
+    return({"requetes": len(latences), "secondes": duree,
+            "requetes_par_seconde": len(latences)/duree,
+            "statuts": {str(statut): n for statut, n in sorted(statuts.items())},
+            "latence_client": {"p50": percentile(latences, 50), "p90": percentile(latences, 90),
+                               "p99": percentile(latences, 99), "max": latences[-1]},
+            "serveur": json.loads(statistiques)})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge du service d'alignement")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requetes", type=int, default=2000)
+    parser.add_argument("--longueur", type=int, default=100)
+    parser.add_argument("--schema", choices=["simple", "affine"], default="simple")
+    parser.add_argument("--score-seul", action="store_true")
+    parser.add_argument("--port", type=int, help="port d'un serveur (local) déjà lancé")
+    parser.add_argument("--sans-serveur", action="store_true",
+                        help="ne lance pas de serveur (avec --port)")
+    parser.add_argument("-p", "--processus", type=int, default=0)
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    port = arguments.port or portLibre()
+    serveur = None
+    if (not arguments.sans_serveur):
+        serveur = subprocess.Popen([sys.executable, "-m", "NeedlemanWunsch.serveur",
+                                    "--port", str(port), "-p", str(arguments.processus)],
+                                   cwd=RACINE)
+    try:
+        print(json.dumps(asyncio.run(charger(arguments, port)), indent=1))
+    finally:
+        if (serveur is not None):
+            serveur.terminate()
+            serveur.wait()
@@ -0,0 +1,94 @@
+######################################################################
+# Alignement sur disque par tuiles (disque.py)                       #
+#                                                                    #
+# Pour chaque longueur, temps et pic de mémoire (RSS, dans un        #
+# sous-processus) de alignementSimpleDisque / alignementAffineDisque #
+# et de leurs équivalents en mémoire, puis taille des fichiers et    #
+# temps du retour sur trace (un alignement) sur les tuiles. Les      #
+# résultats sur disque sont comparés à ceux en mémoire (écarts: code #
+# de sortie 1). Les dossiers de travail sont créés dans --dossier.   #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/disque.py --longueurs 2000 8000 --tuile 1024   #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+MESURE = r"""
+import json, resource, sys, time
+sys.path.insert(0, {racine!r})
+import numpy as np
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import disque, vectoriel
+moteur, seq1, seq2, dossier, tuile = {moteur!r}, {seq1!r}, {seq2!r}, {dossier!r}, {tuile!r}
+debut = time.perf_counter()
+if (moteur=="simple"):
+    score, matrice = disque.alignementSimpleDisque(seq1, seq2, nw.d, dossier, taille_tuile=tuile)
+    remplissage = time.perf_counter()-debut
+    debut = time.perf_counter()
+    alignement = next(vectoriel.iterRecallbackNumpy(matrice, seq1, seq2))
+elif (moteur=="affine"):
+    score, matrice = disque.alignementAffineDisque(seq1, seq2, nw.d, nw.k, dossier, taille_tuile=tuile)
+    remplissage = time.perf_counter()-debut
+    debut = time.perf_counter()
+    alignement = next(vectoriel.iterRecallbackAffineNumpy(score, matrice, seq1, seq2))
+elif (moteur=="simpleMemoire"):
+    scores, matrice = vectoriel.alignementSimpleNumpy(seq1, seq2, nw.d)
+    score = scores[-1, -1]
+    remplissage = time.perf_counter()-debut
+    debut = time.perf_counter()
+    alignement = next(vectoriel.iterRecallbackNumpy(matrice, seq1, seq2))
+else:
+    score, matrice = vectoriel.alignementAffineNumpy(seq1, seq2, nw.d, nw.k)
+    remplissage = time.perf_counter()-debut
+    debut = time.perf_counter()
+    alignement = next(vectoriel.iterRecallbackAffineNumpy(score, matrice, seq1, seq2))
+retour = time.perf_counter()-debut
+print(json.dumps({{"score": np.asarray(score).tolist(), "alignement": str(alignement),
+                  "secondes_remplissage": remplissage, "secondes_retour": retour,
+                  "pic_rss_mo": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024}}))
+"""
+
+def mesurer(moteur, seq1, seq2, dossier, tuile):
+    code = MESURE.format(racine=RACINE, moteur=moteur, seq1=seq1, seq2=seq2, dossier=dossier, tuile=tuile)
+    sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return(json.loads(sortie.stdout))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alignement sur disque par tuiles")
+    parser.add_argument("--longueurs", type=int, nargs="+", default=[2000, 8000])
+    parser.add_argument("--tuile", type=int, default=1024)
+    parser.add_argument("--dossier", default=None, help="dossier des fichiers de travail")
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    ecarts = 0
+    with tempfile.TemporaryDirectory(dir=arguments.dossier) as travail:
+        for longueur in arguments.longueurs:
+            seq1 = "".join(alea.choice("ACGT") for _ in range(longueur))
+            seq2 = "".join(alea.choice("ACGT") for _ in range(longueur))
+            for schema in ("simple", "affine"):
+                dossier = os.path.join(travail, schema+str(longueur))
+                sur_disque = mesurer(schema, seq1, seq2, dossier, arguments.tuile)
+                en_memoire = mesurer(schema+"Memoire", seq1, seq2, dossier, arguments.tuile)
+                identiques = all(sur_disque[cle]==en_memoire[cle] for cle in ("score", "alignement"))
+                ecarts += not identiques
+                octets = os.path.getsize(os.path.join(dossier, "directions.bin"))
+                for moteur, mesure in (("disque", sur_disque), ("memoire", en_memoire)):
+                    print(json.dumps({"longueur": longueur, "schema": schema, "moteur": moteur,
+                                      "secondes_remplissage": mesure["secondes_remplissage"],
+                                      "secondes_retour": mesure["secondes_retour"],
+                                      "pic_rss_mo": mesure["pic_rss_mo"]}))
+                print(json.dumps({"longueur": longueur, "schema": schema,
+                                  "mo_fichier": octets/2**20, "identiques": identiques}))
+    sys.exit(1 if ecarts else 0)
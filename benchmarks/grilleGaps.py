@@ -0,0 +1,85 @@
+######################################################################
+# Grille de réglages de gap (grille.py)                              #
+#                                                                    #
+# Temps de grilleGaps (scores seuls, puis avec un alignement par     #
+# réglage) sur une grille de (d, k), comparé à une boucle sur la     #
+# grille appelant alignementAffine, alignementAffineNumpy et         #
+# scoreAffine. La boucle alignementAffine (objets node en Python)    #
+# est estimée sur quelques réglages. Les scores sont comparés à ceux #
+# de scoreAffine (écarts: code de sortie 1).                         #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/grilleGaps.py --longueur 500 --paires 4        #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import vectoriel
+
+def muter(seq, taux, alea):
+    resultat = []
+    for lettre in seq:
+        tirage = alea.random()
+        if (tirage<taux/3):
+            continue
+        if (tirage<2*taux/3):
+            resultat.append(alea.choice("ACGT"))
+        elif (tirage<taux):
+            resultat.append(lettre+alea.choice("ACGT"))
+        else:
+            resultat.append(lettre)
+    return("".join(resultat))
+
+def chronometrer(fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    return(resultat, time.perf_counter()-debut)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grille de réglages de gap")
+    parser.add_argument("--longueur", type=int, default=500)
+    parser.add_argument("--paires", type=int, default=4)
+    parser.add_argument("--ouvertures", type=int, nargs="+", default=list(range(-10, 1)))
+    parser.add_argument("--extensions", type=int, nargs="+", default=list(range(-4, 0)))
+    parser.add_argument("--estimation", type=int, default=2,
+                        help="réglages mesurés pour estimer la boucle alignementAffine")
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    paires = []
+    for _ in range(arguments.paires):
+        seq = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+        paires.append((seq, muter(seq, 0.2, alea)))
+    gaps = [(d, k) for d in arguments.ouvertures for k in arguments.extensions]
+    print(json.dumps({"longueur": arguments.longueur, "paires": len(paires), "reglages": len(gaps)}))
+
+    scores, duree = chronometrer(lambda: nw.grilleGaps(paires, gaps))
+    print(json.dumps({"moteur": "grilleGaps", "secondes": duree}))
+    _, duree = chronometrer(lambda: nw.grilleGaps(paires, gaps, alignements=True))
+    print(json.dumps({"moteur": "grilleGaps alignements", "secondes": duree}))
+
+    references, duree = chronometrer(lambda: [[nw.scoreAffine(s1, s2, d, k) for d, k in gaps]
+                                              for s1, s2 in paires])
+    print(json.dumps({"moteur": "boucle scoreAffine", "secondes": duree}))
+    _, duree = chronometrer(lambda: [next(vectoriel.iterRecallbackAffineNumpy(
+                                          *vectoriel.alignementAffineNumpy(s1, s2, d, k), s1, s2, 1))
+                                     for s1, s2 in paires for d, k in gaps])
+    print(json.dumps({"moteur": "boucle alignementAffineNumpy", "secondes": duree}))
+    echantillon = gaps[:arguments.estimation]
+    _, duree = chronometrer(lambda: [nw.alignementAffine(s1, s2, d, k)
+                                     for s1, s2 in paires for d, k in echantillon])
+    print(json.dumps({"moteur": "boucle alignementAffine (estimée)",
+                      "secondes": duree*len(gaps)/len(echantillon)}))
+
+    ecarts = int((scores!=references).sum())
+    print(json.dumps({"ecarts_de_score": ecarts}))
+    sys.exit(1 if ecarts else 0)
@@ -0,0 +1,75 @@
+######################################################################
+# Réalignement incrémental (incremental.py)                          #
+#                                                                    #
+# Temps d'un ajout de quelques résidus et d'une modification locale  #
+# (au début, au milieu et à la fin de la requête) avec un            #
+# alignementIncremental, comparé au recalcul complet par             #
+# alignementSimpleNumpy / alignementAffineNumpy. Le score après      #
+# chaque modification est comparé à celui du recalcul complet        #
+# (écarts: code de sortie 1).                                        #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/incremental.py --longueur 3000 --ajout 10      #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import incremental, vectoriel
+
+def scoreComplet(requete, reference, k):
+    if (k is None):
+        scores, _ = vectoriel.alignementSimpleNumpy(requete, reference, nw.d)
+        return(int(scores[-1, -1]))
+    finaux, _ = vectoriel.alignementAffineNumpy(requete, reference, nw.d, k)
+    return(max(finaux))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Réalignement incrémental")
+    parser.add_argument("--longueur", type=int, default=3000)
+    parser.add_argument("--ajout", type=int, default=10, help="résidus ajoutés ou modifiés")
+    parser.add_argument("--intervalle", type=int, default=64)
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    reference = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+    requete = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+    ecarts = 0
+    for schema, k in (("simple", None), ("affine", nw.k)):
+        debut = time.perf_counter()
+        aligneur = incremental.alignementIncremental(reference, requete, nw.d, k,
+                                                     intervalle=arguments.intervalle)
+        print(json.dumps({"schema": schema, "operation": "construction",
+                          "secondes": time.perf_counter()-debut}))
+        n = arguments.ajout
+        modifications = [
+            ("ajout", lambda: aligneur.ajouter("".join(alea.choice("ACGT") for _ in range(n)))),
+            ("edition fin", lambda: aligneur.remplacer(len(aligneur.requete)-2*n,
+                                                       len(aligneur.requete)-n, "A"*n)),
+            ("edition milieu", lambda: aligneur.remplacer(len(aligneur.requete)//2,
+                                                          len(aligneur.requete)//2+n, "C"*n)),
+            ("edition debut", lambda: aligneur.remplacer(0, n, "G"*n)),
+        ]
+        for nom, modifier in modifications:
+            colonnes = aligneur.colonnes_calculees
+            debut = time.perf_counter()
+            modifier()
+            score = aligneur.score()
+            duree = time.perf_counter()-debut
+            debut = time.perf_counter()
+            reference_score = scoreComplet(aligneur.requete, reference, k)
+            duree_complete = time.perf_counter()-debut
+            ecarts += score!=reference_score
+            print(json.dumps({"schema": schema, "operation": nom,
+                              "colonnes_recalculees": aligneur.colonnes_calculees-colonnes,
+                              "secondes": duree, "secondes_recalcul_complet": duree_complete,
+                              "acceleration": duree_complete/duree}))
+    sys.exit(1 if ecarts else 0)
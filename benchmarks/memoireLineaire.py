@@ -0,0 +1,52 @@
+######################################################################
+# Mesure de la mémoire des modes en espace linéaire                  #
+#                                                                    #
+# Chaque alignement est lancé dans un processus séparé afin de       #
+# mesurer son pic de mémoire résidente (RSS). Pour les modes         #
+# Hirschberg et Myers-Miller, le pic doit rester à peu près constant #
+# quand la longueur des séquences augmente.                          #
+#                                                                    #
+# Utilisation: python benchmarks/memoireLineaire.py [longueurs...]   #
+######################################################################
+
+import json
+import os
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code exécuté dans le processus fils
+FILS = """
+import json, random, resource, sys, time
+sys.path.insert(0, %r)
+import NeedlemanWunsch as nw
+mode, longueur = sys.argv[1], int(sys.argv[2])
+random.seed(longueur)
+s1 = "".join(random.choice("ACGT") for _ in range(longueur))
+s2 = "".join(random.choice("ACGT") for _ in range(longueur))
+avant = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+debut = time.perf_counter()
+if mode == "hirschberg":
+    score = nw.alignementHirschberg(s1, s2, nw.d)[0]
+elif mode == "myersmiller":
+    score = nw.alignementMyersMiller(s1, s2, nw.d, nw.k)[0]
+else:
+    score = int(nw.alignementSimpleNumpy(s1, s2, nw.d)[0][-1, -1])
+duree = time.perf_counter() - debut
+pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"mode": mode, "longueur": longueur, "score": int(score),
+                  "secondes": round(duree, 3), "rss_ko_avant": avant,
+                  "rss_ko_pic": pic}))
+""" % RACINE
+
+def mesurer(mode, longueur):
+    sortie = subprocess.run([sys.executable, "-c", FILS, mode, str(longueur)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    longueurs = [int(x) for x in sys.argv[1:]] or [500, 1000, 2000, 4000]
+    for mode in ("matrice", "hirschberg", "myersmiller"):
+        for longueur in longueurs:
+            print(json.dumps(mesurer(mode, longueur)), flush=True)
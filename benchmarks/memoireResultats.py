@@ -0,0 +1,92 @@
+######################################################################
+# Mémoire des résultats gardés (resultat.py)                         #
+#                                                                    #
+# Octets par colonne d'alignement (mesurés avec tracemalloc) d'une   #
+# liste d'alignements au format de recallback et de la même liste    #
+# de resultatAlignement, taille par résultat des fichiers binaire et #
+# JSON, et temps d'écriture et de relecture. Les résultats relus     #
+# sont comparés aux originaux (écarts: code de sortie 1).            #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/memoireResultats.py --resultats 2000           #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import resultat
+
+def muter(seq, taux, alea):
+    resultat = []
+    for lettre in seq:
+        tirage = alea.random()
+        if (tirage<taux/3):
+            continue
+        if (tirage<2*taux/3):
+            resultat.append(alea.choice("ACGT"))
+        elif (tirage<taux):
+            resultat.append(lettre+alea.choice("ACGT"))
+        else:
+            resultat.append(lettre)
+    return("".join(resultat))
+
+def mesurerMemoire(construire):
+    # Octets alloués par construire() et encore vivants à la fin
+    tracemalloc.start()
+    avant = tracemalloc.get_traced_memory()[0]
+    objet = construire()
+    apres = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return(objet, apres-avant)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mémoire des résultats gardés")
+    parser.add_argument("--resultats", type=int, default=2000)
+    parser.add_argument("--longueur", type=int, default=300)
+    parser.add_argument("--taux", type=float, default=0.1)
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    paires = []
+    for _ in range(50):
+        seq = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+        paires.append((seq, muter(seq, arguments.taux, alea)))
+    calcules = [nw.alignementMyersMiller(s1, s2, nw.d, nw.k) for s1, s2 in paires]
+    # Chaque résultat gardé est une copie (comme des alignements distincts)
+    choix = [alea.randrange(len(calcules)) for _ in range(arguments.resultats)]
+    colonnes = sum(len(calcules[n][1]) for n in choix)
+
+    tuples, octets_tuples = mesurerMemoire(
+        lambda: [(calcules[n][0], [(a, b) for a, b in calcules[n][1]]) for n in choix])
+    compacts, octets_compacts = mesurerMemoire(
+        lambda: [resultat.resultatDepuisAlignement(*calcules[n]) for n in choix])
+    print(json.dumps({"resultats": len(choix), "colonnes": colonnes,
+                      "octets_par_colonne_tuples": octets_tuples/colonnes,
+                      "octets_par_colonne_compacts": octets_compacts/colonnes}))
+
+    ecarts = 0
+    with tempfile.TemporaryDirectory() as dossier:
+        for format in ("binaire", "jsonl"):
+            chemin = os.path.join(dossier, "resultats."+format)
+            debut = time.perf_counter()
+            resultat.ecrireResultats(chemin, compacts, format)
+            ecriture = time.perf_counter()-debut
+            debut = time.perf_counter()
+            relus = list(resultat.lireResultats(chemin, format))
+            lecture = time.perf_counter()-debut
+            ecarts += relus!=compacts
+            print(json.dumps({"format": format,
+                              "octets_par_resultat": os.path.getsize(chemin)/len(compacts),
+                              "resultats_par_seconde_ecriture": len(compacts)/ecriture,
+                              "resultats_par_seconde_lecture": len(compacts)/lecture}))
+    sys.exit(1 if ecarts else 0)
@@ -0,0 +1,57 @@
+######################################################################
+# Mémoire du retour sur trace de l'algorithme affine                 #
+#                                                                    #
+# Compare le pic de mémoire (tracemalloc) de alignementAffine, qui   #
+# garde un node et un parent par case des trois matrices, et de      #
+# alignementAffineNumpy, qui ne garde qu'un code uint16 par case.    #
+# Le résultat est donné en octets par case (l1*l2), en lignes JSON.  #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/memoireRetour.py --longueurs 100 200 400       #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+
+def mesurer(fonction):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    debut = time.perf_counter()
+    resultat = fonction()
+    duree = time.perf_counter()-debut
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return(resultat, duree, pic)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Octets par case du retour sur trace affine")
+    parser.add_argument("--longueurs", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--graine", type=int, default=42)
+    parser.add_argument("-d", type=int, default=nw.d)
+    parser.add_argument("-k", type=int, default=nw.k)
+    arguments = parser.parse_args()
+
+    # Premier appel hors mesure: chargement des modules (et de NumPy)
+    nw.alignementAffine("AC", "AG", arguments.d, arguments.k)
+    nw.alignementAffineNumpy("AC", "AG", arguments.d, arguments.k)
+
+    alea = random.Random(arguments.graine)
+    for longueur in arguments.longueurs:
+        s1 = "".join(alea.choice("ACGT") for _ in range(longueur))
+        s2 = "".join(alea.choice("ACGT") for _ in range(longueur))
+        moteurs = {"alignementAffine": lambda: nw.alignementAffine(s1, s2, arguments.d, arguments.k),
+                   "alignementAffineNumpy": lambda: nw.alignementAffineNumpy(s1, s2, arguments.d, arguments.k)}
+        for nom, fonction in moteurs.items():
+            resultat, duree, pic = mesurer(fonction)
+            del resultat
+            print(json.dumps({"moteur": nom, "longueur": longueur, "secondes": duree,
+                              "pic_octets": pic, "octets_par_case": pic/(longueur*longueur)}))
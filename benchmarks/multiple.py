@@ -0,0 +1,116 @@
+######################################################################
+# Alignement multiple progressif (multiple.py)                       #
+#                                                                    #
+# Temps de la matrice des distances (scores de toutes les paires,    #
+# sur plusieurs processus), comparé à une boucle de scoreAffine      #
+# (estimée sur un échantillon de paires), puis de l'arbre guide et   #
+# de l'alignement progressif. Une seconde exécution avec le même     #
+# cacheAlignement (sur disque) ne recalcule aucun score. Ecarts      #
+# (distances différentes avec le cache, séquences non retrouvées     #
+# après retrait des gaps): code de sortie 1.                         #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/multiple.py --sequences 300 --longueur 200     #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import cache, multiple, score
+
+def muter(sequence, alea, taux):
+    # Substitutions, insertions et délétions au taux donné
+    resultat = []
+    for residu in sequence:
+        tirage = alea.random()
+        if (tirage < taux/3):
+            continue
+        if (tirage < 2*taux/3):
+            resultat.append(alea.choice("ACGT"))
+        elif (tirage < taux):
+            resultat.append(residu+alea.choice("ACGT"))
+        else:
+            resultat.append(residu)
+    return("".join(resultat))
+
+def famille(nombre, longueur, alea, taux):
+    # Séquences issues d'un ancêtre commun par mutations successives
+    sequences = ["".join(alea.choice("ACGT") for _ in range(longueur))]
+    while (len(sequences) < nombre):
+        sequences.append(muter(alea.choice(sequences), alea, taux))
+    return(sequences)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alignement multiple progressif")
+    parser.add_argument("--sequences", type=int, default=300)
+    parser.add_argument("--longueur", type=int, default=200)
+    parser.add_argument("--taux", type=float, default=0.05, help="taux de mutation par génération")
+    parser.add_argument("--methode", default="upgma", choices=("upgma", "nj"))
+    parser.add_argument("--processus", type=int, default=None)
+    parser.add_argument("--echantillon", type=int, default=200, help="paires de la boucle de référence")
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    sequences = famille(arguments.sequences, arguments.longueur, alea, arguments.taux)
+    n = len(sequences)
+    paires = n*(n+1)//2
+    print(json.dumps({"sequences": n, "longueur": arguments.longueur, "paires": paires}))
+
+    debut = time.perf_counter()
+    distances = multiple.matriceDistances(sequences, nw.d, nw.k, processus=arguments.processus)
+    print(json.dumps({"etape": "distances", "secondes": time.perf_counter()-debut}))
+
+    echantillon = [(alea.randrange(n), alea.randrange(n)) for _ in range(arguments.echantillon)]
+    debut = time.perf_counter()
+    for i, j in echantillon:
+        score.scoreAffine(sequences[i], sequences[j], nw.d, nw.k)
+    duree = time.perf_counter()-debut
+    print(json.dumps({"etape": "boucle scoreAffine (estimée)",
+                      "secondes": duree*paires/len(echantillon)}))
+
+    debut = time.perf_counter()
+    fusions = multiple.arbreGuide(distances, arguments.methode)
+    print(json.dumps({"etape": "arbre guide", "methode": arguments.methode,
+                      "secondes": time.perf_counter()-debut}))
+
+    table, dense = nw.compilerCostmat(nw.costmat)
+    debut = time.perf_counter()
+    profils = {t: multiple.versLignes([sequence]) for t, sequence in enumerate(sequences)}
+    ordre = {t: [t] for t in range(n)}
+    for t, (a, b) in enumerate(fusions):
+        profils[n+t] = multiple.fusionnerProfils(profils.pop(a), profils.pop(b), table, dense,
+                                                 nw.d, nw.k)
+        ordre[n+t] = ordre.pop(a)+ordre.pop(b)
+    (lignes,) = profils.values()
+    (numeros,) = ordre.values()
+    print(json.dumps({"etape": "alignement progressif", "secondes": time.perf_counter()-debut,
+                      "colonnes": lignes.shape[1]}))
+    alignees = [None]*n
+    for numero, ligne in zip(numeros, lignes):
+        alignees[numero] = ligne.tobytes().decode("ascii")
+    ecarts = sum(alignee.replace("-", "") != sequence for alignee, sequence in zip(alignees, sequences))
+
+    with tempfile.TemporaryDirectory() as dossier:
+        cache_disque = cache.cacheAlignement(taille=2*paires, chemin=os.path.join(dossier, "cache.db"))
+        for passage in (1, 2):
+            debut = time.perf_counter()
+            avec_cache = multiple.matriceDistances(sequences, nw.d, nw.k, processus=arguments.processus,
+                                                   cache=cache_disque)
+            ecarts += not np.array_equal(avec_cache, distances)
+            print(json.dumps({"etape": "distances avec cache", "passage": passage,
+                              "secondes": time.perf_counter()-debut,
+                              "statistiques": cache_disque.statistiques()}))
+        cache_disque.fermer()
+    print(json.dumps({"ecarts": ecarts}))
+    sys.exit(1 if ecarts else 0)
@@ -0,0 +1,80 @@
+######################################################################
+# Passage à l'échelle du remplissage en front d'onde (parallele.py)  #
+#                                                                    #
+# Temps de alignementSimpleParallele / alignementAffineParallele sur #
+# une grande paire aléatoire pour chaque nombre de processus, et     #
+# accélération par rapport à un seul processus (tuiles remplies dans #
+# le processus courant) et au moteur vectorisé en mémoire. Les       #
+# directions sont comparées à celles de alignementSimpleNumpy /      #
+# alignementAffineNumpy (écarts: code de sortie 1).                  #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/parallele.py --longueur 20000 --processus 1 2 4 8
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import parallele, vectoriel
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Passage à l'échelle du remplissage en front d'onde")
+    parser.add_argument("--longueur", type=int, default=20000)
+    parser.add_argument("--processus", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, os.cpu_count() or 1}))
+    parser.add_argument("--tuile", type=int, default=2048)
+    parser.add_argument("--schemas", nargs="+", default=["simple", "affine"])
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    seq1 = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+    seq2 = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+    cellules = (len(seq1)+1)*(len(seq2)+1)
+    print(json.dumps({"longueur": arguments.longueur, "cellules": cellules,
+                      "coeurs": os.cpu_count(), "tuile": arguments.tuile}))
+
+    ecarts = 0
+    for schema in arguments.schemas:
+        debut = time.perf_counter()
+        if (schema=="simple"):
+            scores, reference = vectoriel.alignementSimpleNumpy(seq1, seq2, nw.d)
+            score_reference = int(scores[-1, -1])
+            del scores
+        else:
+            score_reference, reference = vectoriel.alignementAffineNumpy(seq1, seq2, nw.d, nw.k)
+        duree_reference = time.perf_counter()-debut
+        print(json.dumps({"schema": schema, "moteur": "numpy", "secondes": duree_reference,
+                          "mcups": cellules/duree_reference/1e6}))
+
+        duree_seul = None
+        for processus in arguments.processus:
+            debut = time.perf_counter()
+            if (schema=="simple"):
+                score, directions = parallele.alignementSimpleParallele(
+                    seq1, seq2, nw.d, taille_tuile=arguments.tuile, processus=processus)
+            else:
+                score, directions = parallele.alignementAffineParallele(
+                    seq1, seq2, nw.d, nw.k, taille_tuile=arguments.tuile, processus=processus)
+            duree = time.perf_counter()-debut
+            identiques = score==score_reference and np.array_equal(directions, reference)
+            ecarts += not identiques
+            del directions
+            if (processus==1):
+                duree_seul = duree
+            print(json.dumps({"schema": schema, "moteur": "parallele", "processus": processus,
+                              "secondes": duree, "mcups": cellules/duree/1e6,
+                              "acceleration": None if duree_seul is None else duree_seul/duree,
+                              "acceleration_numpy": duree_reference/duree,
+                              "identiques": identiques}))
+        del reference
+    sys.exit(1 if ecarts else 0)
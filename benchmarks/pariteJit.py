@@ -0,0 +1,118 @@
+######################################################################
+# Parité et débit des noyaux compilés (jit.py)                       #
+#                                                                    #
+# Vérifie, sur des paires aléatoires, que les noyaux de jit.py       #
+# donnent les mêmes scores et le même premier alignement que         #
+# alignementSimple et alignementAffine (retour sur trace avec        #
+# iterRecallback), et, si Numba est installé, que les versions       #
+# compilées et Python pur sont identiques. Mesure ensuite le temps   #
+# de démarrage d'un nouveau processus (chargement du cache disque)   #
+# et le débit des remplissages. Code de sortie 1 en cas d'écart.     #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/pariteJit.py --paires 500 --longueur 2000      #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+import numpy as np
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import jit
+
+def sequence(alea, longueur_max):
+    alphabet = alea.choice(["ACGT", "AC", "A"])
+    return("".join(alea.choice(alphabet) for _ in range(alea.randint(1, longueur_max))))
+
+def premierAlignement(noeuds):
+    # Premier alignement de iterRecallback depuis les meilleurs nodes finaux
+    maximum = max(noeud.score for noeud in noeuds)
+    for noeud in noeuds:
+        if (noeud.score==maximum):
+            return(next(nw.iterRecallback(noeud)))
+
+def verifierPaire(s1, s2, d, k):
+    # Liste des écarts entre les noyaux et les implémentations de référence
+    ecarts = []
+    reference = nw.alignementSimple(s1, s2, d)
+    scores, directions = nw.alignementSimpleJit(s1, s2, d)
+    if (int(scores[-1][-1])!=reference[-1][-1].score):
+        ecarts.append("score simple")
+    if (nw.retourSimpleJit(directions, s1, s2)!=premierAlignement([reference[-1][-1]])):
+        ecarts.append("alignement simple")
+
+    reference = nw.alignementAffine(s1, s2, d, k)
+    finaux, codes = nw.alignementAffineJit(s1, s2, d, k)
+    if (list(finaux)!=[matrice[-1][-1].score for matrice in reference]):
+        ecarts.append("scores affines")
+    if (nw.retourAffineJit(finaux, codes, s1, s2)!=premierAlignement([m[-1][-1] for m in reference])):
+        ecarts.append("alignement affine")
+
+    if (jit.JIT):
+        # Versions compilées et Python pur des noyaux
+        table, dense = nw.compilerCostmat()
+        code1 = nw.encoderSequence(s1, table)
+        code2 = nw.encoderSequence(s2, table)
+        pur = np.zeros_like(codes)
+        finaux_pur = np.zeros(3, dtype=np.int64)
+        jit.remplirAffine.py_func(code1, code2, dense, d, k, pur, finaux_pur)
+        if ((pur!=codes).any() or tuple(finaux_pur.tolist())!=finaux):
+            ecarts.append("affine compilé / Python pur")
+    return(ecarts)
+
+def demarrage():
+    # Temps d'un premier appel dans un nouveau processus (compilation ou
+    # chargement du cache disque)
+    code = ("import time; debut=time.perf_counter(); import NeedlemanWunsch as nw; "
+            "nw.alignementAffineJit('ACGT','AGT',-2,-1); nw.alignementSimpleJit('ACGT','AGT',-2); "
+            "print(time.perf_counter()-debut)")
+    sortie = subprocess.run([sys.executable, "-c", code], cwd=RACINE, capture_output=True,
+                            text=True, check=True).stdout
+    return(float(sortie))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parité et débit des noyaux compilés")
+    parser.add_argument("--paires", type=int, default=300)
+    parser.add_argument("--longueur-max", type=int, default=12,
+                        help="longueur maximum des paires de parité")
+    parser.add_argument("--longueur", type=int, default=2000,
+                        help="longueur des séquences de la mesure de débit")
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    erreurs = 0
+    for _ in range(arguments.paires):
+        s1 = sequence(alea, arguments.longueur_max)
+        s2 = sequence(alea, arguments.longueur_max)
+        d = alea.choice([-3, -2, -1, 0])
+        k = alea.choice([-2, -1, 0])
+        ecarts = verifierPaire(s1, s2, d, k)
+        if (ecarts):
+            erreurs += 1
+            print(json.dumps({"seq1": s1, "seq2": s2, "d": d, "k": k, "ecarts": ecarts}))
+    print(json.dumps({"jit": jit.JIT, "paires": arguments.paires, "erreurs": erreurs}))
+
+    print(json.dumps({"demarrage_secondes": [demarrage(), demarrage()]}))
+    s1 = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+    s2 = "".join(alea.choice("ACGT") for _ in range(arguments.longueur))
+    cellules = arguments.longueur**2
+    for nom, fonction in (("alignementSimpleJit", lambda: nw.alignementSimpleJit(s1, s2, nw.d)),
+                          ("alignementSimpleNumpy", lambda: nw.alignementSimpleNumpy(s1, s2, nw.d)),
+                          ("alignementAffineJit", lambda: nw.alignementAffineJit(s1, s2, nw.d, nw.k)),
+                          ("alignementAffineNumpy", lambda: nw.alignementAffineNumpy(s1, s2, nw.d, nw.k))):
+        debut = time.perf_counter()
+        fonction()
+        duree = time.perf_counter()-debut
+        print(json.dumps({"moteur": nom, "longueur": arguments.longueur, "secondes": duree,
+                          "gcups": cellules/duree/1e9}))
+    sys.exit(1 if erreurs else 0)
@@ -0,0 +1,178 @@
+######################################################################
+# Suite de mesures de performances                                   #
+#                                                                    #
+# Aligne des séquences d'ADN aléatoires et répétitives de 10 pb à    #
+# 10 kb (ou plus) avec chaque moteur, en séparant le remplissage des #
+# matrices du retour sur trace, et mesure le temps et le pic de      #
+# mémoire (tracemalloc, qui suit aussi les tableaux NumPy).          #
+# Les résultats sont écrits en JSON pour comparer les commits.       #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/performances.py -o resultats.json              #
+#   python benchmarks/performances.py --longueurs 10 100 1000 20000  #
+######################################################################
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+import NeedlemanWunsch as nw
+
+# Générateurs de séquences (toujours à partir d'une graine fixée)
+
+def sequenceAleatoire(longueur, alea):
+    return("".join(alea.choice("ACGT") for _ in range(longueur)))
+
+def sequenceRepetitive(longueur, alea):
+    # Répétitions en tandem d'un motif court, avec 2% de mutations:
+    # beaucoup d'alignements co-optimaux.
+    motif = sequenceAleatoire(alea.randint(2, 6), alea)
+    sequence = list((motif*(longueur//len(motif)+1))[:longueur])
+    for _ in range(longueur//50):
+        sequence[alea.randrange(longueur)] = alea.choice("ACGT")
+    return("".join(sequence))
+
+def paire(type_sequence, longueur, graine):
+    alea = random.Random(graine*1000003+longueur)
+    generateur = sequenceAleatoire if type_sequence=="aleatoire" else sequenceRepetitive
+    s1 = generateur(longueur, alea)
+    # La seconde séquence est une copie mutée de la première (10%)
+    s2 = list(s1)
+    for _ in range(max(1, longueur//10)):
+        position = alea.randrange(len(s2))
+        operation = alea.random()
+        if (operation<0.5):
+            s2[position] = alea.choice("ACGT")
+        elif (operation<0.75 and len(s2)>1):
+            del s2[position]
+        else:
+            s2.insert(position, alea.choice("ACGT"))
+    return(s1, "".join(s2))
+
+# Moteurs: chaque moteur est une liste de phases et une catégorie (qui
+# fixe la longueur maximum). Une phase est une fonction qui reçoit les
+# séquences et le résultat de la première phase (le remplissage).
+
+def moteurs(d, k, max_alignements):
+    remplissageSimple = ("remplissage", lambda s1, s2, _: nw.alignementSimple(s1, s2, d))
+    return({
+        "alignementSimple": ([
+            remplissageSimple,
+            ("retour_premier", lambda s1, s2, r: next(nw.iterRecallback(r[-1][-1]))),
+            ("retour_comptage", lambda s1, s2, r: nw.compterAlignements(r[-1][-1]))], "python"),
+        "alignementSimple/recallback": ([
+            remplissageSimple,
+            ("retour_liste", lambda s1, s2, r: len(list(nw.iterRecallback(r[-1][-1], max_alignements=max_alignements))))], "python"),
+        "alignementAffine": ([
+            ("remplissage", lambda s1, s2, _: nw.alignementAffine(s1, s2, d, k)),
+            ("retour_premier", lambda s1, s2, r: next(nw.iterRecallback(max((m[-1][-1] for m in r), key=lambda n: n.score))))], "python"),
+        "alignementSimpleNumpy": ([
+            ("remplissage", lambda s1, s2, _: nw.alignementSimpleNumpy(s1, s2, d)),
+            ("retour_premier", lambda s1, s2, r: next(nw.iterRecallbackNumpy(r[1], s1, s2)))], "matrice"),
+        "alignementAffineNumpy": ([
+            ("remplissage", lambda s1, s2, _: nw.alignementAffineNumpy(s1, s2, d, k)),
+            ("retour_premier", lambda s1, s2, r: next(nw.iterRecallbackAffineNumpy(r[0], r[1], s1, s2)))], "matrice"),
+        "alignementHirschberg": ([
+            ("complet", lambda s1, s2, _: nw.alignementHirschberg(s1, s2, d))], "lineaire"),
+        "alignementMyersMiller": ([
+            ("complet", lambda s1, s2, _: nw.alignementMyersMiller(s1, s2, d, k))], "lineaire"),
+        "alignementSimpleBande": ([
+            ("complet", lambda s1, s2, _: nw.alignementSimpleBande(s1, s2, d))], "lineaire"),
+        "alignementAffineBande": ([
+            ("complet", lambda s1, s2, _: nw.alignementAffineBande(s1, s2, d, k))], "lineaire"),
+        "scoreSimple": ([
+            ("score", lambda s1, s2, _: nw.scoreSimple(s1, s2, d))], "lineaire"),
+        "scoreAffine": ([
+            ("score", lambda s1, s2, _: nw.scoreAffine(s1, s2, d, k))], "lineaire"),
+    })
+
+def mesurer(phase, s1, s2, remplissage, memoire):
+    # Temps (et pic de mémoire si demandé) d'une phase
+    if (memoire):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    debut = time.perf_counter()
+    resultat = phase(s1, s2, remplissage)
+    duree = time.perf_counter()-debut
+    pic = None
+    if (memoire):
+        pic = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return(resultat, duree, pic)
+
+def lancer(arguments):
+    limites = {"python": arguments.max_python, "matrice": arguments.max_matrice,
+               "lineaire": arguments.max_lineaire}
+    resultats = []
+    for nom, (phases, categorie) in moteurs(arguments.d, arguments.k, arguments.max_alignements).items():
+        if (arguments.moteurs and nom not in arguments.moteurs):
+            continue
+        for type_sequence in ("aleatoire", "repetitive"):
+            for longueur in arguments.longueurs:
+                if (longueur>limites[categorie]):
+                    continue
+                s1, s2 = paire(type_sequence, longueur, arguments.graine)
+                remplissage = None
+                for numero, (nom_phase, phase) in enumerate(phases):
+                    durees = []
+                    for _ in range(arguments.repetitions):
+                        resultat, duree, _ = mesurer(phase, s1, s2, remplissage, False)
+                        durees.append(duree)
+                    pic = None
+                    if (arguments.memoire):
+                        pic = mesurer(phase, s1, s2, remplissage, True)[2]
+                    if (numero==0):
+                        remplissage = resultat
+                    ligne = {"moteur": nom, "sequences": type_sequence, "longueur": longueur,
+                             "phase": nom_phase, "secondes": min(durees), "pic_octets": pic}
+                    resultats.append(ligne)
+                    print(json.dumps(ligne), file=sys.stderr, flush=True)
+    return(resultats)
+
+def versionDepot():
+    try:
+        return(subprocess.run(["git", "rev-parse", "HEAD"], cwd=RACINE, capture_output=True,
+                              text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return(None)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesures de performances des moteurs d'alignement")
+    parser.add_argument("--longueurs", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--moteurs", nargs="+", help="moteurs à mesurer (tous par défaut)")
+    parser.add_argument("--max-python", type=int, default=1000,
+                        help="longueur maximum pour les moteurs à objets node")
+    parser.add_argument("--max-matrice", type=int, default=5000,
+                        help="longueur maximum pour les moteurs à matrice complète")
+    parser.add_argument("--max-lineaire", type=int, default=10**6)
+    parser.add_argument("--max-alignements", type=int, default=1000,
+                        help="nombre d'alignements énumérés par retour_liste")
+    parser.add_argument("--repetitions", type=int, default=1)
+    parser.add_argument("--sans-memoire", dest="memoire", action="store_false",
+                        help="ne mesure pas le pic de mémoire (plus rapide)")
+    parser.add_argument("--graine", type=int, default=42)
+    parser.add_argument("-d", type=int, default=nw.d)
+    parser.add_argument("-k", type=int, default=nw.k)
+    parser.add_argument("-o", "--sortie", default="-")
+    arguments = parser.parse_args()
+
+    rapport = {"commit": versionDepot(), "python": platform.python_version(),
+               "numpy": __import__("numpy").__version__, "machine": platform.machine(),
+               "parametres": {"d": arguments.d, "k": arguments.k, "graine": arguments.graine,
+                              "repetitions": arguments.repetitions},
+               "resultats": lancer(arguments)}
+    texte = json.dumps(rapport, indent=1)
+    if (arguments.sortie=="-"):
+        print(texte)
+    else:
+        with open(arguments.sortie, "w") as fichier:
+            fichier.write(texte+"\n")
@@ -0,0 +1,106 @@
+######################################################################
+# Rappel et gain du préfiltre par k-mers (prefiltre.py)              #
+#                                                                    #
+# Une base de cibles aléatoires contient des copies mutées de la     #
+# requête (taux de mutation de 2% à 40%). Les scores exhaustifs      #
+# (profilRequete) définissent les vraies cibles: score au moins égal #
+# à --fraction fois le score de la requête contre elle-même. Pour    #
+# chaque taille de k-mer et nombre minimum de graines, on affiche    #
+# les candidats retenus, le rappel (vraies cibles retenues / vraies  #
+# cibles), les temps de préfiltre et d'alignement des candidats      #
+# (abandonnés sous le seuil) et les temps exhaustifs. Les scores des #
+# candidats sont comparés aux scores exhaustifs (écarts: code de     #
+# sortie 1).                                                         #
+#                                                                    #
+# Utilisation:                                                       #
+#   python benchmarks/prefiltre.py --cibles 5000 --kmers 8 11 14     #
+######################################################################
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NeedlemanWunsch as nw
+from NeedlemanWunsch import prefiltre
+
+def muter(seq, taux, alea):
+    resultat = []
+    for lettre in seq:
+        tirage = alea.random()
+        if (tirage<taux/3):
+            continue
+        if (tirage<2*taux/3):
+            resultat.append(alea.choice("ACGT"))
+        elif (tirage<taux):
+            resultat.append(lettre+alea.choice("ACGT"))
+        else:
+            resultat.append(lettre)
+    return("".join(resultat))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rappel et gain du préfiltre par k-mers")
+    parser.add_argument("--requete", type=int, default=300, help="longueur de la requête")
+    parser.add_argument("--cibles", type=int, default=5000, help="nombre de cibles aléatoires")
+    parser.add_argument("--homologues", type=int, default=200, help="nombre de copies mutées")
+    parser.add_argument("--kmers", type=int, nargs="+", default=[8, 11, 14])
+    parser.add_argument("--graines", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--ecart", type=int, default=16)
+    parser.add_argument("--fraction", type=float, default=0.5)
+    parser.add_argument("--graine", type=int, default=42)
+    arguments = parser.parse_args()
+
+    alea = random.Random(arguments.graine)
+    requete = "".join(alea.choice("ACGT") for _ in range(arguments.requete))
+    cibles = ["".join(alea.choice("ACGT") for _ in range(alea.randint(arguments.requete*3//4,
+                                                                        arguments.requete*5//4)))
+              for _ in range(arguments.cibles)]
+    cibles += [muter(requete, alea.uniform(0.02, 0.4), alea) for _ in range(arguments.homologues)]
+    alea.shuffle(cibles)
+
+    debut = time.perf_counter()
+    exhaustifs = nw.profilRequete(requete, nw.d).scores(cibles)
+    duree_exhaustive = time.perf_counter()-debut
+    seuil = int(arguments.fraction*nw.scoreSimple(requete, requete, nw.d))
+    vraies = {n for n, score in enumerate(exhaustifs) if score>=seuil}
+    # Temps d'alignement (avec alignements) de toute la base, estimé sur
+    # un échantillon
+    echantillon = cibles[:50]
+    debut = time.perf_counter()
+    for cible in echantillon:
+        nw.alignementSimpleBande(requete, cible, nw.d)
+    duree_alignements = (time.perf_counter()-debut)*len(cibles)/len(echantillon)
+    print(json.dumps({"cibles": len(cibles), "vraies_cibles": len(vraies), "seuil": seuil,
+                      "secondes_scores_exhaustifs": duree_exhaustive,
+                      "secondes_alignements_exhaustifs_estimees": duree_alignements}))
+
+    ecarts = 0
+    for taille in arguments.kmers:
+        debut = time.perf_counter()
+        index = prefiltre.construireIndex(cibles, taille)
+        duree_index = time.perf_counter()-debut
+        for graines_min in arguments.graines:
+            debut = time.perf_counter()
+            candidats = index.candidats(requete, graines_min, arguments.ecart)
+            duree_prefiltre = time.perf_counter()-debut
+            debut = time.perf_counter()
+            retenues = set()
+            for cible, score, alignement in prefiltre.alignerCandidats(requete, cibles, index,
+                                                                       graines_min=graines_min,
+                                                                       ecart=arguments.ecart,
+                                                                       seuil=seuil):
+                retenues.add(cible)
+                ecarts += score!=exhaustifs[cible]
+            duree_alignement = time.perf_counter()-debut
+            print(json.dumps({"taille_kmer": taille, "graines_min": graines_min,
+                              "secondes_index": duree_index, "candidats": len(candidats),
+                              "rappel": len(vraies & retenues)/max(len(vraies), 1),
+                              "faux_positifs": len(retenues-vraies),
+                              "secondes_prefiltre": duree_prefiltre,
+                              "secondes_alignement": duree_alignement}))
+    print(json.dumps({"ecarts_de_score": ecarts}))
+    sys.exit(1 if ecarts else 0)
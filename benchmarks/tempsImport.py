@@ -0,0 +1,36 @@
+######################################################################
+# Mesure du temps d'import du paquet                                 #
+#                                                                    #
+# L'import est mesuré dans un processus neuf, puis on vérifie que    #
+# NumPy n'est chargé qu'à la première utilisation d'un moteur        #
+# vectorisé. Pour le détail par module:                              #
+#     python -X importtime -c "import NeedlemanWunsch"               #
+######################################################################
+
+import json
+import os
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FILS = """
+import json, sys, time
+sys.path.insert(0, %r)
+debut = time.perf_counter()
+import NeedlemanWunsch as nw
+import_paquet = time.perf_counter() - debut
+numpy_apres_import = "numpy" in sys.modules
+debut = time.perf_counter()
+nw.scoreSimple
+premier_moteur = time.perf_counter() - debut
+print(json.dumps({"import_ms": round(1000*import_paquet, 3),
+                  "numpy_apres_import": numpy_apres_import,
+                  "chargement_moteur_ms": round(1000*premier_moteur, 3),
+                  "numpy_apres_moteur": "numpy" in sys.modules}))
+""" % RACINE
+
+if __name__ == "__main__":
+    sortie = subprocess.run([sys.executable, "-c", FILS], capture_output=True,
+                            text=True, check=True)
+    print(sortie.stdout.strip())